@@ -1,5 +1,7 @@
 import datetime
+from dataclasses import replace
 import os
+import time
 from user_interface.logger import logger
 import re
 from FinancialAnalysisInput import FinancialAnalysisInput
@@ -10,17 +12,28 @@ from statement.EntryValidator import EntryValidator
 from data_types.ConfigValidator import ConfigValidator
 from user_interface.InteractiveOverviewTkinter import InteractiveOverviewTkinter
 from statement.extractor.InterpretedEntriesExtractor import InterpretedEntriesExtractor
-from file_reader.CsvReader import CsvReader
 from file_reader.PdfReader import PdfReader
+from file_reader.InputManifest import InputManifest, InputManifestRecord
 from statement.EntryPrinter import EntryPrinter
 from statement.EntryFilter import EntryFilter
 from statement.EntryWriter import EntryWriter
 from statement.extractor.RawEntriesFromCsvExtractor import RawEntriesFromCsvExtractor
+from statement.extractor.BankFormatProfile import BankFormatProfile, BankFormatProfileCache
+from statement.extractor.CsvFileIngestion import CsvFileIngestion, IngestedFile, ParallelCsvFileIngestion
+from statement.extractor.InterpretedEntriesCache import InterpretedEntriesCache
+from statement.extractor.HeadingDetector import HeadingDetector
 from statement.extractor.RawEntriesFromPdfTextExtractor import RawEntriesFromPdfTextExtractor
-from typing import List
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+from data_types.InterpretedEntry import InterpretedEntry
 from data_types.TagConfig import TagConfig, load_tags
 from statement.Statement import Statement
 from statement.InMemoryStatementBuilder import InMemoryStatementBuilder
+from statement.TagMatcher import TagMatcher
+from statement.ParallelTagMatcher import ParallelTagMatcher
+from statement.TagProfileReport import TagProfileReport
+from statement.IncrementalTagger import IncrementalTagger
+from statement.IncrementalStatementUpdater import IncrementalStatementUpdater
+from statement.EntryOverlapMerger import EntryOverlapMerger
 
 class FinancialAnalysis:
 
@@ -30,59 +43,310 @@ class FinancialAnalysis:
         self.__read_configs()
 
         self.__statement : Statement = None
+        self.__entries_per_input_file : Dict[str, List[InterpretedEntry]] = {}
+        self.__derived_entries_per_input_file : Dict[str, List[InterpretedEntry]] = {}
+        self.__pdf_entries_per_input_file : Dict[str, List[InterpretedEntry]] = {} # before merging, so they can be merged again if the known entries change
+        self.__input_file_states : Dict[str, Tuple[int, int]] = {}
     
     def __read_configs(self):
         self.__config : Config = read_config(self.__input.config_json_file)
+        self.__heading_detector : HeadingDetector = HeadingDetector(self.__config.headings)
         self.__tags : TagConfig = load_tags(self.__input.tags_json_file)
+        self.__tag_matcher : TagMatcher = self.__create_tag_matcher()
         self.__validate_currency_configuration()
 
+    def __create_tag_matcher(self) -> TagMatcher:
+        if self.__input.profile_tags:
+            return TagMatcher(self.__tags, profile=True)
+        if self.__input.tagging_workers > 1:
+            return ParallelTagMatcher(self.__tags, self.__input.tagging_workers)
+        return TagMatcher(self.__tags)
+
     def read_and_interpret_input(self):
         statement_builder = InMemoryStatementBuilder(self.__config)
         self.__interpret_csv_input(statement_builder)
         self.__augment_csv_entries(statement_builder)
-        # self.__interpret_pdf_input(statement_builder) # TODO no merge of data if overlap with csv exists
+        self.__interpret_pdf_input(statement_builder)
+        self.__tag_matcher.log_cache_statistics()
+        self.__tag_matcher.close()
+        if self.__input.profile_tags:
+            self.__report_tag_profile()
         self.__statement = statement_builder.build()
 
     def __interpret_csv_input(self, statement_builder : InMemoryStatementBuilder):
-        input_file_count = 1
-        for input_file in self.__get_filtered_input_files("\.csv$"):
+        for ingested_file in self.__ingest_csv_input(self.__get_filtered_input_files("\.csv$"), remove_unused_cache_entries=True):
+            statement_builder.add_entries(ingested_file.interpreted_entries)
 
-            logger.debug(f"{input_file_count}. {input_file}")
-            input_file_count += 1
+    def __ingest_csv_input(self, input_files : List[str], remove_unused_cache_entries : bool) -> List[IngestedFile]:
+        self.__ensure_export_directory()
+        bank_format_profiles = BankFormatProfileCache(self.__get_export_file_path("bank_format_profiles.json"))
+        entries_cache = InterpretedEntriesCache(self.__get_export_file_path("interpreted_entries_cache"), self.__config, self.__tags,
+                                                self.__input.full_encoding_scan) if self.__use_parse_cache() else None
+        input_manifest = self.__create_input_manifest()
+        input_directories : List[Optional[str]] = []
+        cache_keys : List[Optional[str]] = []
+        cached_files : Dict[int, IngestedFile] = {}
+        jobs : List[Tuple[str, Optional[BankFormatProfile], Optional[int]]] = []
+        for file_idx, input_file in enumerate(input_files):
+            record = self.__get_input_manifest_record(input_manifest, input_file, entries_cache is not None)
+            input_directory = self.__config.internal_accounts[record.account_idx].get_input_directory() if record.account_idx is not None else None
+            input_directories.append(input_directory)
+            profile = bank_format_profiles.get(input_directory) if input_directory else None
+            cache_keys.append(entries_cache.get_key(input_file, record.content_hash) if entries_cache is not None else None)
+            cached_file = entries_cache.get(cache_keys[-1], profile) if entries_cache is not None else None
+            if cached_file is not None:
+                cached_files[file_idx] = cached_file
+            else:
+                jobs.append((input_file, profile, record.account_idx))
+        if remove_unused_cache_entries:
+            input_manifest.remove_missing(self.__input.input_files)
+        input_manifest.save()
+        if entries_cache is not None:
+            logger.debug(f"Loaded {len(cached_files)} of {len(input_files)} csv files from the interpreted entries cache")
 
-            csv_reader = CsvReader(input_file)
-            csv_reader.run()
+        start = time.perf_counter()
+        result : List[IngestedFile] = []
+        ingested_files = self.__ingest_csv_files(jobs)
+        for file_idx, (input_directory, cache_key) in enumerate(zip(input_directories, cache_keys)):
+            ingested_file = cached_files.get(file_idx)
+            if ingested_file is not None:
+                logger.debug(f"{file_idx + 1}. {ingested_file.input_file}: {len(ingested_file.interpreted_entries)} entries from cache")
+            else:
+                ingested_file = next(ingested_files)
+                logger.debug(f"{file_idx + 1}. {ingested_file.input_file}: {len(ingested_file.interpreted_entries)} entries in {ingested_file.seconds:.3f} s")
+                if entries_cache is not None:
+                    entries_cache.put(cache_key, ingested_file)
+            self.__entries_per_input_file[ingested_file.input_file] = ingested_file.interpreted_entries
+            result.append(ingested_file)
+            if input_directory and ingested_file.bank_format_profile is not None:
+                bank_format_profiles.put(input_directory, ingested_file.bank_format_profile)
+        logger.debug(f"Ingested {len(jobs)} csv files in {time.perf_counter() - start:.3f} s")
+        bank_format_profiles.save()
+        if entries_cache is not None and remove_unused_cache_entries:
+            entries_cache.remove_unused()
+        return result
 
-            raw_extractor = RawEntriesFromCsvExtractor(csv_reader, self.__config, self.__input.input_base_path)
-            raw_extractor.run()
+    def __create_input_manifest(self) -> InputManifest:
+        return InputManifest(self.__get_export_file_path("input_manifest.json"),
+                             InputManifest.get_accounts_key(self.__input.input_base_path, [account.get_input_directory() for account in self.__config.internal_accounts]))
 
-            augmented_raw_entries = EntryAugmentation.replace_alternative_transaction_iban_with_original(raw_extractor.get_raw_entries(), self.__config.internal_accounts)
+    def __get_input_manifest_record(self, input_manifest : InputManifest, input_file : str, with_content_hash : bool) -> InputManifestRecord:
+        """ The record of an unchanged input file spares resolving its account and hashing its content. """
+        state = self.__input.input_file_states.pop(input_file, None) or FinancialAnalysis.__get_file_state(input_file)
+        self.__input_file_states[input_file] = state
+        record = input_manifest.get(input_file, *state)
+        if record is None:
+            record = InputManifestRecord(path = input_file, size = state[0], mtime_ns = state[1],
+                                         account_idx = RawEntriesFromCsvExtractor.find_account_idx(self.__config, self.__input.input_base_path, input_file))
+        if with_content_hash and record.content_hash is None:
+            record = replace(record, content_hash = InputManifest.get_content_hash(input_file))
+        input_manifest.put(record)
+        return record
 
-            interpreted_extractor = InterpretedEntriesExtractor(augmented_raw_entries, self.__config, self.__tags)
-            interpreted_extractor.run()
+    def __use_parse_cache(self) -> bool:
+        # Profiling has to see every entry
+        return self.__input.parse_cache and not self.__input.profile_tags
 
-            statement_builder.add_entries(interpreted_extractor.get_interpreted_entries())
+    def __ingest_csv_files(self, jobs : List[Tuple[str, Optional[BankFormatProfile], Optional[int]]]) -> Iterator[IngestedFile]:
+        if self.__input.ingest_workers > 1 and len(jobs) > 1 and not self.__input.profile_tags:
+            return ParallelCsvFileIngestion(self.__config, self.__tags, self.__input.input_base_path, self.__input.ingest_workers,
+                                            self.__input.streaming_input, self.__input.full_encoding_scan).ingest_all(jobs)
+        ingestion = CsvFileIngestion(self.__config, self.__tags, self.__input.input_base_path, self.__tag_matcher, self.__heading_detector,
+                                     self.__input.streaming_input, self.__input.full_encoding_scan)
+        return (ingestion.ingest(input_file, profile, account_idx) for input_file, profile, account_idx in jobs)
 
     def __augment_csv_entries(self, statement_builder : InMemoryStatementBuilder):
-        statement_builder.add_entries(EntryAugmentation.get_account_transactions_for_accounts_without_input_file_by_other_account_transactions(statement_builder.get_unsorted_entries(), self.__config.internal_accounts))
+        for input_file in self.__get_filtered_input_files("\.csv$"):
+            statement_builder.add_entries(self.__augment_entries_of_input_file(input_file))
         statement_builder.add_entries(EntryAugmentation.get_manual_balances(self.__config.internal_accounts, self.__config.currency_config))
 
+    def __augment_entries_of_input_file(self, input_file : str) -> List[InterpretedEntry]:
+        # Per file, so the entries of accounts without input files can be replaced with the file. For every account they keep the order of the files.
+        derived_entries = EntryAugmentation.get_account_transactions_for_accounts_without_input_file_by_other_account_transactions(self.__entries_per_input_file.get(input_file, []), self.__config.internal_accounts)
+        self.__derived_entries_per_input_file[input_file] = derived_entries
+        return derived_entries
+
     def __interpret_pdf_input(self, statement_builder : InMemoryStatementBuilder):
+        input_manifest = self.__create_input_manifest()
+        content_hashes : Set[str] = set()
         input_file_count = 1
         for input_file in self.__get_filtered_input_files("\.pdf$"):
 
             logger.debug(f"{input_file_count}. {input_file}")
             input_file_count += 1
 
-            pdf_reader = PdfReader(str(input_file))
-            pdf_reader.run()
+            record = self.__get_input_manifest_record(input_manifest, input_file, self.__input.parse_cache)
+            content_hashes.add(record.content_hash)
+            self.__pdf_entries_per_input_file[input_file] = self.__read_pdf_entries(input_file, record)
+        input_manifest.save()
+        if self.__input.parse_cache:
+            PdfReader.remove_unused_cache_files(self.__get_export_file_path("pdf_text_cache"), content_hashes)
 
-            raw_extractor = RawEntriesFromPdfTextExtractor(pdf_reader.get_text())
+        # Pdf statements overlap with csv exports and with each other, only entries not known yet are added
+        overlap_merger = EntryOverlapMerger(statement_builder.get_unsorted_entries())
+        for input_file in self.__get_filtered_input_files("\.pdf$"):
+            pdf_entries = self.__pdf_entries_per_input_file[input_file]
+            new_entries = overlap_merger.merge(pdf_entries)
+            logger.debug(f"{input_file}: {len(new_entries)} of {len(pdf_entries)} pdf entries not known from other input files")
+
+            self.__entries_per_input_file[input_file] = new_entries
+            statement_builder.add_entries(new_entries)
+            statement_builder.add_entries(self.__augment_entries_of_input_file(input_file))
+
+    def __read_pdf_entries(self, input_file : str, record : InputManifestRecord) -> List[InterpretedEntry]:
+        """ All transactions of the pdf, whether they are known from other input files or not. """
+        if record.account_idx is None:
+            logger.error("No account found for input pdf")
+            return []
+
+        pdf_reader = PdfReader(str(input_file), self.__input.ingest_workers, self.__get_export_file_path("pdf_text_cache") if self.__input.parse_cache else None,
+                               record.content_hash)
+        pdf_reader.run()
+
+        raw_extractor = RawEntriesFromPdfTextExtractor(pdf_reader.get_text())
+        try:
             raw_extractor.run()
+        except (IndexError, ValueError) as e:
+            logger.error(f"Unable to extract entries from pdf: {e}")
+            return []
+
+        # Balances and amounts without date can not be placed in the statement
+        raw_entries = [raw_entry for raw_entry in raw_extractor.get_raw_entries() if raw_entry.is_transaction()]
+        for raw_entry in raw_entries:
+            raw_entry.account_idx = record.account_idx
+        raw_entries = EntryAugmentation.replace_alternative_transaction_iban_with_original(raw_entries, self.__config.internal_accounts)
+
+        interpreted_extractor = InterpretedEntriesExtractor(raw_entries, self.__config, self.__tags, self.__tag_matcher)
+        interpreted_extractor.run()
+        return interpreted_extractor.get_interpreted_entries()
+
+    def update_tags(self):
+        new_tags : TagConfig = load_tags(self.__input.tags_json_file)
+        # Pdf entries known from other input files may be added by a later input update
+        entries = self.__statement.get_entries()
+        entry_ids : Set[int] = {id(entry) for entry in entries}
+        IncrementalTagger(self.__tags, new_tags).run(entries + [entry for pdf_entries in self.__pdf_entries_per_input_file.values()
+                                                                for entry in pdf_entries if id(entry) not in entry_ids])
+        self.__tags = new_tags
+        self.__tag_matcher = self.__create_tag_matcher()
 
-            interpreted_extractor = InterpretedEntriesExtractor(raw_extractor.get_raw_entries(), self.__config, self.__tags)
-            interpreted_extractor.run()
-            statement_builder.add_entries(interpreted_extractor.get_interpreted_entries())
+    def run_tag_tuning_loop(self, poll_interval_seconds : float = 1.0):
+        logger.info(f"Watching {self.__input.tags_json_file} for changes. Stop with Ctrl+C.")
+        last_modification_time = os.path.getmtime(self.__input.tags_json_file)
+        try:
+            while True:
+                time.sleep(poll_interval_seconds)
+                modification_time = os.path.getmtime(self.__input.tags_json_file)
+                if modification_time == last_modification_time:
+                    continue
+                last_modification_time = modification_time
+                try:
+                    self.update_tags()
+                except Exception as e:
+                    logger.error(f"Unable to update tags: {e}")
+                    continue
+                self.print_undefined_external_transaction_csv_entries()
+                self.print_entries_statistics()
+        except KeyboardInterrupt:
+            pass
+
+    def update_input(self, input_files : List[str], input_file_states : Optional[Dict[str, Tuple[int, int]]] = None) -> bool:
+        """ Ingests added and changed csv and pdf files and updates the statement incrementally, returns False if nothing changed.
+            Files without a given size and mtime, e.g. as seen when searching the input files, are stat'ed.
+        """
+        existing_files = set(input_files)
+        current_states : Dict[str, Tuple[int, int]] = {input_file: (input_file_states or {}).get(input_file) or FinancialAnalysis.__get_file_state(input_file)
+                                                       for input_file in input_files if re.search("\.(csv|pdf)$", input_file)}
+        changed_files = [input_file for input_file, state in current_states.items() if self.__input_file_states.get(input_file) != state]
+        changed_csv_files = [input_file for input_file in changed_files if re.search("\.csv$", input_file)]
+        removed_files = [input_file for input_file in self.__entries_per_input_file if input_file not in existing_files]
+        if not changed_files and not removed_files:
+            return False
+
+        # Ingestion records the entries and states of the files, they are restored if the update fails, so the next update does not duplicate entries
+        previous_state = (self.__input.input_files, dict(self.__entries_per_input_file), dict(self.__derived_entries_per_input_file),
+                          dict(self.__pdf_entries_per_input_file), dict(self.__input_file_states))
+        try:
+            self.__input.input_files = input_files
+            self.__input.input_file_states.update((input_file, current_states[input_file]) for input_file in changed_files)
+            removed_entries : List[InterpretedEntry] = []
+            for input_file in changed_files + removed_files:
+                removed_entries += self.__entries_per_input_file.pop(input_file, []) + self.__derived_entries_per_input_file.pop(input_file, [])
+                self.__pdf_entries_per_input_file.pop(input_file, None)
+                self.__input_file_states.pop(input_file, None)
+            added_entries : List[InterpretedEntry] = []
+            for ingested_file in self.__ingest_csv_input(changed_csv_files, remove_unused_cache_entries=False):
+                added_entries += ingested_file.interpreted_entries + self.__augment_entries_of_input_file(ingested_file.input_file)
+            removed_pdf_entries, added_pdf_entries = self.__merge_pdf_input_again([input_file for input_file in changed_files if re.search("\.pdf$", input_file)],
+                                                                                  removed_entries, added_entries)
+            removed_entries += removed_pdf_entries
+            added_entries += added_pdf_entries
+            self.__tag_matcher.close()
+
+            affected_accounts = IncrementalStatementUpdater(self.__statement, self.__config).update(removed_entries, added_entries)
+        except Exception:
+            self.__input.input_files, self.__entries_per_input_file, self.__derived_entries_per_input_file, self.__pdf_entries_per_input_file, \
+                self.__input_file_states = previous_state
+            raise
+        logger.info(f"Input changed: {len(changed_files)} added or changed, {len(removed_files)} removed files. "
+                    f"{len(added_entries)} entries added, {len(removed_entries)} entries removed.")
+        results = EntryValidator([entry for entry in self.__statement.get_entries() if entry.account_id in affected_accounts]).validate()
+        EntryValidator.print_validation_results(results, self.__config)
+        return True
+
+    def __merge_pdf_input_again(self, changed_pdf_files : List[str], removed_entries : List[InterpretedEntry],
+                                added_entries : List[InterpretedEntry]) -> Tuple[List[InterpretedEntry], List[InterpretedEntry]]:
+        """ Merges the pdfs of the accounts with removed or added entries again, returns the pdf entries to remove from and to add to the statement.
+            Merge keys contain the account, so the pdfs of other accounts keep the entries a full run would keep.
+        """
+        input_manifest = self.__create_input_manifest()
+        for input_file in changed_pdf_files:
+            self.__pdf_entries_per_input_file[input_file] = self.__read_pdf_entries(input_file, self.__get_input_manifest_record(input_manifest, input_file, self.__input.parse_cache))
+        input_manifest.save()
+
+        affected_accounts : Set[str] = {entry.account_id for entry in removed_entries + added_entries}
+        for input_file in changed_pdf_files:
+            affected_accounts |= {entry.account_id for entry in self.__pdf_entries_per_input_file[input_file]}
+        pdf_files = [input_file for input_file in self.__get_filtered_input_files("\.pdf$")
+                     if any(entry.account_id in affected_accounts for entry in self.__pdf_entries_per_input_file.get(input_file, []))]
+
+        # Known are the entries of the csv files after the update, as in a full run
+        excluded_ids : Set[int] = {id(entry) for entry in removed_entries}
+        for input_file in pdf_files:
+            excluded_ids |= {id(entry) for entry in self.__entries_per_input_file.get(input_file, []) + self.__derived_entries_per_input_file.get(input_file, [])}
+        overlap_merger = EntryOverlapMerger([entry for entry in self.__statement.get_entries() if id(entry) not in excluded_ids] + added_entries)
+
+        removed_pdf_entries : List[InterpretedEntry] = []
+        added_pdf_entries : List[InterpretedEntry] = []
+        for input_file in pdf_files:
+            previous_entries = self.__entries_per_input_file.get(input_file, [])
+            new_entries = overlap_merger.merge(self.__pdf_entries_per_input_file[input_file])
+            previous_ids : Set[int] = {id(entry) for entry in previous_entries}
+            new_ids : Set[int] = {id(entry) for entry in new_entries}
+            if previous_ids == new_ids:
+                continue
+            removed_pdf_entries += [entry for entry in previous_entries if id(entry) not in new_ids] + self.__derived_entries_per_input_file.get(input_file, [])
+            added_pdf_entries += [entry for entry in new_entries if id(entry) not in previous_ids]
+            self.__entries_per_input_file[input_file] = new_entries
+            added_pdf_entries += self.__augment_entries_of_input_file(input_file)
+        return removed_pdf_entries, added_pdf_entries
+
+    def run_input_watch_loop(self, find_input_file_states : Callable[[], Dict[str, Tuple[int, int]]], poll_interval_seconds : float = 5.0):
+        logger.info(f"Watching {self.__input.input_base_path} for added, changed or removed input files. Stop with Ctrl+C.")
+        try:
+            while True:
+                time.sleep(poll_interval_seconds)
+                try:
+                    input_file_states = find_input_file_states()
+                    if not self.update_input(list(input_file_states), input_file_states):
+                        continue
+                except Exception as e:
+                    logger.error(f"Unable to update input: {e}")
+                    continue
+                self.write_entries_to_csv()
+                self.print_entries_statistics()
+        except KeyboardInterrupt:
+            pass
 
     def validate_interpreted_input(self):
         logger.info("")
@@ -113,8 +377,7 @@ class FinancialAnalysis:
         )
 
     def write_entries_to_csv(self):
-        if not os.path.isdir(self.__get_export_file_path()):
-            os.mkdir(self.__get_export_file_path())
+        self.__ensure_export_directory()
         if len(self.__statement.get_entries()) > 0:
             EntryWriter(self.__statement.get_entries()).write_to_csv(self.__get_export_file_path("interpreted_entries.csv"))
 
@@ -130,6 +393,21 @@ class FinancialAnalysis:
     def __get_export_file_path(self, file_name : str = ""):
         return os.path.join(self.__input.base_path, "export", file_name)
 
+    def __ensure_export_directory(self):
+        if not os.path.isdir(self.__get_export_file_path()):
+            os.mkdir(self.__get_export_file_path())
+
+    def __report_tag_profile(self):
+        report = TagProfileReport(self.__tag_matcher.get_definitions(), self.__tag_matcher.get_statistics())
+        report.log()
+        self.__ensure_export_directory()
+        report.write_to_csv(self.__get_export_file_path("tag_profile.csv"))
+
+    @staticmethod
+    def __get_file_state(input_file : str) -> Tuple[int, int]:
+        stat = os.stat(input_file)
+        return (stat.st_size, stat.st_mtime_ns)
+
     def __validate_currency_configuration(self):
         errors = ConfigValidator.validate_currencies(self.__config)
         if errors:
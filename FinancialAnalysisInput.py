@@ -1,7 +1,7 @@
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import os
-from typing import List
+from typing import Dict, List, Tuple
 
 @dataclass
 class FinancialAnalysisInput:
@@ -9,4 +9,11 @@ class FinancialAnalysisInput:
     input_base_path : os.PathLike
     input_files : List[os.PathLike]
     tags_json_file : os.PathLike
-    config_json_file : os.PathLike
\ No newline at end of file
+    config_json_file : os.PathLike
+    tagging_workers : int = 0 # > 1 shards tagging across a process pool
+    ingest_workers : int = 0 # > 1 ingests the input files in a process pool
+    profile_tags : bool = False
+    streaming_input : bool = False # streams csv rows through the extractors instead of holding every stage in memory
+    parse_cache : bool = True # load the interpreted entries of unchanged input files from the export directory
+    full_encoding_scan : bool = False # detect csv encodings from the whole file instead of its first 64 KiB
+    input_file_states : Dict[str, Tuple[int, int]] = field(default_factory=dict) # size and mtime in ns per input file, as seen when searching the input files
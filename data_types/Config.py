@@ -9,6 +9,7 @@ class HeadingConfig:
     date : List[str]
     amount : List[str]
     comment : List[str]
+    search_rows : Optional[int] = None # number of first rows searched for the heading, 12 if not set
 
 @dataclass
 class ManualBalance:
@@ -1,7 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from data_types.Tag import Tag
+from data_types.TagRegistry import TagRegistry
 from data_types.Currency import CurrencyCode
 from data_types.RawEntry import RawEntry
 import datetime
@@ -30,6 +31,30 @@ class InterpretedEntry: # TODO update defaults
     type : InterpretedEntryType = InterpretedEntryType.UNKNOWN
     raw : RawEntry = None
     internal_transaction_match : Optional['InterpretedEntry'] = None
+    tag_definition_indices : Optional[Tuple[int, ...]] = field(default=None, compare=False, repr=False) # tag definitions that matched, for incremental tagging
+
+    def __get_tags(self) -> List[Tag]:
+        return self.__tags
+
+    def __set_tags(self, tags : List[Tag]):
+        # The registry bits of the tags, and of the tags and their ancestors. They follow every assignment, so tags are changed by assigning a new list.
+        self.__tags = tags
+        self.tag_bits : int = TagRegistry.get_bits_of_all(tags) if tags else 0
+        self.tag_mask : int = TagRegistry.get_mask_of_all(tags) if tags else 0
+
+    def __getstate__(self) -> dict:
+        # Tag ids are only valid within the process that assigned them
+        state = dict(self.__dict__)
+        del state["tag_bits"]
+        del state["tag_mask"]
+        return state
+
+    def __setstate__(self, state : dict):
+        self.__dict__.update(state)
+        self.__set_tags(self.__tags)
+
+    def has_tag(self, tag : Tag) -> bool:
+        return (self.tag_bits & TagRegistry.get_bit(tag)) != 0
 
     def is_untagged(self) -> bool:
         return self.tags is None or len(self.tags) == 0
@@ -59,3 +84,6 @@ class InterpretedEntry: # TODO update defaults
         if self.original_currency is None or self.original_currency.value == base_currency:
             return f"{self.amount:.2f}"
         return f"{self.converted_amount:.2f} (orig: {self.original_amount:.2f} {self.original_currency.value})"
+
+# Assigned after the dataclass is created, which takes the default of the tags field from the class attribute
+InterpretedEntry.tags = property(InterpretedEntry._InterpretedEntry__get_tags, InterpretedEntry._InterpretedEntry__set_tags)
@@ -0,0 +1,19 @@
+from dataclasses import dataclass, field
+from typing import List
+from data_types.RawEntry import RawEntry, RawEntryType
+
+""" Raw entries of one csv file as parallel columns, all rows belong to the same account. """
+@dataclass
+class RawEntryColumns:
+    account_idx : int
+    dates : List[str] = field(default_factory=list)
+    amounts : List[str] = field(default_factory=list)
+    comments : List[str] = field(default_factory=list)
+    types : List[RawEntryType] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def to_raw_entries(self, start : int = 0, end : int = None) -> List[RawEntry]:
+        return [RawEntry(date=date, amount=amount, comment=comment, account_idx=self.account_idx, type=type)
+                for date, amount, comment, type in zip(self.dates[start:end], self.amounts[start:end], self.comments[start:end], self.types[start:end])]
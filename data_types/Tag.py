@@ -10,12 +10,23 @@ class Tag:
 
     def __post_init__(self):
         self.splitted_definition = self.definition.split(self.seperator)
+        self.__hash = hash(self.definition)
 
     def __str__(self) -> str:
         return self.definition
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return self.__hash
+
+    def __getstate__(self) -> dict:
+        # String hashes are salted per process, the cached hash must not travel with a pickled tag
+        state = dict(self.__dict__)
+        del state["_Tag__hash"]
+        return state
+
+    def __setstate__(self, state : dict):
+        self.__dict__.update(state)
+        self.__hash = hash(self.definition)
 
     def contains(self, other : 'Tag') -> bool:
         if other == self:
@@ -31,7 +42,7 @@ class Tag:
         tags : List[Tag] = []
         i = len(self.splitted_definition)
         while i > 0:
-            tags.append(Tag(self.seperator.join(self.splitted_definition[:i])))
+            tags.append(Tag(self.seperator.join(self.splitted_definition[:i]), self.seperator))
             i -= 1
         return tags
 
@@ -4,7 +4,7 @@ import datetime
 import dataconf
 from enum import Enum, auto
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from data_types.Tag import Tag
 
 @dataclass
@@ -15,9 +15,37 @@ class TagDefinition:
     date_to : Optional[str]
     account_id : Optional[str]
 
+    def get_key(self) -> Tuple:
+        return (str(self.tag), self.comment_pattern, self.date_from, self.date_to, self.account_id)
+
 @dataclass
 class TagConfig:
     tag_definitions : List[TagDefinition]
 
+@dataclass
+class TagConfigDiff:
+    unchanged : Dict[int, int] # old index -> new index
+    added : List[int] # new indices
+    removed : List[int] # old indices
+
+    def is_empty(self) -> bool:
+        return len(self.added) == 0 and len(self.removed) == 0
+
 def load_tags(file_path : str) -> TagConfig:
     return dataconf.load(file_path, TagConfig)
+
+def diff_tags(old : TagConfig, new : TagConfig) -> TagConfigDiff:
+    """ A changed tag definition shows up as removed (old version) and added (new version). """
+    old_indices_per_key : Dict[Tuple, List[int]] = {}
+    for old_index, tag_definition in enumerate(old.tag_definitions):
+        old_indices_per_key.setdefault(tag_definition.get_key(), []).append(old_index)
+
+    diff = TagConfigDiff(unchanged={}, added=[], removed=[])
+    for new_index, tag_definition in enumerate(new.tag_definitions):
+        old_indices = old_indices_per_key.get(tag_definition.get_key())
+        if old_indices:
+            diff.unchanged[old_indices.pop(0)] = new_index
+        else:
+            diff.added.append(new_index)
+    diff.removed = [old_index for old_index in range(len(old.tag_definitions)) if old_index not in diff.unchanged]
+    return diff
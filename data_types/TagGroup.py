@@ -1,22 +1,25 @@
 # from __future__ import annotations
-# from typing import List
+from typing import Optional, Tuple
 # from data_types.NewTag import Tag
+from data_types.TagRegistry import TagRegistry
 
 class TagGroup:
     def __init__(self):
         self.__tags : 'List[Tag]' = []
+        self.__tag_ids : Tuple[int, ...] = ()
+        self.__string : Optional[str] = None # only joined when needed, e.g. for labels
 
     def __str__(self) -> str:
-        return " / ".join([str(tag) for tag in self.__tags])
+        if self.__string is None:
+            self.__string = " / ".join([str(tag) for tag in self.__tags])
+        return self.__string
 
     def __hash__(self) -> int:
-        return hash(str(self))
+        return hash(self.__tag_ids)
 
-    def __eq__(self, group: 'TagGroup | str') -> bool:
+    def __eq__(self, group: 'TagGroup') -> bool:
         if isinstance(group, TagGroup):
-            return self.__tags == group.__tags
-        elif isinstance(group, str):
-            return str(self) == str(group)
+            return self.__tag_ids == group.__tag_ids
         else:
             return False
     
@@ -28,7 +31,12 @@ class TagGroup:
 
     def add(self, tag : 'Tag') -> 'TagGroup':
         self.__tags.append(tag)
+        self.__tag_ids += (TagRegistry.get_id(tag),)
+        self.__string = None
         return self
 
+    def get_ids(self) -> Tuple[int, ...]:
+        return self.__tag_ids
+
     def get(self) -> 'List[Tag]':
         return self.__tags
\ No newline at end of file
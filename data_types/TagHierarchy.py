@@ -0,0 +1,53 @@
+from typing import Dict, List, Optional, Tuple
+from data_types.Tag import Tag
+from data_types.TagRegistry import TagRegistry
+
+class TagNode:
+    def __init__(self, tag : Tag, parent : 'Optional[TagNode]'):
+        self.tag : Tag = tag
+        self.parent : Optional[TagNode] = parent
+        self.children : Dict[str, TagNode] = {}
+        self.ancestors : List[TagNode] = [self] + (parent.ancestors if parent else []) # including itself, nearest first
+
+    def get_ancestor_tags(self) -> List[Tag]:
+        return [node.tag for node in self.ancestors]
+
+""" Trie over the separated tag definitions, e.g. Living -> Living-Food -> Living-Food-Restaurant.
+    Every node knows its ancestors, so the tags containing a given tag do not need to be derived again.
+"""
+class TagHierarchy:
+
+    def __init__(self):
+        self.__roots : Dict[str, TagNode] = {}
+        self.__nodes : Dict[Tuple[str, ...], TagNode] = {}
+
+    def add(self, tag : Tag) -> TagNode:
+        path = tuple(tag.splitted_definition)
+        node = self.__nodes.get(path)
+        if node is not None:
+            return node
+        children = self.__roots
+        parent : Optional[TagNode] = None
+        for depth, part in enumerate(path):
+            if part not in children:
+                children[part] = TagNode(TagRegistry.intern(Tag(tag.seperator.join(path[:depth + 1]), seperator=tag.seperator)), parent)
+                self.__nodes[path[:depth + 1]] = children[part]
+            parent = children[part]
+            children = parent.children
+        return parent
+
+    def find(self, tag : Tag) -> Optional[TagNode]:
+        return self.__nodes.get(tuple(tag.splitted_definition))
+
+    def get_ancestor_tags(self, tag : Tag) -> List[Tag]:
+        return self.add(tag).get_ancestor_tags()
+
+    def get_descendants(self, tag : Tag) -> List[TagNode]:
+        """ Returns the node of the tag and all nodes below it. """
+        node = self.find(tag)
+        if node is None:
+            return []
+        descendants = [node]
+        for descendant in descendants:
+            descendants.extend(descendant.children.values())
+        return descendants
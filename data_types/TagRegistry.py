@@ -0,0 +1,64 @@
+from typing import Dict, List
+from data_types.Tag import Tag, UndefinedTag
+
+""" Interns tags: every distinct tag is represented by one canonical instance with a small integer id.
+    Dict and set operations on interned tags hit the identity check instead of comparing definitions.
+    The membership mask of a tag has the bits of the tag itself and of all its ancestor tags set.
+"""
+class TagRegistry:
+
+    __tags : List[Tag] = []
+    __ids : Dict[Tag, int] = {}
+    __masks : Dict[int, int] = {}
+
+    @staticmethod
+    def intern(tag : Tag) -> Tag:
+        return TagRegistry.__tags[TagRegistry.get_id(tag)]
+
+    @staticmethod
+    def intern_all(tags : List[Tag]) -> List[Tag]:
+        return [TagRegistry.intern(tag) for tag in tags]
+
+    @staticmethod
+    def get_id(tag : Tag) -> int:
+        tag_id = TagRegistry.__ids.get(tag)
+        if tag_id is None:
+            tag_id = len(TagRegistry.__tags)
+            TagRegistry.__tags.append(tag)
+            TagRegistry.__ids[tag] = tag_id
+        return tag_id
+
+    @staticmethod
+    def get_tag(tag_id : int) -> Tag:
+        return TagRegistry.__tags[tag_id]
+
+    @staticmethod
+    def get_bit(tag : Tag) -> int:
+        return 1 << TagRegistry.get_id(tag)
+
+    @staticmethod
+    def get_mask(tag : Tag) -> int:
+        tag_id = TagRegistry.get_id(tag)
+        mask = TagRegistry.__masks.get(tag_id)
+        if mask is None:
+            mask = 1 << tag_id
+            for ancestor in tag.get_contained_tags():
+                mask |= TagRegistry.get_bit(ancestor)
+            TagRegistry.__masks[tag_id] = mask
+        return mask
+
+    @staticmethod
+    def get_bits_of_all(tags : List[Tag]) -> int:
+        bits = 0
+        for tag in tags:
+            bits |= TagRegistry.get_bit(tag)
+        return bits
+
+    @staticmethod
+    def get_mask_of_all(tags : List[Tag]) -> int:
+        mask = 0
+        for tag in tags:
+            mask |= TagRegistry.get_mask(tag)
+        return mask
+
+TagRegistry.intern(UndefinedTag)
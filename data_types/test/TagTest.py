@@ -1,6 +1,9 @@
+import pickle
 from typing import Dict
 from data_types.Tag import Tag
 from data_types.TagGroup import TagGroup
+from data_types.TagHierarchy import TagHierarchy
+from data_types.TagRegistry import TagRegistry
 
 def test_new_tag_eq():
     assert Tag("TagName") == Tag("TagName")
@@ -27,4 +30,41 @@ def test_new_tag_get_contained_tags():
     group = TagGroup().add(Tag("TagName-SubName")).add(Tag("TagName"))
     assert Tag("TagName-SubName").get_contained_tags() == group.get()
     group = TagGroup().add(Tag("TagName-SubName-SubSubName")).add(Tag("TagName-SubName")).add(Tag("TagName"))
-    assert Tag("TagName-SubName-SubSubName").get_contained_tags() == group.get()
\ No newline at end of file
+    assert Tag("TagName-SubName-SubSubName").get_contained_tags() == group.get()
+
+def test_tag_hierarchy_ancestors():
+    hierarchy = TagHierarchy()
+    assert hierarchy.get_ancestor_tags(Tag("TagName-SubName-SubSubName")) == Tag("TagName-SubName-SubSubName").get_contained_tags()
+    assert hierarchy.get_ancestor_tags(Tag("TagName")) == [Tag("TagName")]
+    assert hierarchy.find(Tag("TagName-SubName")).parent is hierarchy.find(Tag("TagName"))
+
+def test_tag_hierarchy_descendants():
+    hierarchy = TagHierarchy()
+    hierarchy.add(Tag("TagName-SubName-SubSubName"))
+    hierarchy.add(Tag("TagName-OtherName"))
+    hierarchy.add(Tag("OtherTag"))
+    descendants = [node.tag for node in hierarchy.get_descendants(Tag("TagName"))]
+    assert sorted(str(tag) for tag in descendants) == ["TagName", "TagName-OtherName", "TagName-SubName", "TagName-SubName-SubSubName"]
+    assert hierarchy.get_descendants(Tag("Unknown")) == []
+
+def test_tag_registry_interns_equal_tags():
+    tag = TagRegistry.intern(Tag("Living-Food"))
+    assert TagRegistry.intern(Tag("Living-Food")) is tag
+    assert TagRegistry.get_tag(TagRegistry.get_id(Tag("Living-Food"))) is tag
+    assert TagRegistry.get_id(Tag("Living-Food")) != TagRegistry.get_id(Tag("Living-Rent"))
+
+def test_tag_hash_survives_pickling():
+    tag = pickle.loads(pickle.dumps(Tag("Living-Food")))
+    assert hash(tag) == hash(Tag("Living-Food"))
+    assert tag == Tag("Living-Food")
+
+def test_tag_group_eq_and_hash():
+    group = TagGroup().add(Tag("Living-Food")).add(Tag("Leisure"))
+    same_group = TagGroup().add(Tag("Living-Food")).add(Tag("Leisure"))
+    assert group == same_group
+    assert hash(group) == hash(same_group)
+    assert group != TagGroup().add(Tag("Leisure")).add(Tag("Living-Food"))
+    assert {group: 1.0}[same_group] == 1.0
+    assert str(group) == "Living-Food / Leisure"
+    assert str(group.add(Tag("Living"))) == "Living-Food / Leisure / Living"
+    assert group != "Living-Food / Leisure / Living"
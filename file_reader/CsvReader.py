@@ -1,29 +1,93 @@
+import re
 import csv
 import magic
+from itertools import islice
 from user_interface.logger import logger
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional
 
+""" Reads a csv file with detected encoding and dialect. run reads all rows into memory,
+    iterate_rows yields the rows one by one for streaming.
+    libmagic only checks the first 64 KiB for the encoding, so only those are read for detection.
+    If the rest of the file does not decode with that encoding, reading continues with a full scan,
+    which detects the encoding from the first non-ascii line of the whole file. full_scan always does so.
+    Encoding and dialect can be given to skip detection and sniffing, e.g. the dialect of a cached bank format profile.
+"""
 class CsvReader:
 
-    def __init__(self, input_file : str):
+    ENCODING_SAMPLE_SIZE = 64 * 1024
+
+    DIALECT_ATTRIBUTES = ["delimiter", "quotechar", "escapechar", "doublequote", "skipinitialspace", "lineterminator", "quoting"]
+
+    def __init__(self, input_file : str, full_scan : bool = False, encoding : Optional[str] = None, dialect : Optional[Dict[str, Any]] = None):
         self.__input_file = input_file
+        self.__full_scan : bool = full_scan
+        self.__encoding : Optional[str] = encoding
+        self.__dialect : Optional[Dict[str, Any]] = dialect
 
         self.__content : List[List[str]] = []
 
     def run(self):
-        with open(self.__input_file, "rb") as file:
-            classification = magic.detect_from_content(file.read())
-            logger.debug(f"Detected encoding: {classification.encoding}")
-        with open(self.__input_file, "r", encoding=classification.encoding) as csv_file:
-            csv_dialect = csv.Sniffer().sniff("".join(csv_file.readlines(1024)))
-            csv_file.seek(0)
-            csv_reader = csv.reader(csv_file, dialect=csv_dialect)
-            for row in csv_reader:
-                self.__content.append(row)
-            logger.debug(f"Read {len(self.__content)} lines from csv")
+        self.__content = list(self.iterate_rows())
+
+    def iterate_rows(self) -> Iterator[List[str]]:
+        if self.__encoding is None:
+            self.__encoding = self.__detect_encoding(self.__full_scan)
+        encoding = self.__encoding
+        row_count = 0
+        try:
+            for row in self.__read_rows(encoding):
+                row_count += 1
+                yield row
+        except UnicodeDecodeError:
+            if self.__full_scan:
+                raise
+            logger.warning(f"Encoding {encoding} detected from the first {CsvReader.ENCODING_SAMPLE_SIZE} bytes does not fit {self.__input_file}. Falling back to a full scan.")
+            self.__encoding = self.__detect_encoding(full_scan=True)
+            for row in islice(self.__read_rows(self.__encoding), row_count, None):
+                row_count += 1
+                yield row
+        logger.debug(f"Read {row_count} lines from csv")
 
     def get_content(self) -> List[List[str]]:
         return self.__content
     
     def get_input_file(self) -> str:
         return self.__input_file
+
+    def get_encoding(self) -> Optional[str]:
+        return self.__encoding
+
+    def get_dialect(self) -> Optional[Dict[str, Any]]:
+        return self.__dialect
+
+    def forget_format(self):
+        """ Detect encoding and dialect again on the next read. """
+        self.__encoding = None
+        self.__dialect = None
+
+    def __detect_encoding(self, full_scan : bool) -> str:
+        with open(self.__input_file, "rb") as file:
+            content = file.read() if full_scan else file.read(CsvReader.ENCODING_SAMPLE_SIZE)
+            is_sample = not full_scan and len(file.read(1)) > 0
+        is_cut = False
+        if full_scan:
+            non_ascii = re.search(rb"[\x80-\xff]", content)
+            if non_ascii is not None:
+                line_start = content.rfind(b"\n", 0, non_ascii.start()) + 1
+                is_cut = len(content) - line_start > CsvReader.ENCODING_SAMPLE_SIZE
+                content = content[line_start:line_start + CsvReader.ENCODING_SAMPLE_SIZE]
+        if (is_sample or is_cut) and b"\n" in content:
+            content = content[:content.rindex(b"\n") + 1] # no multibyte character cut in half
+        encoding = magic.detect_from_content(content).encoding
+        if is_sample and encoding == "us-ascii":
+            encoding = "utf-8" # ascii compatible, also decodes non-ascii text after the sample
+        logger.debug(f"Detected encoding: {encoding}")
+        return encoding
+
+    def __read_rows(self, encoding : str) -> Iterator[List[str]]:
+        with open(self.__input_file, "r", encoding=encoding) as csv_file:
+            if self.__dialect is None:
+                csv_dialect = csv.Sniffer().sniff("".join(csv_file.readlines(1024)))
+                self.__dialect = {attribute: getattr(csv_dialect, attribute) for attribute in CsvReader.DIALECT_ATTRIBUTES}
+                csv_file.seek(0)
+            yield from csv.reader(csv_file, **self.__dialect)
@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+from user_interface.logger import logger
+
+@dataclass
+class InputManifestRecord:
+    path : str
+    size : int
+    mtime_ns : int
+    account_idx : Optional[int]
+    content_hash : Optional[str] = None
+
+""" Remembers size, modification time, resolved account and content hash of every ingested input file, stored as json.
+    A record is only returned while size and modification time of its file are unchanged.
+    All records are dropped if the account input directories or the input base path changed, since the accounts were resolved from them.
+"""
+class InputManifest:
+
+    BLOCK_SIZE = 1024*1024
+
+    def __init__(self, file_path : str, accounts_key : str):
+        self.__file_path : str = file_path
+        self.__accounts_key : str = accounts_key
+        self.__records : Dict[str, InputManifestRecord] = {}
+        self.__changed : bool = False
+        self.__load()
+
+    def get(self, path : str, size : int, mtime_ns : int) -> Optional[InputManifestRecord]:
+        record = self.__records.get(path)
+        if record is None or record.size != size or record.mtime_ns != mtime_ns:
+            return None
+        return record
+
+    def put(self, record : InputManifestRecord):
+        if self.__records.get(record.path) != record:
+            self.__records[record.path] = record
+            self.__changed = True
+
+    def remove_missing(self, paths : List[str]):
+        existing_paths = set(paths)
+        for path in [path for path in self.__records if path not in existing_paths]:
+            del self.__records[path]
+            self.__changed = True
+
+    def save(self):
+        if not self.__changed:
+            return
+        with open(self.__file_path, "w") as file:
+            json.dump({"accounts_key": self.__accounts_key, "files": [asdict(record) for record in self.__records.values()]}, file, indent=2)
+        self.__changed = False
+
+    @staticmethod
+    def get_content_hash(path : str) -> str:
+        content_hash = hashlib.sha256()
+        with open(path, "rb") as file:
+            for block in iter(lambda: file.read(InputManifest.BLOCK_SIZE), b""):
+                content_hash.update(block)
+        return content_hash.hexdigest()
+
+    @staticmethod
+    def get_accounts_key(input_base_path : os.PathLike, input_directories : List[str]) -> str:
+        return hashlib.sha256(repr((os.path.normpath(input_base_path), input_directories)).encode()).hexdigest()
+
+    def __load(self):
+        if not os.path.isfile(self.__file_path):
+            return
+        try:
+            with open(self.__file_path, "r") as file:
+                content = json.load(file)
+            if content["accounts_key"] != self.__accounts_key:
+                logger.debug(f"Ignoring input manifest {self.__file_path} of other accounts")
+                self.__changed = True
+                return
+            self.__records = {record["path"]: InputManifestRecord(**record) for record in content["files"]}
+            logger.debug(f"Loaded {len(self.__records)} input files from {self.__file_path}")
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable input manifest {self.__file_path}: {e}")
+            self.__records = {}
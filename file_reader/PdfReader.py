@@ -1,23 +1,93 @@
+import os
 import PyPDF2
 import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Set
+from file_reader.InputManifest import InputManifest
+from user_interface.logger import logger
 
+_worker_reader : Optional[PyPDF2.PdfReader] = None
+
+def _init_worker(file_path : str):
+    global _worker_reader
+    _worker_reader = PyPDF2.PdfReader(file_path)
+
+def _extract_page_text(page_index : int) -> str:
+    return _worker_reader.pages[page_index].extract_text()
+
+""" Reads the text of a pdf with whitespace trimmed to single spaces.
+    With workers the pages are extracted in a process pool, every worker opens the pdf once in its initializer.
+    Page texts are trimmed as they arrive and joined once. With a cache directory the text is stored per content hash of the pdf,
+    since extracting the text of an unchanged pdf again is by far the most expensive step. A known content hash, like the one of the input manifest, spares hashing the pdf.
+"""
 class PdfReader:
 
-    def __init__(self, file_path : str):
+    PARALLEL_MIN_PAGES = 8 # below, starting the workers costs more than extracting the pages
+
+    def __init__(self, file_path : str, workers : int = 0, cache_directory : Optional[str] = None, content_hash : Optional[str] = None):
         self.__file_path : str = file_path
+        self.__workers : int = workers
+        self.__cache_directory : Optional[str] = cache_directory
+        self.__content_hash : Optional[str] = content_hash
         self.__read_text : str  = ""
 
     def run(self):
-        self.__read()
-        self.__trim_whitespace()
-    
+        cache_file_path = self.__get_cache_file_path() if self.__cache_directory is not None else None
+        if cache_file_path is not None and os.path.isfile(cache_file_path):
+            with open(cache_file_path, "r", encoding="utf-8") as file:
+                self.__read_text = file.read()
+            logger.debug(f"Loaded text of {self.__file_path} from {cache_file_path}")
+            return
+        self.__read_text = PdfReader.trim_whitespace("\n" + page_text for page_text in self.__read())
+        if cache_file_path is not None:
+            os.makedirs(self.__cache_directory, exist_ok=True)
+            with open(cache_file_path + ".tmp", "w", encoding="utf-8") as file:
+                file.write(self.__read_text)
+            os.replace(cache_file_path + ".tmp", cache_file_path)
+
     def get_text(self) -> str:
         return self.__read_text
 
-    def __read(self):
+    def __read(self) -> Iterable[str]:
         reader = PyPDF2.PdfReader(self.__file_path)
-        for page in reader.pages:
-            self.__read_text = self.__read_text + "\n" + page.extract_text()
+        page_count = len(reader.pages)
+        if self.__workers <= 1 or page_count < PdfReader.PARALLEL_MIN_PAGES:
+            return [page.extract_text() for page in reader.pages]
+        return self.__read_in_workers(page_count)
+
+    def __read_in_workers(self, page_count : int) -> Iterable[str]:
+        with ProcessPoolExecutor(max_workers=self.__workers, initializer=_init_worker, initargs=(self.__file_path,)) as executor:
+            chunk_size = max(1, page_count // (4 * self.__workers))
+            yield from executor.map(_extract_page_text, range(page_count), chunksize=chunk_size)
+
+    @staticmethod
+    def trim_whitespace(texts : Iterable[str]) -> str:
+        """ Same as replacing every whitespace run of the concatenated texts with a single space, but trims text by text. """
+        trimmed_texts : List[str] = []
+        ends_with_whitespace = False
+        for text in texts:
+            trimmed_text = re.sub(r"\s+", " ", text)
+            if ends_with_whitespace and trimmed_text.startswith(" "):
+                trimmed_text = trimmed_text[1:] # the run continues from the previous text
+            if trimmed_text:
+                trimmed_texts.append(trimmed_text)
+                ends_with_whitespace = trimmed_text.endswith(" ")
+        return "".join(trimmed_texts)
+
+    @staticmethod
+    def remove_unused_cache_files(cache_directory : str, content_hashes : Set[str]):
+        """ Removes the cached texts of pdfs with other content hashes. """
+        if not os.path.isdir(cache_directory):
+            return
+        used_file_names = {PdfReader.get_cache_file_name(content_hash) for content_hash in content_hashes}
+        for file_name in os.listdir(cache_directory):
+            if file_name.endswith(".txt") and file_name not in used_file_names:
+                os.remove(os.path.join(cache_directory, file_name))
+
+    @staticmethod
+    def get_cache_file_name(content_hash : str) -> str:
+        return f"{content_hash}.txt"
 
-    def __trim_whitespace(self):
-        self.__read_text = re.sub("\s+", " ", self.__read_text)
\ No newline at end of file
+    def __get_cache_file_path(self) -> str:
+        content_hash = self.__content_hash if self.__content_hash is not None else InputManifest.get_content_hash(self.__file_path)
+        return os.path.join(self.__cache_directory, PdfReader.get_cache_file_name(content_hash))
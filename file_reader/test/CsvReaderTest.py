@@ -0,0 +1,30 @@
+from file_reader.CsvReader import CsvReader
+
+
+def write_csv(path, rows, encoding):
+    path.write_bytes("\n".join(rows).encode(encoding))
+    return str(path)
+
+def read(input_file, full_scan=False):
+    csv_reader = CsvReader(input_file, full_scan=full_scan)
+    csv_reader.run()
+    return csv_reader.get_content()
+
+def test_sample_detection_equals_full_scan(tmp_path):
+    rows = ["Buchungstag;Betrag;Empfänger"] + [f"01.01.2023;{i},00;Shop {i}" for i in range(5000)] + ["02.01.2023;1,00;Bäckerei"]
+    input_file = write_csv(tmp_path / "utf8.csv", rows, "utf-8")
+    assert read(input_file) == read(input_file, full_scan=True)
+    assert read(input_file)[-1] == ["02.01.2023", "1,00", "Bäckerei"]
+
+def test_falls_back_to_full_scan_if_sample_encoding_does_not_fit(tmp_path, caplog):
+    rows = ["Buchungstag;Betrag;Verwendungszweck"] + [f"01.01.2023;{i},00;Shop {i}" for i in range(5000)] + ["02.01.2023;1,00;Bäckerei Müller"]
+    input_file = write_csv(tmp_path / "latin1.csv", rows, "iso-8859-1")
+    content = read(input_file)
+    assert content == read(input_file, full_scan=True)
+    assert len(content) == len(rows)
+    assert content[-1] == ["02.01.2023", "1,00", "Bäckerei Müller"]
+    assert "Falling back to a full scan" in caplog.text
+
+def test_iterate_rows_of_small_file(tmp_path):
+    input_file = write_csv(tmp_path / "small.csv", ["a,b", "1,2"], "utf-8")
+    assert list(CsvReader(input_file).iterate_rows()) == [["a", "b"], ["1", "2"]]
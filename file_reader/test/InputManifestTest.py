@@ -0,0 +1,39 @@
+from file_reader.InputManifest import InputManifest, InputManifestRecord
+
+def test_round_trip_and_change_detection(tmp_path):
+    manifest_file = str(tmp_path / "manifest.json")
+    manifest = InputManifest(manifest_file, "key")
+    record = InputManifestRecord(path="input/giro/1.csv", size=10, mtime_ns=123, account_idx=0, content_hash="abc")
+    manifest.put(record)
+    manifest.save()
+
+    manifest = InputManifest(manifest_file, "key")
+    assert manifest.get("input/giro/1.csv", 10, 123) == record
+    assert manifest.get("input/giro/1.csv", 11, 123) is None
+    assert manifest.get("input/giro/1.csv", 10, 124) is None
+    assert manifest.get("input/giro/2.csv", 10, 123) is None
+
+def test_other_accounts_drop_records(tmp_path):
+    manifest_file = str(tmp_path / "manifest.json")
+    manifest = InputManifest(manifest_file, "key")
+    manifest.put(InputManifestRecord(path="input/giro/1.csv", size=10, mtime_ns=123, account_idx=0))
+    manifest.save()
+
+    assert InputManifest(manifest_file, "other key").get("input/giro/1.csv", 10, 123) is None
+
+def test_remove_missing(tmp_path):
+    manifest_file = str(tmp_path / "manifest.json")
+    manifest = InputManifest(manifest_file, "key")
+    manifest.put(InputManifestRecord(path="input/giro/1.csv", size=10, mtime_ns=123, account_idx=0))
+    manifest.put(InputManifestRecord(path="input/giro/2.csv", size=10, mtime_ns=123, account_idx=0))
+    manifest.remove_missing(["input/giro/2.csv"])
+    manifest.save()
+
+    manifest = InputManifest(manifest_file, "key")
+    assert manifest.get("input/giro/1.csv", 10, 123) is None
+    assert manifest.get("input/giro/2.csv", 10, 123) is not None
+
+def test_ignores_unreadable_file(tmp_path):
+    manifest_file = tmp_path / "manifest.json"
+    manifest_file.write_text("{ not json")
+    assert InputManifest(str(manifest_file), "key").get("input/giro/1.csv", 10, 123) is None
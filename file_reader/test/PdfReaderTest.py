@@ -0,0 +1,84 @@
+import os
+import re
+import pytest
+from file_reader.InputManifest import InputManifest
+from file_reader.PdfReader import PdfReader
+
+def write_pdf(file_path, page_texts):
+    """ Minimal pdf with one line of Helvetica text per page. """
+    page_count = len(page_texts)
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>",
+               f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * i} 0 R' for i in range(page_count))}] /Count {page_count} >>"]
+    font_id = 3 + 2 * page_count
+    for i, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R /Resources << /Font << /F1 {font_id} 0 R >> >> >>")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    content = b"%PDF-1.4\n"
+    offsets = []
+    for object_id, pdf_object in enumerate(objects, start=1):
+        offsets.append(len(content))
+        content += f"{object_id} 0 obj\n{pdf_object}\nendobj\n".encode("latin-1")
+    xref_offset = len(content)
+    content += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    content += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    content += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode("latin-1")
+    with open(file_path, "wb") as file:
+        file.write(content)
+
+@pytest.fixture
+def pdf_file(tmp_path):
+    file_path = str(tmp_path / "statement.pdf")
+    write_pdf(file_path, [f"Page {i}   01.01. 01.01. Shop {i} 1,00 S" for i in range(PdfReader.PARALLEL_MIN_PAGES)])
+    return file_path
+
+
+def test_parallel_text_equals_sequential_text(pdf_file):
+    sequential_reader = PdfReader(pdf_file)
+    sequential_reader.run()
+    parallel_reader = PdfReader(pdf_file, workers=2)
+    parallel_reader.run()
+
+    assert "Page 0 01.01. 01.01. Shop 0 1,00 S" in sequential_reader.get_text()
+    assert parallel_reader.get_text() == sequential_reader.get_text()
+
+def test_cached_text(pdf_file, tmp_path, mocker):
+    reader = PdfReader(pdf_file, cache_directory=str(tmp_path / "cache"))
+    reader.run()
+
+    pdf_reader = mocker.patch("PyPDF2.PdfReader")
+    cached_reader = PdfReader(pdf_file, cache_directory=str(tmp_path / "cache"))
+    cached_reader.run()
+    assert cached_reader.get_text() == reader.get_text()
+    pdf_reader.assert_not_called()
+
+def test_cached_text_with_known_content_hash(pdf_file, tmp_path, mocker):
+    content_hash = InputManifest.get_content_hash(pdf_file)
+    PdfReader(pdf_file, cache_directory=str(tmp_path / "cache")).run()
+    assert os.listdir(tmp_path / "cache") == [PdfReader.get_cache_file_name(content_hash)]
+
+    get_content_hash = mocker.patch.object(InputManifest, "get_content_hash")
+    cached_reader = PdfReader(pdf_file, cache_directory=str(tmp_path / "cache"), content_hash=content_hash)
+    cached_reader.run()
+    assert "Page 0 01.01. 01.01. Shop 0 1,00 S" in cached_reader.get_text()
+    get_content_hash.assert_not_called()
+
+def test_remove_unused_cache_files(pdf_file, tmp_path):
+    PdfReader(pdf_file, cache_directory=str(tmp_path / "cache")).run()
+    content_hash = InputManifest.get_content_hash(pdf_file)
+
+    PdfReader.remove_unused_cache_files(str(tmp_path / "cache"), {content_hash})
+    assert os.listdir(tmp_path / "cache") == [PdfReader.get_cache_file_name(content_hash)]
+    PdfReader.remove_unused_cache_files(str(tmp_path / "cache"), set())
+    assert os.listdir(tmp_path / "cache") == []
+    PdfReader.remove_unused_cache_files(str(tmp_path / "missing"), set())
+
+@pytest.mark.parametrize("texts", [
+    pytest.param(["\nab  c ", "\n d\t", "\n  ", "\n\ne "], id='runs_across_texts'),
+    pytest.param([" ", "", " a"], id='whitespace_only'),
+    pytest.param([], id='empty'),
+])
+def test_trim_whitespace_equals_trimming_the_joined_texts(texts):
+    assert PdfReader.trim_whitespace(texts) == re.sub(r"\s+", " ", "".join(texts))
@@ -0,0 +1,35 @@
+import bisect
+import datetime
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+""" Sorted sweep over closed date intervals. The boundaries split the time line into segments,
+    for every segment the ids of the intervals covering it are precomputed.
+"""
+class DateIntervalIndex:
+
+    def __init__(self, intervals : List[Tuple[int, datetime.date, datetime.date]]):
+        starting_ids : Dict[datetime.date, List[int]] = {}
+        ending_ids : Dict[datetime.date, List[int]] = {}
+        for interval_id, date_from, date_to in intervals:
+            if date_from > date_to:
+                continue
+            starting_ids.setdefault(date_from, []).append(interval_id)
+            if date_to < datetime.date.max:
+                ending_ids.setdefault(date_to + datetime.timedelta(days=1), []).append(interval_id)
+
+        self.__boundaries : List[datetime.date] = sorted(set(starting_ids.keys()) | set(ending_ids.keys()))
+        self.__active_ids_per_segment : List[FrozenSet[int]] = [frozenset()]
+        active_ids : Set[int] = set()
+        for boundary in self.__boundaries:
+            active_ids.difference_update(ending_ids.get(boundary, []))
+            active_ids.update(starting_ids.get(boundary, []))
+            self.__active_ids_per_segment.append(frozenset(active_ids))
+
+    def get_segment(self, date : datetime.date) -> int:
+        return bisect.bisect_right(self.__boundaries, date)
+
+    def get_active_ids(self, segment : int) -> FrozenSet[int]:
+        return self.__active_ids_per_segment[segment]
+
+    def get_active_ids_on(self, date : datetime.date) -> FrozenSet[int]:
+        return self.get_active_ids(self.get_segment(date))
@@ -1,7 +1,7 @@
 
 from datetime import date
 import re
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
 from statement.CurrencyConverter import CurrencyConverter
 from statement.EntryFilter import EntryFilter
 from data_types.InterpretedEntry import CardType, InterpretedEntry, InterpretedEntryType
@@ -61,3 +61,12 @@ class EntryAugmentation:
                 for entry in all_entries:
                     entry.comment = re.sub(account.transaction_iban_alternative, account.transaction_iban, entry.comment)
         return all_entries
+
+    @staticmethod
+    def iterate_with_original_transaction_iban(all_entries : Iterable[RawEntry], all_accounts : List[Account]) -> Iterator[RawEntry]:
+        """ Streaming variant of replace_alternative_transaction_iban_with_original. """
+        alternative_accounts = [account for account in all_accounts if account.transaction_iban_alternative is not None]
+        for entry in all_entries:
+            for account in alternative_accounts:
+                entry.comment = re.sub(account.transaction_iban_alternative, account.transaction_iban, entry.comment)
+            yield entry
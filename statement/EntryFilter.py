@@ -4,6 +4,7 @@ from data_types.Config import CustomBalance
 from data_types.InterpretedEntry import InterpretedEntry, InterpretedEntryType
 from data_types.RawEntry import RawEntryType
 from data_types.Tag import Tag, UndefinedTag
+from data_types.TagRegistry import TagRegistry
 import datetime
 from user_interface.logger import logger
 import re
@@ -28,13 +29,13 @@ class EntryFilter:
     @staticmethod
     def defined_transactions(entries : List[InterpretedEntry]):
         return [entry for entry in entries 
-                      if entry.is_transaction() and entry.is_tagged() and (UndefinedTag not in entry.tags)]
+                      if entry.is_transaction() and entry.is_tagged() and not entry.has_tag(UndefinedTag)]
 
     @staticmethod
     def undefined_transactions(entries : List[InterpretedEntry]):
         return [entry for entry in entries 
                       if     (entry.is_transaction())
-                         and (entry.is_untagged() or UndefinedTag in entry.tags)]
+                         and (entry.is_untagged() or entry.has_tag(UndefinedTag))]
     
     @staticmethod
     def positive_amount(entries : List[InterpretedEntry]):
@@ -50,7 +51,10 @@ class EntryFilter:
 
     @staticmethod
     def tag(entries : List[InterpretedEntry], given_tag : Tag):
-        return [entry for entry in entries for tag in entry.tags if given_tag.contains(tag)]
+        # The mask test skips entries without the given tag or a descendant of it, the rest keeps one result per contained tag
+        given_tag_bit = TagRegistry.get_bit(given_tag)
+        return [entry for entry in entries if entry.tag_mask & given_tag_bit
+                      for tag in entry.tags if given_tag.contains(tag)]
 
     @staticmethod
     def transactions(entries : List[InterpretedEntry], main_id : Optional[str] = None, other_id : Optional[str] = None):
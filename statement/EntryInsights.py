@@ -114,7 +114,7 @@ class EntryInsights:
         counts = Counter()
         for entry in entries:
             counts[entry.type] += 1
-            counts["tagged"] += 1 if entry.is_tagged() and UndefinedTag not in entry.tags else 0
+            counts["tagged"] += 1 if entry.is_tagged() and not entry.has_tag(UndefinedTag) else 0
 
         return EntryInsights.Statistics(total=len(entries), 
                                         external=counts[InterpretedEntryType.TRANSACTION_EXTERNAL], 
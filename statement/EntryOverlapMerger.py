@@ -0,0 +1,62 @@
+import datetime
+import re
+from typing import Dict, List, Optional, Tuple
+from data_types.InterpretedEntry import InterpretedEntry
+
+""" Drops entries of an additional source, like pdf statements, that duplicate already known entries, like the ones of csv exports.
+    Known entries are indexed by account, date and amount in cents, so every additional entry is looked up in constant time.
+    A duplicate consumes the known entry it duplicates, thus equal transactions are only dropped as often as they are already known.
+    Among known entries with the same key the one with the same normalized comment prefix is preferred.
+    Dates may differ by a few days, since statements and exports do not always agree on booking and value date.
+    Kept entries are indexed as well, so overlapping additional sources do not duplicate each other.
+"""
+class EntryOverlapMerger:
+
+    COMMENT_PREFIX_LENGTH = 12
+    MAX_DAYS_DIFF = 3
+
+    def __init__(self, known_entries : List[InterpretedEntry]):
+        self.__index : Dict[Tuple[str, datetime.date, int], List[InterpretedEntry]] = {}
+        for entry in known_entries:
+            self.__add(entry)
+
+    def merge(self, entries : List[InterpretedEntry]) -> List[InterpretedEntry]:
+        """ Returns the entries that are not known yet. """
+        new_entries : List[InterpretedEntry] = []
+        for entry in entries:
+            if self.__consume_duplicate_of(entry) is None:
+                new_entries.append(entry)
+        for entry in new_entries:
+            self.__add(entry)
+        return new_entries
+
+    @staticmethod
+    def get_key(entry : InterpretedEntry, date : Optional[datetime.date] = None) -> Tuple[str, datetime.date, int]:
+        return (entry.account_id, date if date is not None else entry.date, round(entry.amount * 100))
+
+    @staticmethod
+    def get_comment_prefix(entry : InterpretedEntry) -> str:
+        comment = entry.raw.comment if entry.raw is not None and entry.raw.comment else ""
+        return re.sub(r"[^0-9a-z]", "", comment.lower())[:EntryOverlapMerger.COMMENT_PREFIX_LENGTH]
+
+    def __add(self, entry : InterpretedEntry):
+        if entry.is_balance():
+            return
+        self.__index.setdefault(EntryOverlapMerger.get_key(entry), []).append(entry)
+
+    def __consume_duplicate_of(self, entry : InterpretedEntry) -> Optional[InterpretedEntry]:
+        comment_prefix = EntryOverlapMerger.get_comment_prefix(entry)
+        for days_diff in EntryOverlapMerger.__get_days_diffs_nearest_first():
+            candidates = self.__index.get(EntryOverlapMerger.get_key(entry, entry.date + datetime.timedelta(days=days_diff)))
+            if not candidates:
+                continue
+            candidate_idx = next((idx for idx, candidate in enumerate(candidates) if EntryOverlapMerger.get_comment_prefix(candidate) == comment_prefix), 0)
+            return candidates.pop(candidate_idx)
+        return None
+
+    @staticmethod
+    def __get_days_diffs_nearest_first() -> List[int]:
+        days_diffs = [0]
+        for days_diff in range(1, EntryOverlapMerger.MAX_DAYS_DIFF + 1):
+            days_diffs += [-days_diff, days_diff]
+        return days_diffs
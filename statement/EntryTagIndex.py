@@ -0,0 +1,27 @@
+from typing import Dict, List
+from data_types.InterpretedEntry import InterpretedEntry
+from data_types.Tag import Tag
+from data_types.TagHierarchy import TagHierarchy, TagNode
+
+""" Precomputed tag memberships of entries. An entry is listed under every tag it is tagged with and all their ancestors,
+    once per contained tag like EntryFilter.tag does. Answers "all entries under Living-Food" without comparing tags.
+"""
+class EntryTagIndex:
+
+    def __init__(self, entries : List[InterpretedEntry]):
+        self.__hierarchy : TagHierarchy = TagHierarchy()
+        self.__entries_per_node : Dict[TagNode, List[InterpretedEntry]] = {}
+        for entry in entries:
+            for tag in entry.tags or []:
+                for node in self.__hierarchy.add(tag).ancestors:
+                    if node in self.__entries_per_node:
+                        self.__entries_per_node[node].append(entry)
+                    else:
+                        self.__entries_per_node[node] = [entry]
+
+    def get_entries(self, tag : Tag) -> List[InterpretedEntry]:
+        node = self.__hierarchy.find(tag)
+        return list(self.__entries_per_node.get(node, [])) if node is not None else []
+
+    def get_hierarchy(self) -> TagHierarchy:
+        return self.__hierarchy
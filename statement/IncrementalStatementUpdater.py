@@ -0,0 +1,91 @@
+import bisect
+import datetime
+from typing import Dict, List, Optional, Set, Tuple
+from data_types.Config import Config
+from data_types.InterpretedEntry import InterpretedEntry, InterpretedEntryType
+from statement.EntryMapping import EntryMapping
+from statement.Statement import Statement
+from statement.extractor.InterpretedStatementExtractor import InterpretedStatementExtractor
+
+""" Updates a built statement with added and removed entries instead of building it again.
+    Internal transactions are only matched again for entries near the dates of the added and removed entries.
+    Entries in that window whose match lies outside of it keep their match and take no part in the matching.
+    The entries of each affected account stay sorted by date, added entries follow existing entries of the same date.
+"""
+class IncrementalStatementUpdater:
+
+    WINDOW_WEEKS = 2 # matching considers entries one week around an entry, one more week covers the candidates of those
+
+    def __init__(self, statement : Statement, config : Config):
+        self.__statement : Statement = statement
+        self.__config : Config = config
+
+    def update(self, removed_entries : List[InterpretedEntry], added_entries : List[InterpretedEntry]) -> Set[str]:
+        """ Returns the ids of the accounts whose entries were added, removed or matched differently. """
+        removed_ids : Set[int] = {id(entry) for entry in removed_entries}
+        affected_accounts : Set[str] = {entry.account_id for entry in removed_entries + added_entries}
+        affected_dates : List[datetime.date] = [entry.date for entry in removed_entries + added_entries]
+
+        for entry in removed_entries:
+            match = entry.internal_transaction_match
+            if match is not None and id(match) not in removed_ids:
+                match.internal_transaction_match = None
+                affected_accounts.add(match.account_id)
+                affected_dates.append(match.date)
+
+        entries = [entry for entry in self.__statement.get_entries() if id(entry) not in removed_ids]
+        affected_accounts |= self.__match_internal_transactions_in_window(entries + added_entries, affected_dates)
+        self.__statement.get_entries()[:] = IncrementalStatementUpdater.__insert_sorted_by_date(entries, added_entries)
+        return affected_accounts
+
+    def __match_internal_transactions_in_window(self, entries : List[InterpretedEntry], affected_dates : List[datetime.date]) -> Set[str]:
+        window = IncrementalStatementUpdater.get_window(affected_dates, IncrementalStatementUpdater.WINDOW_WEEKS)
+        window_entries = [entry for entry in entries if IncrementalStatementUpdater.is_in_window(entry.date, window)]
+        window_ids : Set[int] = {id(entry) for entry in window_entries}
+        rematched_entries = [entry for entry in window_entries
+                             if entry.internal_transaction_match is None or id(entry.internal_transaction_match) in window_ids]
+
+        previous_states : List[Tuple[InterpretedEntryType, Optional[int]]] = [(entry.type, id(entry.internal_transaction_match) if entry.internal_transaction_match else None)
+                                                                              for entry in rematched_entries]
+        for entry in rematched_entries:
+            IncrementalStatementUpdater.__reset_type(entry)
+        InterpretedStatementExtractor(rematched_entries, self.__config).run()
+
+        return {entry.account_id for entry, previous_state in zip(rematched_entries, previous_states)
+                if previous_state != (entry.type, id(entry.internal_transaction_match) if entry.internal_transaction_match else None)}
+
+    @staticmethod
+    def __reset_type(entry : InterpretedEntry):
+        # The state entries have before the statement is built
+        entry.internal_transaction_match = None
+        if entry.type == InterpretedEntryType.BALANCE and entry.is_virtual():
+            return
+        entry.type = InterpretedEntryType.TRANSACTION_INTERNAL if entry.is_virtual() else InterpretedEntryType.UNKNOWN
+
+    @staticmethod
+    def get_window(dates : List[datetime.date], weeks : int) -> List[Tuple[datetime.date, datetime.date]]:
+        """ Merged closed date intervals of the given weeks around every date, sorted by their start. """
+        window : List[Tuple[datetime.date, datetime.date]] = []
+        margin = datetime.timedelta(weeks=weeks)
+        for date in sorted(set(dates)):
+            start = date - margin if date - datetime.date.min > margin else datetime.date.min
+            end = date + margin if datetime.date.max - date > margin else datetime.date.max
+            if window and start <= window[-1][1]:
+                window[-1] = (window[-1][0], max(window[-1][1], end))
+            else:
+                window.append((start, end))
+        return window
+
+    @staticmethod
+    def is_in_window(date : datetime.date, window : List[Tuple[datetime.date, datetime.date]]) -> bool:
+        idx = bisect.bisect_right(window, (date, datetime.date.max)) - 1
+        return idx >= 0 and window[idx][0] <= date <= window[idx][1]
+
+    @staticmethod
+    def __insert_sorted_by_date(entries : List[InterpretedEntry], added_entries : List[InterpretedEntry]) -> List[InterpretedEntry]:
+        entries_per_account : Dict[str, List[InterpretedEntry]] = EntryMapping.entries_per_account(entries)
+        for account_id, account_added_entries in EntryMapping.entries_per_account(added_entries).items():
+            account_entries = entries_per_account.setdefault(account_id, [])
+            account_entries.extend(account_added_entries)
+            account_entries.sort(key=lambda entry: entry.date) # stable, so added entries follow the existing ones of the same date
+        return [entry for account_entries in entries_per_account.values() for entry in account_entries]
@@ -0,0 +1,52 @@
+from typing import Dict, List
+from data_types.InterpretedEntry import InterpretedEntry
+from data_types.Tag import Tag, UndefinedTag
+from data_types.TagConfig import TagConfig, TagConfigDiff, diff_tags
+from statement.TagMatcher import TagMatcher
+from user_interface.logger import logger
+
+""" Updates the tags of already interpreted entries after the tag config changed.
+    Only added or changed tag definitions are evaluated, the results of unchanged ones are taken over
+    from the tag definition indices recorded on each entry.
+"""
+class IncrementalTagger:
+
+    def __init__(self, old_tags : TagConfig, new_tags : TagConfig):
+        self.__new_tags : TagConfig = new_tags
+        self.__diff : TagConfigDiff = diff_tags(old_tags, new_tags)
+        self.__added_tag_matcher : TagMatcher = TagMatcher(TagConfig(tag_definitions=[new_tags.tag_definitions[index] for index in self.__diff.added]))
+
+    def get_diff(self) -> TagConfigDiff:
+        return self.__diff
+
+    def run(self, entries : List[InterpretedEntry]) -> int:
+        logger.info(f"Tag config changes: {len(self.__diff.added)} added, {len(self.__diff.removed)} removed, {len(self.__diff.unchanged)} unchanged definitions")
+        if self.__diff.is_empty():
+            return 0
+        new_tags_per_tags_id : Dict[int, List[Tag]] = {}
+        for entry in entries:
+            if entry.raw is None or entry.tag_definition_indices is None:
+                continue
+            new_indices = self.__get_new_tag_definition_indices(entry)
+            new_tags = self.__get_tags(new_indices)
+            entry.tag_definition_indices = new_indices
+            if new_tags != entry.tags:
+                new_tags_per_tags_id[id(entry.tags)] = new_tags
+        changed_entries_count = len(new_tags_per_tags_id)
+        if changed_entries_count > 0:
+            tag_lists = [entry.tags for entry in entries] # keeps the replaced lists alive, so their ids are not reused
+            for entry, tags in zip(entries, tag_lists): # augmented entries share the tag list of their transaction
+                new_tags = new_tags_per_tags_id.get(id(tags))
+                if new_tags is not None:
+                    entry.tags = new_tags
+        logger.info(f"Updated tags of {changed_entries_count} entries")
+        return changed_entries_count
+
+    def __get_new_tag_definition_indices(self, entry : InterpretedEntry) -> tuple:
+        new_indices = [self.__diff.unchanged[old_index] for old_index in entry.tag_definition_indices if old_index in self.__diff.unchanged]
+        new_indices += [self.__diff.added[added_index] for added_index in self.__added_tag_matcher.match_indices(entry.raw.comment, entry.account_id, entry.date)]
+        return tuple(sorted(new_indices))
+
+    def __get_tags(self, indices : tuple) -> List[Tag]:
+        tags = [self.__new_tags.tag_definitions[index].tag for index in indices]
+        return tags if len(tags) > 0 else [UndefinedTag]
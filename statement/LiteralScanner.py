@@ -0,0 +1,91 @@
+import re
+from typing import Dict, List, Optional, Set
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError: # python < 3.11
+    import sre_parse
+    import sre_constants
+
+""" Finds all given literals that occur in a text with one scan over the text (Aho-Corasick automaton).
+"""
+class LiteralScanner:
+
+    def __init__(self, literals : List[str]):
+        self.__goto : List[Dict[str, int]] = [{}]
+        self.__fail : List[int] = [0]
+        self.__outputs : List[Set[int]] = [set()]
+
+        for literal_id, literal in enumerate(literals):
+            self.__add(literal_id, literal)
+        self.__init_fail_links()
+
+    def scan(self, text : str) -> Set[int]:
+        found : Set[int] = set()
+        goto = self.__goto
+        fail = self.__fail
+        outputs = self.__outputs
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                found |= outputs[node]
+        return found
+
+    def __add(self, literal_id : int, literal : str):
+        node = 0
+        for char in literal:
+            if char not in self.__goto[node]:
+                self.__goto.append({})
+                self.__fail.append(0)
+                self.__outputs.append(set())
+                self.__goto[node][char] = len(self.__goto) - 1
+            node = self.__goto[node][char]
+        self.__outputs[node].add(literal_id)
+
+    def __init_fail_links(self):
+        queue : List[int] = list(self.__goto[0].values())
+        for node in queue:
+            for char, child in self.__goto[node].items():
+                queue.append(child)
+                fallback = self.__fail[node]
+                while fallback and char not in self.__goto[fallback]:
+                    fallback = self.__fail[fallback]
+                self.__fail[child] = self.__goto[fallback].get(char, 0)
+                self.__outputs[child] |= self.__outputs[self.__fail[child]]
+
+
+def extract_required_literal(pattern : str) -> Optional[str]:
+    """ Returns the longest literal substring every match of the pattern has to contain, None if there is none. """
+    compiled = re.compile(pattern)
+    if compiled.flags & re.IGNORECASE:
+        return None
+    runs = _literal_runs(sre_parse.parse(pattern))
+    return max(runs, key=len) if runs else None
+
+# Opcodes of parsed patterns that repeat their subpattern, possessive repeats only exist since python 3.11
+REPEATS = {op for op in [getattr(sre_constants, name, None) for name in ["MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"]] if op is not None}
+
+def _literal_runs(subpattern) -> List[str]:
+    runs : List[str] = []
+    current : List[str] = []
+    for op, av in subpattern:
+        if op is sre_constants.LITERAL:
+            current.append(chr(av))
+            continue
+        if current:
+            runs.append("".join(current))
+            current = []
+        if op is sre_constants.SUBPATTERN:
+            _, add_flags, _, inner = av
+            if not add_flags & re.IGNORECASE:
+                runs += _literal_runs(inner)
+        elif op in REPEATS:
+            min_count, _, inner = av
+            if min_count >= 1:
+                runs += _literal_runs(inner)
+    if current:
+        runs.append("".join(current))
+    return runs
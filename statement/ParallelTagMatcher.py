@@ -0,0 +1,48 @@
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from data_types.TagConfig import TagConfig
+from statement.TagMatcher import TagMatcher
+
+_worker_tag_matcher : Optional[TagMatcher] = None
+
+def _init_worker(tags : TagConfig):
+    global _worker_tag_matcher
+    _worker_tag_matcher = TagMatcher(tags)
+
+def _match_chunk(items : List[Tuple[str, str, datetime.date]]) -> List[Tuple[int, ...]]:
+    return _worker_tag_matcher.match_all(items)
+
+""" Shards tagging across a process pool. Every worker compiles the tag config once in its initializer, 
+    chunks of (comment, account_id, date) items are sent out and the matched definition indices come back in order.
+    Small inputs are matched in the calling process, since sending them out costs more than matching them.
+"""
+class ParallelTagMatcher(TagMatcher):
+
+    DEFAULT_CHUNK_SIZE = 512
+
+    def __init__(self, tags : TagConfig, workers : int, chunk_size : int = DEFAULT_CHUNK_SIZE):
+        super().__init__(tags)
+        self.__tags : TagConfig = tags
+        self.__workers : int = workers
+        self.__chunk_size : int = chunk_size
+        self.__executor : Optional[ProcessPoolExecutor] = None
+
+    def match_all(self, items : List[Tuple[str, str, datetime.date]]) -> List[Tuple[int, ...]]:
+        if len(items) < 2 * self.__chunk_size:
+            return super().match_all(items)
+        chunks = [items[start:start + self.__chunk_size] for start in range(0, len(items), self.__chunk_size)]
+        results : List[Tuple[int, ...]] = []
+        for chunk_result in self.__get_executor().map(_match_chunk, chunks):
+            results.extend(chunk_result)
+        return results
+
+    def close(self):
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def __get_executor(self) -> ProcessPoolExecutor:
+        if self.__executor is None:
+            self.__executor = ProcessPoolExecutor(max_workers=self.__workers, initializer=_init_worker, initargs=(self.__tags,))
+        return self.__executor
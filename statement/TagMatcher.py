@@ -0,0 +1,210 @@
+import re
+import time
+import datetime
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from data_types.Tag import Tag
+from data_types.TagRegistry import TagRegistry
+from user_interface.logger import logger
+from data_types.TagConfig import TagDefinition, TagConfig
+from statement.LiteralScanner import LiteralScanner, extract_required_literal
+from statement.DateIntervalIndex import DateIntervalIndex
+
+@dataclass
+class CompiledTagDefinition:
+    index : int
+    tag : Tag
+    comment_pattern : re.Pattern
+    date_from : Optional[datetime.date]
+    date_to : Optional[datetime.date]
+    account_id : Optional[str]
+    required_literal : Optional[str]
+
+    @staticmethod
+    def from_tag_definition(index : int, tag_definition : TagDefinition) -> 'CompiledTagDefinition':
+        date_from : Optional[datetime.date] = None
+        date_to : Optional[datetime.date] = None
+        if tag_definition.date_from and tag_definition.date_to:
+            date_from = datetime.date.fromisoformat(tag_definition.date_from)
+            date_to = datetime.date.fromisoformat(tag_definition.date_to)
+        return CompiledTagDefinition(
+            index = index,
+            tag = TagRegistry.intern(tag_definition.tag),
+            comment_pattern = re.compile(tag_definition.comment_pattern),
+            date_from = date_from,
+            date_to = date_to,
+            account_id = tag_definition.account_id if tag_definition.account_id else None,
+            required_literal = extract_required_literal(tag_definition.comment_pattern))
+
+    def is_date_bounded(self) -> bool:
+        return self.date_from is not None
+
+    def is_active_on(self, date : datetime.date) -> bool:
+        return not self.is_date_bounded() or (self.date_from <= date <= self.date_to)
+
+    def applies_to_account(self, account_id : str) -> bool:
+        return self.account_id is None or self.account_id == account_id
+
+@dataclass
+class TagDefinitionStatistics:
+    regex_seconds : float = 0.0
+    evaluations : int = 0
+    hits : int = 0
+    filtered_hits : int = 0 # pattern matched, but the date or account filter did not apply
+
+""" Matches entry comments against the tag definitions of one TagConfig.
+    Patterns and date bounds are compiled once and definitions are bucketed by account id,
+    so an entry is only checked against definitions that could apply to its account.
+    The literals every pattern requires are searched with one scan over the comment, 
+    only definitions with found literals or without any literal are checked with their regex.
+    Date bounded definitions are kept in an interval index, so only definitions active on the entry date are considered.
+    Results are kept in a bounded LRU cache, since the same comments recur every month.
+    With profiling enabled the cache is disabled and regex time, evaluations and hits are recorded per definition.
+"""
+class TagMatcher:
+
+    DEFAULT_CACHE_SIZE = 8192
+
+    def __init__(self, tags : TagConfig, cache_size : int = DEFAULT_CACHE_SIZE, profile : bool = False):
+        self.__definitions : List[CompiledTagDefinition] = [CompiledTagDefinition.from_tag_definition(index, tag_definition)
+                                                            for index, tag_definition in enumerate(tags.tag_definitions)]
+
+        self.__definitions_without_account : List[CompiledTagDefinition] = []
+        self.__definitions_per_account : Dict[str, List[CompiledTagDefinition]] = {}
+        self.__init_account_buckets()
+
+        self.__literals : List[str] = []
+        self.__definitions_per_literal : List[List[CompiledTagDefinition]] = []
+        self.__init_literals()
+        self.__literal_scanner : LiteralScanner = LiteralScanner(self.__literals)
+
+        self.__date_interval_index : DateIntervalIndex = DateIntervalIndex([(definition.index, definition.date_from, definition.date_to)
+                                                                            for definition in self.__definitions if definition.is_date_bounded()])
+        self.__definitions_without_literal_per_account_and_segment : Dict[Tuple[Optional[str], int], List[CompiledTagDefinition]] = {}
+
+        self.__statistics : Optional[List[TagDefinitionStatistics]] = [TagDefinitionStatistics() for _ in self.__definitions] if profile else None
+
+        self.__cache_size : int = cache_size if not profile else 0
+        self.__cache : 'OrderedDict[tuple, Tuple[int, ...]]' = OrderedDict()
+        self.__cache_hits : int = 0
+        self.__cache_misses : int = 0
+
+    def match(self, comment : str, account_id : str, date : datetime.date) -> List[Tag]:
+        return self.get_tags(self.match_indices(comment, account_id, date))
+
+    def match_all(self, items : List[Tuple[str, str, datetime.date]]) -> List[Tuple[int, ...]]:
+        """ Matches (comment, account_id, date) items, returns the matched definition indices per item. """
+        return [self.match_indices(comment, account_id, date) for comment, account_id, date in items]
+
+    def get_tags(self, indices : Tuple[int, ...]) -> List[Tag]:
+        return [self.__definitions[index].tag for index in indices]
+
+    def match_indices(self, comment : str, account_id : str, date : datetime.date) -> Tuple[int, ...]:
+        if self.__statistics is not None:
+            return self.__evaluate_profiled(comment, account_id, date)
+        # Accounts without own definitions share the general ones
+        account_key = account_id if account_id in self.__definitions_per_account else None
+        segment = self.__date_interval_index.get_segment(date)
+        if self.__cache_size <= 0:
+            return self.__evaluate(comment, account_key, segment)
+        key = (comment, account_key, self.__date_interval_index.get_active_ids(segment))
+        indices = self.__cache.get(key)
+        if indices is not None:
+            self.__cache_hits += 1
+            self.__cache.move_to_end(key)
+            return indices
+        self.__cache_misses += 1
+        indices = self.__evaluate(comment, account_key, segment)
+        self.__cache[key] = indices
+        if len(self.__cache) > self.__cache_size:
+            self.__cache.popitem(last=False)
+        return indices
+
+    def get_definitions(self) -> List[CompiledTagDefinition]:
+        return self.__definitions
+
+    def get_statistics(self) -> Optional[List[TagDefinitionStatistics]]:
+        return self.__statistics
+
+    def log_cache_statistics(self):
+        logger.debug(f"Tag cache: {self.__cache_hits} hits, {self.__cache_misses} misses, {len(self.__cache)} cached comments")
+
+    def close(self):
+        pass
+
+    def __evaluate(self, comment : str, account_key : Optional[str], segment : int) -> Tuple[int, ...]:
+        return tuple(definition.index for definition in self.__get_candidate_definitions(comment, account_key, segment)
+                                      if definition.comment_pattern.search(comment))
+
+    def __evaluate_profiled(self, comment : str, account_id : str, date : datetime.date) -> Tuple[int, ...]:
+        indices : List[int] = []
+        for definition in self.__get_candidate_definitions_of_all_accounts_and_dates(comment):
+            statistics = self.__statistics[definition.index]
+            if not definition.applies_to_account(account_id) or not definition.is_active_on(date):
+                if definition.comment_pattern.search(comment):
+                    statistics.filtered_hits += 1
+                continue
+            start = time.perf_counter()
+            match = definition.comment_pattern.search(comment)
+            statistics.regex_seconds += time.perf_counter() - start
+            statistics.evaluations += 1
+            if match:
+                statistics.hits += 1
+                indices.append(definition.index)
+        return tuple(indices)
+
+    def __init_account_buckets(self):
+        for definition in self.__definitions:
+            if definition.account_id is None:
+                self.__definitions_without_account.append(definition)
+            elif definition.account_id not in self.__definitions_per_account:
+                self.__definitions_per_account[definition.account_id] = [definition]
+            else:
+                self.__definitions_per_account[definition.account_id].append(definition)
+        # Merge account specific definitions with general ones, keeping the order of the tag config
+        for account_id, definitions in self.__definitions_per_account.items():
+            merged = definitions + self.__definitions_without_account
+            merged.sort(key=lambda definition: definition.index)
+            self.__definitions_per_account[account_id] = merged
+
+    def __init_literals(self):
+        literal_ids : Dict[str, int] = {}
+        for definition in self.__definitions:
+            if definition.required_literal is None:
+                continue
+            if definition.required_literal not in literal_ids:
+                literal_ids[definition.required_literal] = len(self.__literals)
+                self.__literals.append(definition.required_literal)
+                self.__definitions_per_literal.append([])
+            self.__definitions_per_literal[literal_ids[definition.required_literal]].append(definition)
+
+    def __get_candidate_definitions(self, comment : str, account_key : Optional[str], segment : int) -> List[CompiledTagDefinition]:
+        candidates = self.__get_definitions_without_literal(account_key, segment)
+        found_literal_ids = self.__literal_scanner.scan(comment)
+        if not found_literal_ids:
+            return candidates
+        active_ids : FrozenSet[int] = self.__date_interval_index.get_active_ids(segment)
+        candidates = list(candidates)
+        for literal_id in found_literal_ids:
+            candidates += [definition for definition in self.__definitions_per_literal[literal_id]
+                                      if definition.applies_to_account(account_key) and (not definition.is_date_bounded() or definition.index in active_ids)]
+        candidates.sort(key=lambda definition: definition.index)
+        return candidates
+
+    def __get_definitions_without_literal(self, account_key : Optional[str], segment : int) -> List[CompiledTagDefinition]:
+        key = (account_key, segment)
+        definitions = self.__definitions_without_literal_per_account_and_segment.get(key)
+        if definitions is None:
+            active_ids : FrozenSet[int] = self.__date_interval_index.get_active_ids(segment)
+            definitions = [definition for definition in self.__definitions_per_account.get(account_key, self.__definitions_without_account)
+                                      if definition.required_literal is None and (not definition.is_date_bounded() or definition.index in active_ids)]
+            self.__definitions_without_literal_per_account_and_segment[key] = definitions
+        return definitions
+
+    def __get_candidate_definitions_of_all_accounts_and_dates(self, comment : str) -> List[CompiledTagDefinition]:
+        candidates : List[CompiledTagDefinition] = [definition for definition in self.__definitions if definition.required_literal is None]
+        for literal_id in self.__literal_scanner.scan(comment):
+            candidates += self.__definitions_per_literal[literal_id]
+        candidates.sort(key=lambda definition: definition.index)
+        return candidates
@@ -0,0 +1,87 @@
+import csv
+from dataclasses import dataclass
+from typing import List
+from statement.TagMatcher import CompiledTagDefinition, TagDefinitionStatistics
+from statement.LiteralScanner import REPEATS, sre_constants, sre_parse
+from user_interface.logger import logger
+
+@dataclass
+class TagProfileRow:
+    definition : CompiledTagDefinition
+    statistics : TagDefinitionStatistics
+    findings : List[str]
+
+""" Report of a profiled TagMatcher, sorted by regex time. Flags definitions that never matched,
+    definitions that only matched outside of their date/account filter and patterns prone to catastrophic backtracking.
+"""
+class TagProfileReport:
+
+    NO_HITS = "no hits"
+    SHADOWED_BY_FILTER = "shadowed by date/account filter"
+    CATASTROPHIC_BACKTRACKING = "prone to catastrophic backtracking"
+
+    def __init__(self, definitions : List[CompiledTagDefinition], statistics : List[TagDefinitionStatistics]):
+        self.__rows : List[TagProfileRow] = [TagProfileRow(definition, statistics[definition.index], TagProfileReport.__get_findings(definition, statistics[definition.index]))
+                                             for definition in definitions]
+        self.__rows.sort(key=lambda row: row.statistics.regex_seconds, reverse=True)
+
+    def get_rows(self) -> List[TagProfileRow]:
+        return self.__rows
+
+    def log(self, top : int = 20):
+        total_seconds = sum(row.statistics.regex_seconds for row in self.__rows)
+        logger.info(f"Tag profile: {len(self.__rows)} definitions, {total_seconds*1000:.1f} ms regex time in total. Most expensive:")
+        for row in self.__rows[:top]:
+            logger.info(f"  {TagProfileReport.__format_row(row)}")
+        for finding in [TagProfileReport.NO_HITS, TagProfileReport.SHADOWED_BY_FILTER, TagProfileReport.CATASTROPHIC_BACKTRACKING]:
+            rows_with_finding = [row for row in self.__rows if finding in row.findings]
+            if rows_with_finding:
+                logger.info(f"Tag definitions {finding}: {len(rows_with_finding)}")
+                for row in rows_with_finding:
+                    logger.debug(f"  {TagProfileReport.__format_row(row)}")
+
+    def write_to_csv(self, filepath : str):
+        with open(filepath, "w", newline="") as file:
+            csvwriter = csv.writer(file, quoting=csv.QUOTE_ALL)
+            csvwriter.writerow(["index", "tag", "comment_pattern", "regex_ms", "evaluations", "hits", "filtered_hits", "findings"])
+            for row in self.__rows:
+                csvwriter.writerow([row.definition.index, str(row.definition.tag), row.definition.comment_pattern.pattern,
+                                    f"{row.statistics.regex_seconds*1000:.3f}", row.statistics.evaluations, row.statistics.hits,
+                                    row.statistics.filtered_hits, ", ".join(row.findings)])
+
+    @staticmethod
+    def __format_row(row : TagProfileRow) -> str:
+        findings = f" ({', '.join(row.findings)})" if row.findings else ""
+        return f"#{row.definition.index} {row.definition.tag} '{row.definition.comment_pattern.pattern}': " \
+               f"{row.statistics.regex_seconds*1000:.2f} ms, {row.statistics.evaluations} evaluations, {row.statistics.hits} hits{findings}"
+
+    @staticmethod
+    def __get_findings(definition : CompiledTagDefinition, statistics : TagDefinitionStatistics) -> List[str]:
+        findings : List[str] = []
+        if statistics.hits == 0:
+            findings.append(TagProfileReport.SHADOWED_BY_FILTER if statistics.filtered_hits > 0 else TagProfileReport.NO_HITS)
+        if is_prone_to_catastrophic_backtracking(definition.comment_pattern.pattern):
+            findings.append(TagProfileReport.CATASTROPHIC_BACKTRACKING)
+        return findings
+
+
+def is_prone_to_catastrophic_backtracking(pattern : str) -> bool:
+    """ Detects nested unbounded repeats like (a+)+ or (.*x)*, which backtrack exponentially on failing input. """
+    return _has_nested_unbounded_repeat(sre_parse.parse(pattern), inside_unbounded_repeat=False)
+
+def _has_nested_unbounded_repeat(subpattern, inside_unbounded_repeat : bool) -> bool:
+    for op, av in subpattern:
+        if op in REPEATS:
+            _, max_count, inner = av
+            is_unbounded = max_count == sre_constants.MAXREPEAT
+            if is_unbounded and inside_unbounded_repeat:
+                return True
+            if _has_nested_unbounded_repeat(inner, inside_unbounded_repeat or is_unbounded):
+                return True
+        elif op is sre_constants.SUBPATTERN:
+            if _has_nested_unbounded_repeat(av[3], inside_unbounded_repeat):
+                return True
+        elif op is sre_constants.BRANCH:
+            if any(_has_nested_unbounded_repeat(branch, inside_unbounded_repeat) for branch in av[1]):
+                return True
+    return False
@@ -0,0 +1,124 @@
+import re
+from enum import Enum, auto
+from itertools import islice
+from typing import Callable, Iterable, Optional
+
+class AmountFormat(Enum):
+    DEBIT_CREDIT_SUFFIX = auto() # 1.234,56 H/S
+    DECIMAL = auto() # -1234,56 or -1234.56
+    THOUSANDS_DOT = auto() # -1.234,56
+
+""" Parses the amounts of one bank export. The format is detected from the first non-empty amounts,
+    the rest is parsed by a string parser specialized on that format. Amounts the specialized parser rejects
+    and files with mixed formats go through the full regex cascade, which defines the result in any case.
+"""
+class AmountParser:
+
+    DETECTION_SAMPLE_SIZE = 5
+
+    def __init__(self, amounts : Iterable[str]):
+        self.__format : Optional[AmountFormat] = AmountParser.detect_format(amounts)
+        self.__fast_parser : Optional[Callable[[str], Optional[float]]] = {
+            AmountFormat.DEBIT_CREDIT_SUFFIX: AmountParser.parse_debit_credit_suffix,
+            AmountFormat.DECIMAL: AmountParser.parse_decimal,
+            AmountFormat.THOUSANDS_DOT: AmountParser.parse_thousands_dot,
+        }.get(self.__format)
+
+    def get_format(self) -> Optional[AmountFormat]:
+        return self.__format
+
+    def parse(self, amount : str) -> Optional[float]:
+        if self.__fast_parser is not None:
+            parsed_amount = self.__fast_parser(amount)
+            if parsed_amount is not None:
+                return parsed_amount
+        return AmountParser.parse_with_cascade(amount)
+
+    @staticmethod
+    def detect_format(amounts : Iterable[str]) -> Optional[AmountFormat]:
+        sample = list(islice((amount for amount in amounts if amount), AmountParser.DETECTION_SAMPLE_SIZE))
+        formats = {AmountParser.get_format_of(amount) for amount in sample}
+        if len(formats) == 1:
+            return formats.pop()
+        return None
+
+    @staticmethod
+    def get_format_of(amount : str) -> Optional[AmountFormat]:
+        if re.fullmatch(r"([\d\.]+),(\d{2}) ([HS])", amount):
+            return AmountFormat.DEBIT_CREDIT_SUFFIX
+        if re.fullmatch(r"(-)?([\d]+)([,.]\d{1,2})", amount):
+            return AmountFormat.DECIMAL
+        if re.fullmatch(r"(-)?(\d{1,3}\.)*(\d{1,3})(,\d{1,2})?", amount):
+            return AmountFormat.THOUSANDS_DOT
+        return None
+
+    @staticmethod
+    def parse_with_cascade(amount : str) -> Optional[float]:
+        match = re.fullmatch(r"([\d\.]+),(\d{2}) ([HS])", amount)
+        if match:
+            before_comma : str = re.sub(r"\.", "", match.group(1))
+            after_comma : str = match.group(2)
+            plus_minus : str = match.group(3)
+
+            parsed_amount = float(int(before_comma))
+            parsed_amount += int(after_comma) / 100.0
+            parsed_amount *= -1 if plus_minus == "S" else +1
+            return parsed_amount
+
+        match = re.fullmatch(r"(-)?([\d]+)([,.]\d{1,2})", amount)
+        if match:
+            dotted_amount = re.sub(",", ".", amount)
+            return float(dotted_amount)
+
+        match = re.fullmatch(r"(-)?(\d{1,3}\.)*(\d{1,3})(,\d{1,2})?", amount)
+        if match:
+            without_thousands_dots = re.sub(r"\.", "", amount)
+            dotted_amount = re.sub(",", ".", without_thousands_dots)
+            return float(dotted_amount)
+
+        return None
+
+    # The fast parsers return None for everything they do not fully accept.
+    # str.isdecimal accepts the same characters as \d, so accepted amounts equal the cascade results.
+
+    @staticmethod
+    def parse_debit_credit_suffix(amount : str) -> Optional[float]:
+        if len(amount) < 6 or amount[-2] != " " or amount[-5] != ",":
+            return None
+        plus_minus = amount[-1]
+        if plus_minus != "H" and plus_minus != "S":
+            return None
+        after_comma = amount[-4:-2]
+        before_comma = amount[:-5].replace(".", "")
+        if not after_comma.isdecimal() or not before_comma.isdecimal() or not amount[:-5].replace(".", "0").isdecimal():
+            return None
+        parsed_amount = float(int(before_comma))
+        parsed_amount += int(after_comma) / 100.0
+        parsed_amount *= -1 if plus_minus == "S" else +1
+        return parsed_amount
+
+    @staticmethod
+    def parse_decimal(amount : str) -> Optional[float]:
+        unsigned = amount[1:] if amount.startswith("-") else amount
+        separator_index = max(unsigned.rfind(","), unsigned.rfind("."))
+        if separator_index < 1 or not 1 <= len(unsigned) - separator_index - 1 <= 2:
+            return None
+        if not unsigned[:separator_index].isdecimal() or not unsigned[separator_index + 1:].isdecimal():
+            return None
+        return float(amount.replace(",", "."))
+
+    @staticmethod
+    def parse_thousands_dot(amount : str) -> Optional[float]:
+        # Amounts like 1.23 are decimals for the cascade, since it checks the decimal form first
+        parsed_amount = AmountParser.parse_decimal(amount)
+        if parsed_amount is not None:
+            return parsed_amount
+        unsigned = amount[1:] if amount.startswith("-") else amount
+        before_comma, comma, after_comma = unsigned.partition(",")
+        if comma and (not 1 <= len(after_comma) <= 2 or not after_comma.isdecimal()):
+            return None
+        for group in before_comma.split("."):
+            if not 1 <= len(group) <= 3 or not group.isdecimal():
+                return None
+        return float(amount.replace(".", "").replace(",", "."))
+
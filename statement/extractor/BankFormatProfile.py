@@ -0,0 +1,67 @@
+import os
+import json
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+from data_types.Config import HeadingConfig
+from user_interface.logger import logger
+
+@dataclass
+class BankFormatProfile:
+    dialect : Dict[str, Any]
+    heading_config : HeadingConfig
+    heading_config_index : int
+    heading_row_index : int
+    header_row : List[str]
+    date_indices : List[int]
+    amount_indices : List[int]
+    comment_indices : List[int]
+
+    def matches(self, head_rows : List[List[str]], heading_configs : List[HeadingConfig]) -> bool:
+        """ The header row is the signature of the format: same row, same heading config. """
+        return self.heading_row_index < len(head_rows) and head_rows[self.heading_row_index] == self.header_row and \
+               self.heading_config_index < len(heading_configs) and heading_configs[self.heading_config_index] == self.heading_config
+
+    @staticmethod
+    def from_dict(profile : Dict[str, Any]) -> 'BankFormatProfile':
+        profile = dict(profile)
+        profile.pop("encoding", None) # stored by earlier versions
+        profile["heading_config"] = HeadingConfig(**profile["heading_config"])
+        return BankFormatProfile(**profile)
+
+""" Bank format profiles per account input directory, stored as json in the export folder.
+    Csv files of the same bank are read with the cached dialect and the cached heading and columns.
+    The encoding is not cached, since exports of the same bank may differ in it and a forced encoding like latin-1 decodes any file without an error.
+"""
+class BankFormatProfileCache:
+
+    def __init__(self, file_path : str):
+        self.__file_path : str = file_path
+        self.__profiles : Dict[str, BankFormatProfile] = {}
+        self.__changed : bool = False
+        self.__load()
+
+    def get(self, input_directory : str) -> Optional[BankFormatProfile]:
+        return self.__profiles.get(input_directory)
+
+    def put(self, input_directory : str, profile : BankFormatProfile):
+        if self.__profiles.get(input_directory) != profile:
+            self.__profiles[input_directory] = profile
+            self.__changed = True
+
+    def save(self):
+        if not self.__changed:
+            return
+        with open(self.__file_path, "w") as file:
+            json.dump({input_directory: asdict(profile) for input_directory, profile in self.__profiles.items()}, file, indent=2)
+        self.__changed = False
+
+    def __load(self):
+        if not os.path.isfile(self.__file_path):
+            return
+        try:
+            with open(self.__file_path, "r") as file:
+                self.__profiles = {input_directory: BankFormatProfile.from_dict(profile) for input_directory, profile in json.load(file).items()}
+            logger.debug(f"Loaded {len(self.__profiles)} bank format profiles from {self.__file_path}")
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable bank format profiles {self.__file_path}: {e}")
+            self.__profiles = {}
@@ -0,0 +1,112 @@
+import datetime
+import numpy
+from typing import List, Optional, Tuple
+from statement.extractor.AmountParser import AmountParser, AmountFormat
+from statement.extractor.DateParser import DateParser, DateFormat
+
+""" Parses whole amount and date columns with NumPy. Every ASCII digit of a value is replaced by 'd' to get its shape,
+    the regex cascades then run once per distinct shape instead of once per row, since the cascade stage only depends on the shape.
+    The digits of all rows with the same shape sit at the same positions and are read from a byte matrix.
+    Rows that cannot be parsed this way (non-ASCII digits, too many digits, invalid calendar dates, unknown formats)
+    are marked as not parsed and are left to the scalar parsers.
+"""
+class ColumnParser:
+
+    MAX_EXACT_DIGITS = 15 # integers up to this many digits are exact in float64
+
+    @staticmethod
+    def parse_amounts(amounts : List[str]) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """ Returns float64 amounts and a bool array of the rows that were parsed. """
+        values = numpy.zeros(len(amounts), dtype=numpy.float64)
+        parsed = numpy.zeros(len(amounts), dtype=bool)
+        for shape, rows, digits in ColumnParser.__group_by_shape(amounts):
+            amount_format = AmountParser.get_format_of(shape.replace("d", "0"))
+            if amount_format is None:
+                continue
+            digit_positions = [i for i, char in enumerate(shape) if char == "d"]
+            if amount_format == AmountFormat.DEBIT_CREDIT_SUFFIX:
+                comma = shape.rindex(",")
+                before_comma = [position for position in digit_positions if position < comma]
+                after_comma = [position for position in digit_positions if position > comma]
+                if len(before_comma) == 0 or len(before_comma) > 18: # without digits the scalar parser raises
+                    continue
+                group_values = ColumnParser.__to_integers(digits, before_comma).astype(numpy.float64)
+                group_values += ColumnParser.__to_integers(digits, after_comma) / 100.0
+                group_values *= -1 if shape.endswith("S") else +1
+            else:
+                if len(digit_positions) > ColumnParser.MAX_EXACT_DIGITS:
+                    continue
+                separators = ",." if amount_format == AmountFormat.DECIMAL else ","
+                separator = max(shape.rfind(separator) for separator in separators)
+                fraction_digits = len([position for position in digit_positions if position > separator]) if separator >= 0 else 0
+                # Exact integer divided by an exact power of ten is the correctly rounded value, like float() of the string
+                group_values = ColumnParser.__to_integers(digits, digit_positions) / float(10 ** fraction_digits)
+                if shape.startswith("-"):
+                    group_values = -group_values
+            values[rows] = group_values
+            parsed[rows] = True
+        return values, parsed
+
+    @staticmethod
+    def parse_dates(dates : List[str]) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """ Returns datetime64[D] dates and a bool array of the rows that were parsed. """
+        values = numpy.zeros(len(dates), dtype="datetime64[D]")
+        parsed = numpy.zeros(len(dates), dtype=bool)
+        for shape, rows, digits in ColumnParser.__group_by_shape(dates):
+            date_format = DateParser.get_format_of(shape.replace("d", "0"))
+            if date_format is None:
+                continue
+            if date_format == DateFormat.ISO:
+                years, months, days = digits[:, 0:4], digits[:, 5:7], digits[:, 8:10]
+            elif date_format == DateFormat.DAY_MONTH_BOOKING_DATE:
+                days, months, years = digits[:, 0:2], digits[:, 3:5], digits[:, 13:17]
+            else:
+                days, months, years = digits[:, 0:2], digits[:, 3:5], digits[:, 6:]
+            years = ColumnParser.__to_integers(years, range(years.shape[1]))
+            months = ColumnParser.__to_integers(months, range(2))
+            days = ColumnParser.__to_integers(days, range(2))
+            if date_format == DateFormat.DAY_MONTH_SHORT_YEAR:
+                years += 2000
+            group_values, valid = ColumnParser.__to_datetime64(years, months, days)
+            values[rows[valid]] = group_values[valid]
+            parsed[rows[valid]] = True
+        return values, parsed
+
+    @staticmethod
+    def __group_by_shape(column : List[str]):
+        """ Yields shape, row indices and the digit matrix (one row per value, one column per character) of every shape. """
+        if len(column) == 0:
+            return
+        column_array = numpy.array(column, dtype=str)
+        width = column_array.dtype.itemsize // 4
+        if width == 0:
+            return
+        characters = column_array.view(numpy.uint32).reshape(len(column), width)
+        is_digit = (characters >= ord("0")) & (characters <= ord("9"))
+        shapes = numpy.where(is_digit, ord("d"), characters)
+        # Non-ASCII characters and NUL characters (which NumPy strips from the end of a value) get an invalid shape
+        lengths = numpy.fromiter(map(len, column), dtype=numpy.int64, count=len(column))
+        invalid = (shapes >= 128).any(axis=1) | ((characters != 0).sum(axis=1) != lengths)
+        shapes[invalid, 0] = 0xFF
+        unique_shapes, inverse = numpy.unique(shapes.astype(numpy.uint8).view(f"S{width}").reshape(-1), return_inverse=True)
+        for shape_index, shape in enumerate(unique_shapes.tolist()):
+            if len(shape) == 0 or shape[0] == 0xFF:
+                continue
+            rows = numpy.flatnonzero(inverse.reshape(-1) == shape_index)
+            yield shape.decode("ascii"), rows, characters[rows, :len(shape)].astype(numpy.int64) - ord("0")
+
+    @staticmethod
+    def __to_integers(digits : numpy.ndarray, positions) -> numpy.ndarray:
+        positions = list(positions)
+        if len(positions) == 0:
+            return numpy.zeros(digits.shape[0], dtype=numpy.int64)
+        weights = 10 ** numpy.arange(len(positions) - 1, -1, -1, dtype=numpy.int64)
+        return digits[:, positions] @ weights
+
+    @staticmethod
+    def __to_datetime64(years : numpy.ndarray, months : numpy.ndarray, days : numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        valid = (years >= datetime.MINYEAR) & (months >= 1) & (months <= 12) & (days >= 1)
+        month_starts = (years - 1970).astype("datetime64[Y]") + numpy.where(valid, months - 1, 0).astype("timedelta64[M]")
+        month_lengths = ((month_starts + numpy.timedelta64(1, "M")).astype("datetime64[D]") - month_starts.astype("datetime64[D]")).astype(numpy.int64)
+        valid &= days <= month_lengths
+        return month_starts.astype("datetime64[D]") + (numpy.where(valid, days, 1) - 1).astype("timedelta64[D]"), valid
@@ -0,0 +1,83 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+from data_types.Config import Config
+from data_types.InterpretedEntry import InterpretedEntry
+from data_types.TagConfig import TagConfig
+from data_types.TagRegistry import TagRegistry
+from file_reader.CsvReader import CsvReader
+from statement.EntryAugmentation import EntryAugmentation
+from statement.TagMatcher import TagMatcher
+from statement.extractor.BankFormatProfile import BankFormatProfile
+from statement.extractor.HeadingDetector import HeadingDetector
+from statement.extractor.InterpretedEntriesExtractor import InterpretedEntriesExtractor
+from statement.extractor.RawEntriesFromCsvExtractor import RawEntriesFromCsvExtractor
+
+@dataclass
+class IngestedFile:
+    input_file : str
+    interpreted_entries : List[InterpretedEntry]
+    bank_format_profile : Optional[BankFormatProfile]
+    seconds : float
+
+""" Runs the chain of one csv file: reading, raw extraction, iban replacement and interpretation. """
+class CsvFileIngestion:
+
+    def __init__(self, config : Config, tags : TagConfig, input_base_path : os.PathLike, tag_matcher : Optional[TagMatcher] = None,
+                 heading_detector : Optional[HeadingDetector] = None, streaming_input : bool = False, full_encoding_scan : bool = False):
+        self.__config : Config = config
+        self.__tags : TagConfig = tags
+        self.__input_base_path : os.PathLike = input_base_path
+        self.__tag_matcher : TagMatcher = tag_matcher if tag_matcher is not None else TagMatcher(tags)
+        self.__heading_detector : HeadingDetector = heading_detector if heading_detector is not None else HeadingDetector(config.headings)
+        self.__streaming_input : bool = streaming_input
+        self.__full_encoding_scan : bool = full_encoding_scan
+
+    def ingest(self, input_file : str, profile : Optional[BankFormatProfile] = None, account_idx : Optional[int] = None) -> IngestedFile:
+        start = time.perf_counter()
+        csv_reader = CsvReader(input_file, full_scan=self.__full_encoding_scan, dialect=profile.dialect if profile else None)
+        raw_extractor = RawEntriesFromCsvExtractor(csv_reader, self.__config, self.__input_base_path, profile, self.__heading_detector, account_idx)
+
+        if self.__streaming_input:
+            augmented_raw_entries = EntryAugmentation.iterate_with_original_transaction_iban(raw_extractor.iterate_raw_entries(), self.__config.internal_accounts)
+        else:
+            csv_reader.run()
+            raw_extractor.run()
+            augmented_raw_entries = EntryAugmentation.replace_alternative_transaction_iban_with_original(raw_extractor.get_raw_entries(), self.__config.internal_accounts)
+
+        interpreted_extractor = InterpretedEntriesExtractor(augmented_raw_entries, self.__config, self.__tags, self.__tag_matcher)
+        interpreted_extractor.run()
+
+        return IngestedFile(input_file = input_file,
+                            interpreted_entries = interpreted_extractor.get_interpreted_entries(),
+                            bank_format_profile = raw_extractor.get_bank_format_profile(),
+                            seconds = time.perf_counter() - start)
+
+_worker_ingestion : Optional[CsvFileIngestion] = None
+
+def _init_worker(config : Config, tags : TagConfig, input_base_path : os.PathLike, streaming_input : bool, full_encoding_scan : bool):
+    global _worker_ingestion
+    _worker_ingestion = CsvFileIngestion(config, tags, input_base_path, streaming_input=streaming_input, full_encoding_scan=full_encoding_scan)
+
+def _ingest(job : Tuple[str, Optional[BankFormatProfile], Optional[int]]) -> IngestedFile:
+    return _worker_ingestion.ingest(*job)
+
+""" Ingests csv files in a process pool. Every worker builds its own tag matcher and heading detector once in its initializer.
+    Results are yielded in the order of the given files, so the statement does not depend on which worker finishes first.
+    Tags of the returned entries are interned again, since unpickled tags are copies of the canonical ones.
+"""
+class ParallelCsvFileIngestion:
+
+    def __init__(self, config : Config, tags : TagConfig, input_base_path : os.PathLike, workers : int,
+                 streaming_input : bool = False, full_encoding_scan : bool = False):
+        self.__initargs : tuple = (config, tags, input_base_path, streaming_input, full_encoding_scan)
+        self.__workers : int = workers
+
+    def ingest_all(self, jobs : List[Tuple[str, Optional[BankFormatProfile], Optional[int]]]) -> Iterator[IngestedFile]:
+        with ProcessPoolExecutor(max_workers=self.__workers, initializer=_init_worker, initargs=self.__initargs) as executor:
+            for ingested_file in executor.map(_ingest, jobs):
+                for entry in ingested_file.interpreted_entries:
+                    entry.tags = TagRegistry.intern_all(entry.tags)
+                yield ingested_file
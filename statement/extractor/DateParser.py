@@ -0,0 +1,140 @@
+import re
+import datetime
+from enum import Enum, auto
+from itertools import islice
+from typing import Callable, Dict, Iterable, Optional
+from user_interface.logger import logger
+
+class DateFormat(Enum):
+    DAY_MONTH_BOOKING_DATE = auto() # 15.03. 16.03.2023
+    DAY_MONTH_YEAR = auto() # 15.03.2023
+    DAY_MONTH_SHORT_YEAR = auto() # 15.03.23
+    ISO = auto() # 2023-03-15
+
+""" Parses the dates of one bank export. Parsed dates are cached per date string, since a file
+    has many more rows than distinct dates. Like the AmountParser, the format is detected from the first
+    non-empty dates and parsed with plain string slicing, other dates go through the regex cascade.
+    Unparseable dates are counted and reported with one warning by log_summary.
+"""
+class DateParser:
+
+    DETECTION_SAMPLE_SIZE = 5
+    SUMMARY_SAMPLE_SIZE = 5
+
+    def __init__(self, dates : Iterable[str]):
+        self.__format : Optional[DateFormat] = DateParser.detect_format(dates)
+        self.__fast_parser : Optional[Callable[[str], Optional[datetime.date]]] = {
+            DateFormat.DAY_MONTH_BOOKING_DATE: DateParser.parse_day_month_booking_date,
+            DateFormat.DAY_MONTH_YEAR: DateParser.parse_day_month_year,
+            DateFormat.DAY_MONTH_SHORT_YEAR: DateParser.parse_day_month_short_year,
+            DateFormat.ISO: DateParser.parse_iso,
+        }.get(self.__format)
+        self.__cache : Dict[str, Optional[datetime.date]] = {}
+        self.__unparseable_counts : Dict[str, int] = {}
+
+    def get_format(self) -> Optional[DateFormat]:
+        return self.__format
+
+    def parse(self, date : str) -> Optional[datetime.date]:
+        if date in self.__cache:
+            parsed_date = self.__cache[date]
+        else:
+            parsed_date = self.__fast_parser(date) if self.__fast_parser is not None else None
+            if parsed_date is None:
+                parsed_date = DateParser.parse_with_cascade(date)
+            self.__cache[date] = parsed_date
+        if parsed_date is None:
+            self.__unparseable_counts[date] = self.__unparseable_counts.get(date, 0) + 1
+        return parsed_date
+
+    def get_unparseable_counts(self) -> Dict[str, int]:
+        return self.__unparseable_counts
+
+    def log_summary(self):
+        if not self.__unparseable_counts:
+            return
+        values = list(self.__unparseable_counts.keys())
+        shown_values = ", ".join(values[:DateParser.SUMMARY_SAMPLE_SIZE]) + (", ..." if len(values) > DateParser.SUMMARY_SAMPLE_SIZE else "")
+        logger.warning(f"Could not extract date from: {shown_values} ({sum(self.__unparseable_counts.values())} entries, {len(values)} distinct values)")
+
+    @staticmethod
+    def detect_format(dates : Iterable[str]) -> Optional[DateFormat]:
+        sample = list(islice((date for date in dates if date), DateParser.DETECTION_SAMPLE_SIZE))
+        formats = {DateParser.get_format_of(date) for date in sample}
+        if len(formats) == 1:
+            return formats.pop()
+        return None
+
+    @staticmethod
+    def get_format_of(date : str) -> Optional[DateFormat]:
+        if re.fullmatch(r"(\d{2})\.(\d{2})\. \d{2}\.\d{2}\.(\d{4})", date):
+            return DateFormat.DAY_MONTH_BOOKING_DATE
+        if re.fullmatch(r"(\d{2})\.(\d{2})\.(\d{4})", date):
+            return DateFormat.DAY_MONTH_YEAR
+        if re.fullmatch(r"(\d{2})\.(\d{2})\.(\d{2})", date):
+            return DateFormat.DAY_MONTH_SHORT_YEAR
+        if re.fullmatch(r"(\d{4})-(\d{2})-(\d{2})", date):
+            return DateFormat.ISO
+        return None
+
+    @staticmethod
+    def parse_with_cascade(date : str) -> Optional[datetime.date]:
+        match = re.fullmatch(r"(\d{2})\.(\d{2})\. \d{2}\.\d{2}\.(\d{4})", date)
+        if match:
+            day = int(match.group(1))
+            month = int(match.group(2))
+            year = int(match.group(3))
+            return datetime.date(year, month, day)
+        match = re.fullmatch(r"(\d{2})\.(\d{2})\.(\d{4})", date)
+        if match:
+            day = int(match.group(1))
+            month = int(match.group(2))
+            year = int(match.group(3))
+            return datetime.date(year, month, day)
+        match = re.fullmatch(r"(\d{2})\.(\d{2})\.(\d{2})", date)
+        if match:
+            day = int(match.group(1))
+            month = int(match.group(2))
+            year = int(match.group(3)) + 2000
+            return datetime.date(year, month, day)
+        match = re.fullmatch(r"(\d{4})-(\d{2})-(\d{2})", date)
+        if match:
+            year = int(match.group(1))
+            month = int(match.group(2))
+            day = int(match.group(3))
+            return datetime.date(year, month, day)
+        return None
+
+    # The fast parsers return None for everything their cascade pattern would not fully match.
+
+    @staticmethod
+    def parse_day_month_booking_date(date : str) -> Optional[datetime.date]:
+        if len(date) != 17 or date[2] != "." or date[5:7] != ". " or date[9] != "." or date[12] != ".":
+            return None
+        if not (date[0:2] + date[3:5] + date[7:9] + date[10:12] + date[13:17]).isdecimal():
+            return None
+        return datetime.date(int(date[13:17]), int(date[3:5]), int(date[0:2]))
+
+    @staticmethod
+    def parse_day_month_year(date : str) -> Optional[datetime.date]:
+        if len(date) != 10 or date[2] != "." or date[5] != ".":
+            return None
+        if not (date[0:2] + date[3:5] + date[6:10]).isdecimal():
+            return None
+        return datetime.date(int(date[6:10]), int(date[3:5]), int(date[0:2]))
+
+    @staticmethod
+    def parse_day_month_short_year(date : str) -> Optional[datetime.date]:
+        if len(date) != 8 or date[2] != "." or date[5] != ".":
+            return None
+        if not (date[0:2] + date[3:5] + date[6:8]).isdecimal():
+            return None
+        return datetime.date(int(date[6:8]) + 2000, int(date[3:5]), int(date[0:2]))
+
+    @staticmethod
+    def parse_iso(date : str) -> Optional[datetime.date]:
+        if len(date) != 10 or date[4] != "-" or date[7] != "-":
+            return None
+        if not (date[0:4] + date[5:7] + date[8:10]).isdecimal():
+            return None
+        return datetime.date(int(date[0:4]), int(date[5:7]), int(date[8:10]))
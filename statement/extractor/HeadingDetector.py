@@ -0,0 +1,71 @@
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from data_types.Config import HeadingConfig
+
+@dataclass
+class HeadingIndex:
+    in_csv : int
+    in_config : int
+
+@dataclass
+class CompiledHeadingConfig:
+    pattern : re.Pattern
+    column_headings_count : int
+    search_rows : int
+
+""" Finds the heading row of a csv and its columns for all heading configs at once.
+    The alternation pattern of every heading config is compiled once. The first rows are scanned row by row,
+    every row is joined once and checked against all configs. As before, the config with the lowest index wins, 
+    within a config the first row wins. A config matches a row if its pattern is found as often as it has column headings.
+"""
+class HeadingDetector:
+
+    DEFAULT_SEARCH_ROWS = 12
+
+    def __init__(self, heading_configs : Optional[List[HeadingConfig]]):
+        self.__heading_configs : List[HeadingConfig] = heading_configs if heading_configs is not None else []
+        self.__compiled : List[CompiledHeadingConfig] = [HeadingDetector.__compile(heading_config) for heading_config in self.__heading_configs]
+        self.__search_rows : int = max([compiled.search_rows for compiled in self.__compiled], default=HeadingDetector.DEFAULT_SEARCH_ROWS)
+
+    def get_search_rows(self) -> int:
+        return self.__search_rows
+
+    def find_heading_index(self, rows : List[List[str]]) -> Optional[HeadingIndex]:
+        heading_index : Optional[HeadingIndex] = None
+        for row_index, row in enumerate(rows[:self.__search_rows]):
+            row_as_string = " ".join(row)
+            checked_configs = len(self.__compiled) if heading_index is None else heading_index.in_config
+            for config_index in range(checked_configs):
+                compiled = self.__compiled[config_index]
+                if row_index < compiled.search_rows and len(compiled.pattern.findall(row_as_string)) == compiled.column_headings_count:
+                    heading_index = HeadingIndex(row_index, config_index)
+                    break
+            if heading_index is not None and heading_index.in_config == 0:
+                break
+        return heading_index
+
+    def find_column_indices(self, heading_row : List[str], config_index : int) -> Tuple[List[Optional[int]], List[Optional[int]], List[Optional[int]]]:
+        """ Returns the date, amount and comment column indices, None for a column heading not found. """
+        heading_config = self.__heading_configs[config_index]
+        column_headings : List[str] = heading_config.date + heading_config.amount + heading_config.comment
+        indices : List[Optional[int]] = [None] * len(column_headings)
+        missing = len(column_headings)
+        for column_index, column in enumerate(heading_row):
+            if missing == 0:
+                break
+            for i, column_heading in enumerate(column_headings):
+                if indices[i] is None and column_heading in column:
+                    indices[i] = column_index
+                    missing -= 1
+        date_end = len(heading_config.date)
+        amount_end = date_end + len(heading_config.amount)
+        return indices[:date_end], indices[date_end:amount_end], indices[amount_end:]
+
+    @staticmethod
+    def __compile(heading_config : HeadingConfig) -> CompiledHeadingConfig:
+        column_headings = heading_config.date + heading_config.amount + heading_config.comment
+        return CompiledHeadingConfig(
+            pattern = re.compile("(" + "|".join([re.escape(heading) for heading in column_headings]) + ")"),
+            column_headings_count = len(column_headings),
+            search_rows = heading_config.search_rows if heading_config.search_rows is not None else HeadingDetector.DEFAULT_SEARCH_ROWS)
@@ -0,0 +1,80 @@
+import hashlib
+import os
+import pickle
+from typing import Optional, Set
+from data_types.Config import Config
+from data_types.TagConfig import TagConfig
+from data_types.TagRegistry import TagRegistry
+from file_reader.InputManifest import InputManifest
+from statement.extractor.BankFormatProfile import BankFormatProfile
+from statement.extractor.CsvFileIngestion import IngestedFile
+from user_interface.logger import logger
+
+""" Persists the interpreted entries of every ingested input file, one pickle per file in the cache directory.
+    An entry is keyed by the content hash and path of the input file and by a hash of the config and tag sections and the options the interpretation depends on,
+    so a changed file, a moved file or a changed config or tag definition leads to a cache miss.
+    The key does not depend on the bank format profile, which only exists after the first file of a directory was read.
+    Instead an entry is missed if the profile given to get would read the file with another dialect than the one it was read with.
+    Cached files that were neither loaded nor stored during a run are removed with remove_unused.
+"""
+class InterpretedEntriesCache:
+
+    VERSION = 2 # increase if the interpretation changes in a way the keys do not cover
+
+    def __init__(self, directory : str, config : Config, tags : TagConfig, full_encoding_scan : bool = False):
+        self.__directory : str = directory
+        self.__settings_hash : str = InterpretedEntriesCache.get_settings_hash(config, tags, full_encoding_scan)
+        self.__used_file_names : Set[str] = set()
+        os.makedirs(self.__directory, exist_ok=True)
+
+    def get_key(self, input_file : str, content_hash : Optional[str] = None) -> str:
+        key = hashlib.sha256()
+        key.update((content_hash if content_hash is not None else InputManifest.get_content_hash(input_file)).encode())
+        key.update(os.path.normpath(input_file).encode())
+        key.update(self.__settings_hash.encode())
+        return key.hexdigest()
+
+    def get(self, key : str, profile : Optional[BankFormatProfile] = None) -> Optional[IngestedFile]:
+        file_path = self.__get_file_path(key)
+        if not os.path.isfile(file_path):
+            return None
+        try:
+            with open(file_path, "rb") as file:
+                ingested_file : IngestedFile = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as e:
+            logger.warning(f"Ignoring unreadable cached entries {file_path}: {e}")
+            return None
+        if not InterpretedEntriesCache.is_read_as_with(ingested_file.bank_format_profile, profile):
+            return None
+        for entry in ingested_file.interpreted_entries:
+            entry.tags = TagRegistry.intern_all(entry.tags)
+        self.__used_file_names.add(os.path.basename(file_path))
+        return ingested_file
+
+    def put(self, key : str, ingested_file : IngestedFile):
+        file_path = self.__get_file_path(key)
+        with open(file_path, "wb") as file:
+            pickle.dump(ingested_file, file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.__used_file_names.add(os.path.basename(file_path))
+
+    def remove_unused(self):
+        for file_name in os.listdir(self.__directory):
+            if file_name.endswith(".pickle") and file_name not in self.__used_file_names:
+                os.remove(os.path.join(self.__directory, file_name))
+
+    @staticmethod
+    def is_read_as_with(read_profile : Optional[BankFormatProfile], profile : Optional[BankFormatProfile]) -> bool:
+        """ A profile is only applied to files with its header, others are detected again like without a profile. """
+        if read_profile is None or profile is None:
+            return True
+        has_header = read_profile.header_row == profile.header_row and read_profile.heading_row_index == profile.heading_row_index and \
+                     read_profile.heading_config_index == profile.heading_config_index
+        return not has_header or read_profile.dialect == profile.dialect
+
+    @staticmethod
+    def get_settings_hash(config : Config, tags : TagConfig, full_encoding_scan : bool = False) -> str:
+        settings = repr((InterpretedEntriesCache.VERSION, config.internal_accounts, config.headings, config.currency_config, tags.tag_definitions, full_encoding_scan))
+        return hashlib.sha256(settings.encode()).hexdigest()
+
+    def __get_file_path(self, key : str) -> str:
+        return os.path.join(self.__directory, f"{key}.pickle")
@@ -3,27 +3,101 @@ import datetime
 from user_interface.logger import logger
 from data_types.Config import Config
 from data_types.Tag import UndefinedTag
-from data_types.TagConfig import TagDefinition, TagConfig
+from data_types.TagConfig import TagConfig
 from data_types.RawEntry import RawEntry, RawEntryType
 from data_types.InterpretedEntry import InterpretedEntry, InterpretedEntryType, CardType
-from typing import List
+from typing import Dict, Iterable, List, Optional
+from itertools import islice
+from dataclasses import dataclass
+from data_types.Currency import CurrencyCode
 from statement.CurrencyConverter import CurrencyConverter
+from statement.TagMatcher import TagMatcher
+from statement.extractor.AmountParser import AmountParser
+from statement.extractor.DateParser import DateParser
+from statement.extractor.ColumnParser import ColumnParser
+
+@dataclass
+class AccountData:
+    account_id : str
+    currency : Optional[CurrencyCode]
+    card_type : CardType
 
 """ Extracts interpreted entries from raw entries. Considering entries individually.
+    By default all fields of an entry are filled in one pass, with the account data resolved once per account.
+    The raw entries may be a generator, they are consumed chunk wise.
+    The staged mode runs one pass per field and is kept as reference.
 """
 class InterpretedEntriesExtractor:
 
-    def __init__(self, raw_entries : List[RawEntry], config : Config, tags : TagConfig):
-        self.__raw_entries : List[RawEntry] = raw_entries
+    COLUMN_PARSING_MIN_ROWS = 256 # below, the NumPy setup costs more than parsing row by row
+    CHUNK_SIZE = 4096 # raw entries are consumed in chunks, so they can be streamed
+
+    def __init__(self, raw_entries : Iterable[RawEntry], config : Config, tags : TagConfig, tag_matcher : Optional[TagMatcher] = None):
+        self.__raw_entries : Iterable[RawEntry] = raw_entries
         self.__config : Config = config
 
         self.__interpreted_entries : List[InterpretedEntry] = []
-        self.__init_interpreted_entries()
 
-        self.__tag_definitions : List[TagDefinition] = tags.tag_definitions
+        self.__tag_matcher : TagMatcher = tag_matcher if tag_matcher is not None else TagMatcher(tags)
         self.__currency_converter : CurrencyConverter = CurrencyConverter(config.currency_config)
 
-    def run(self):
+    def run(self, staged : bool = False):
+        if staged:
+            self.__run_staged()
+        else:
+            self.__run_fused()
+
+    def get_interpreted_entries(self):
+        return self.__interpreted_entries
+
+    def __run_fused(self):
+        raw_entries = iter(self.__raw_entries)
+        chunk : List[RawEntry] = list(islice(raw_entries, InterpretedEntriesExtractor.CHUNK_SIZE))
+        amount_parser = AmountParser(raw_entry.amount for raw_entry in chunk)
+        date_parser = DateParser(raw_entry.date for raw_entry in chunk)
+        account_data_per_idx : Dict[int, AccountData] = {}
+        while chunk:
+            self.__interpreted_entries += self.__interpret_chunk(chunk, amount_parser, date_parser, account_data_per_idx)
+            chunk = list(islice(raw_entries, InterpretedEntriesExtractor.CHUNK_SIZE))
+        date_parser.log_summary()
+        self.__ensure_ascending_date_order()
+
+    def __interpret_chunk(self, raw_entries : List[RawEntry], amount_parser : AmountParser, date_parser : DateParser, account_data_per_idx : Dict[int, AccountData]) -> List[InterpretedEntry]:
+        parsed_amounts = InterpretedEntriesExtractor.__parse_amounts([raw_entry.amount for raw_entry in raw_entries], amount_parser)
+        parsed_dates = InterpretedEntriesExtractor.__parse_dates([raw_entry.date for raw_entry in raw_entries], date_parser)
+        entries : List[InterpretedEntry] = []
+        for raw_entry, parsed_amount, parsed_date in zip(raw_entries, parsed_amounts, parsed_dates):
+            account_data = account_data_per_idx.get(raw_entry.account_idx)
+            if account_data is None:
+                account_data = self.__get_account_data(raw_entry.account_idx)
+                account_data_per_idx[raw_entry.account_idx] = account_data
+            entry = InterpretedEntry(tags = [], raw = raw_entry, card_type = account_data.card_type, account_id = account_data.account_id)
+            if parsed_amount is not None:
+                entry.original_amount = parsed_amount
+                entry.original_currency = account_data.currency
+                entry.converted_amount = self.__currency_converter.convert(parsed_amount, account_data.currency)
+                entry.amount = entry.converted_amount
+            else:
+                logger.warning(f"Could not extract amount from: {raw_entry.amount}")
+            if parsed_date is not None:
+                entry.date = parsed_date
+            entries.append(entry)
+        # one batch per chunk, so a parallel tag matcher can shard it
+        for entry, indices in zip(entries, self.__tag_matcher.match_all([(entry.raw.comment, entry.account_id, entry.date) for entry in entries])):
+            entry.tag_definition_indices = indices
+            entry.tags = self.__tag_matcher.get_tags(indices) or [UndefinedTag]
+        return entries
+
+    def __get_account_data(self, account_idx : int) -> AccountData:
+        account = self.__config.internal_accounts[account_idx]
+        match = re.search("(VISA|Kreditkarte|credit)", account.get_input_directory()) # TODO Config
+        return AccountData(account_id = account.get_id(),
+                           currency = account.get_currency_code(),
+                           card_type = CardType.CREDIT if match else CardType.GIRO)
+
+    def __run_staged(self):
+        self.__raw_entries = list(self.__raw_entries)
+        self.__init_interpreted_entries()
         self.__extract_amount()
         self.__extract_date()
         self.__extract_card_type()
@@ -32,39 +106,14 @@ class InterpretedEntriesExtractor:
         self.__add_undefined_tag_for_entries_without_tags()
         self.__ensure_ascending_date_order()
 
-    def get_interpreted_entries(self):
-        return self.__interpreted_entries
-
     def __init_interpreted_entries(self):
         self.__interpreted_entries = [InterpretedEntry(tags = [], raw = raw_entry) for raw_entry in self.__raw_entries]
 
     def __extract_amount(self):
+        amounts = [raw_entry.amount for raw_entry in self.__raw_entries]
+        parsed_amounts = InterpretedEntriesExtractor.__parse_amounts(amounts, AmountParser(amounts))
         for i, raw_entry in enumerate(self.__raw_entries):
-            parsed_amount = None
-
-            if parsed_amount is None:
-                match = re.fullmatch(r"([\d\.]+),(\d{2}) ([HS])", raw_entry.amount)
-                if match:
-                    before_comma : str = re.sub(r"\.", "", match.group(1))
-                    after_comma : str = match.group(2)
-                    plus_minus : str = match.group(3)
-
-                    parsed_amount = float(int(before_comma))
-                    parsed_amount += int(after_comma) / 100.0
-                    parsed_amount *= -1 if plus_minus == "S" else +1
-
-            if parsed_amount is None:
-                match = re.fullmatch(r"(-)?([\d]+)([,.]\d{1,2})", raw_entry.amount)
-                if match:
-                    dotted_amount = re.sub(",", ".", raw_entry.amount)
-                    parsed_amount = float(dotted_amount)
-
-            if parsed_amount is None:
-                match = re.fullmatch(r"(-)?(\d{1,3}\.)*(\d{1,3})(,\d{1,2})?", raw_entry.amount)
-                if match:
-                    without_thousands_dots = re.sub(r"\.", "", raw_entry.amount)
-                    dotted_amount = re.sub(",", ".", without_thousands_dots)
-                    parsed_amount = float(dotted_amount)
+            parsed_amount = parsed_amounts[i]
 
             if parsed_amount is None:
                 logger.warning(f"Could not extract amount from: {raw_entry.amount}")
@@ -81,36 +130,29 @@ class InterpretedEntriesExtractor:
             self.__interpreted_entries[i].amount = converted
 
     def __extract_date(self):
-        for i, raw_entry in enumerate(self.__raw_entries):
-            match = re.fullmatch(r"(\d{2})\.(\d{2})\. \d{2}\.\d{2}\.(\d{4})", raw_entry.date)
-            if match:
-                day = int(match.group(1))
-                month = int(match.group(2))
-                year = int(match.group(3))
-                self.__interpreted_entries[i].date = datetime.date(year, month, day)
-                continue
-            match = re.fullmatch(r"(\d{2})\.(\d{2})\.(\d{4})", raw_entry.date)
-            if match:
-                day = int(match.group(1))
-                month = int(match.group(2))
-                year = int(match.group(3))
-                self.__interpreted_entries[i].date = datetime.date(year, month, day)
-                continue
-            match = re.fullmatch(r"(\d{2})\.(\d{2})\.(\d{2})", raw_entry.date)
-            if match:
-                day = int(match.group(1))
-                month = int(match.group(2))
-                year = int(match.group(3)) + 2000
-                self.__interpreted_entries[i].date = datetime.date(year, month, day)
-                continue
-            match = re.fullmatch(r"(\d{4})-(\d{2})-(\d{2})", raw_entry.date)
-            if match:
-                year = int(match.group(1))
-                month = int(match.group(2))
-                day = int(match.group(3))
-                self.__interpreted_entries[i].date = datetime.date(year, month, day)
-                continue
-            logger.warning("Could not extract date from: " + raw_entry.date)
+        dates = [raw_entry.date for raw_entry in self.__raw_entries]
+        date_parser = DateParser(dates)
+        parsed_dates = InterpretedEntriesExtractor.__parse_dates(dates, date_parser)
+        for i, parsed_date in enumerate(parsed_dates):
+            if parsed_date is not None:
+                self.__interpreted_entries[i].date = parsed_date
+        date_parser.log_summary()
+
+    @staticmethod
+    def __parse_dates(dates : List[str], date_parser : DateParser) -> List[Optional[datetime.date]]:
+        if len(dates) >= InterpretedEntriesExtractor.COLUMN_PARSING_MIN_ROWS:
+            values, parsed = ColumnParser.parse_dates(dates)
+            parsed_dates = [value if is_parsed else date_parser.parse(date) for date, value, is_parsed in zip(dates, values.tolist(), parsed.tolist())]
+        else:
+            parsed_dates = [date_parser.parse(date) for date in dates]
+        return parsed_dates
+
+    @staticmethod
+    def __parse_amounts(amounts : List[str], amount_parser : AmountParser) -> List[Optional[float]]:
+        if len(amounts) < InterpretedEntriesExtractor.COLUMN_PARSING_MIN_ROWS:
+            return [amount_parser.parse(amount) for amount in amounts]
+        values, parsed = ColumnParser.parse_amounts(amounts)
+        return [value if is_parsed else amount_parser.parse(amount) for amount, value, is_parsed in zip(amounts, values.tolist(), parsed.tolist())]
     
     def __extract_card_type(self):
         for entry in self.__interpreted_entries:
@@ -126,24 +168,15 @@ class InterpretedEntriesExtractor:
             entry.account_id = self.__config.internal_accounts[entry.raw.account_idx].get_id()
 
     def __extract_tags(self):
-        for entry in self.__interpreted_entries:
-            for tag_definition in self.__tag_definitions:
-                if tag_definition.date_from and tag_definition.date_to:
-                    date_from = datetime.date.fromisoformat(tag_definition.date_from)
-                    date_to = datetime.date.fromisoformat(tag_definition.date_to)
-                    if entry.date < date_from or entry.date > date_to:
-                        continue
-                if tag_definition.account_id:
-                    if entry.account_id != tag_definition.account_id:
-                        continue
-                if not re.search(tag_definition.comment_pattern, entry.raw.comment):
-                    continue
-                entry.tags.append(tag_definition.tag)
+        items = [(entry.raw.comment, entry.account_id, entry.date) for entry in self.__interpreted_entries]
+        for entry, indices in zip(self.__interpreted_entries, self.__tag_matcher.match_all(items)):
+            entry.tag_definition_indices = indices
+            entry.tags = entry.tags + self.__tag_matcher.get_tags(indices)
 
     def __add_undefined_tag_for_entries_without_tags(self):
         for entry in self.__interpreted_entries:
             if len(entry.tags) == 0:
-                entry.tags.append(UndefinedTag)
+                entry.tags = [UndefinedTag]
 
     def __ensure_ascending_date_order(self):
         """
@@ -1,63 +1,122 @@
 import os
-from dataclasses import dataclass
 from data_types.RawEntry import RawEntry, RawEntryType
+from data_types.RawEntryColumns import RawEntryColumns
 from typing import *
 from data_types.Config import Config
 from file_reader.CsvReader import CsvReader
+from statement.extractor.BankFormatProfile import BankFormatProfile
+from statement.extractor.HeadingDetector import HeadingDetector, HeadingIndex
 from user_interface.logger import logger
 import re
-
-@dataclass
-class HeadingIndex:
-    in_csv : int
-    in_config : int
+from itertools import chain, islice
 
 class RawEntriesFromCsvExtractor:
 
-    def __init__(self, csv : CsvReader, config : Config, input_base_path : os.PathLike):
+    def __init__(self, csv : CsvReader, config : Config, input_base_path : os.PathLike, profile : Optional[BankFormatProfile] = None,
+                 heading_detector : Optional[HeadingDetector] = None, account_idx : Optional[int] = None):
         self.__csv : CsvReader = csv
         self.__config : Config = config
+        self.__heading_detector : HeadingDetector = heading_detector if heading_detector is not None else HeadingDetector(config.headings)
         self.__input_base_path : os.PathLike = input_base_path
+        self.__profile : Optional[BankFormatProfile] = profile
+        self.__known_account_idx : Optional[int] = account_idx # already resolved from the path of the csv
 
         self.__raw_entries : List[RawEntry] = []
+        self.__heading_row : Optional[List[str]] = None
 
     def run(self):
-        if len(self.__csv.get_content()) < 2:
+        self.__raw_entries = list(self.__iterate_raw_entries(iter(self.__csv.get_content()), self.__reread_content))
+
+    def iterate_raw_entries(self) -> Iterator[RawEntry]:
+        """ Streams the raw entries while reading the csv, only the rows searched for the heading are kept. """
+        return self.__iterate_raw_entries(self.__csv.iterate_rows(), self.__csv.iterate_rows)
+
+    def get_bank_format_profile(self) -> Optional[BankFormatProfile]:
+        """ Profile of the read csv, None if no entries could be extracted. """
+        if self.__heading_row is None or self.__csv.get_dialect() is None:
+            return None
+        return BankFormatProfile(dialect = self.__csv.get_dialect(),
+                                 heading_config = self.__config.headings[self.__heading_index.in_config],
+                                 heading_config_index = self.__heading_index.in_config,
+                                 heading_row_index = self.__heading_index.in_csv,
+                                 header_row = self.__heading_row,
+                                 date_indices = self.__date_indices,
+                                 amount_indices = self.__amount_indices,
+                                 comment_indices = self.__comment_indices)
+
+    def __reread_content(self) -> Iterator[List[str]]:
+        self.__csv.run()
+        return iter(self.__csv.get_content())
+
+    def run_columnar(self):
+        """ Like run, but extracts the raw entries as columns with bulk whitespace cleanup, for consumers that work on whole columns. """
+        self.__raw_entry_columns = None
+        data_rows = self.__find_format(iter(self.__csv.get_content()), self.__reread_content)
+        if data_rows is not None:
+            self.__raw_entry_columns = self.__extract_columns(data_rows)
+
+    def get_raw_entry_columns(self) -> Optional[RawEntryColumns]:
+        return self.__raw_entry_columns
+
+    def __iterate_raw_entries(self, rows : Iterator[List[str]], reread_rows : Callable[[], Iterator[List[str]]]) -> Iterator[RawEntry]:
+        data_rows = self.__find_format(rows, reread_rows)
+        if data_rows is not None:
+            yield from self.__extract_raw_entries(data_rows)
+
+    def __find_format(self, rows : Iterator[List[str]], reread_rows : Callable[[], Iterator[List[str]]]) -> Optional[Iterator[List[str]]]:
+        """ Finds heading, columns and account, returns the rows after the heading. """
+        head_rows : List[List[str]] = list(islice(rows, self.__heading_detector.get_search_rows()))
+        if self.__profile is not None and not self.__profile.matches(head_rows, self.__config.headings):
+            logger.info(f"Header of {self.__csv.get_input_file()} changed, detecting its format again")
+            self.__profile = None
+            self.__csv.forget_format() # the rows may have been read with a wrong encoding or dialect
+            rows = reread_rows()
+            head_rows = list(islice(rows, self.__heading_detector.get_search_rows()))
+
+        if len(head_rows) < 2:
             logger.error("Csv not considered since too short")
-            return
-
-        self.__heading_index : Optional[HeadingIndex] = self.__find_heading_index() 
-        if self.__heading_index is None:
-            logger.error("No heading index found. Abort!")
-            return
-
-        self.__date_indices : List[Optional[int]] = [self.__find_column_index(column) for column in self.__config.headings[self.__heading_index.in_config].date]
-        self.__amount_indices : List[Optional[int]] = [self.__find_column_index(column) for column in self.__config.headings[self.__heading_index.in_config].amount]
-        self.__comment_indices : List[Optional[int]] = [self.__find_column_index(column) for column in self.__config.headings[self.__heading_index.in_config].comment]
+            return None
+
+        if self.__profile is not None:
+            self.__heading_index : Optional[HeadingIndex] = HeadingIndex(self.__profile.heading_row_index, self.__profile.heading_config_index)
+            self.__date_indices : List[Optional[int]] = list(self.__profile.date_indices)
+            self.__amount_indices : List[Optional[int]] = list(self.__profile.amount_indices)
+            self.__comment_indices : List[Optional[int]] = list(self.__profile.comment_indices)
+        else:
+            self.__heading_index : Optional[HeadingIndex] = self.__heading_detector.find_heading_index(head_rows) 
+            if self.__heading_index is None:
+                logger.error("No heading index found. Abort!")
+                return None
+            logger.debug(f"Found heading config with index {self.__heading_index.in_config} in row {self.__heading_index.in_csv}")
+
+            heading_row = head_rows[self.__heading_index.in_csv]
+            self.__date_indices, self.__amount_indices, self.__comment_indices = self.__heading_detector.find_column_indices(heading_row, self.__heading_index.in_config)
+            self.__log_missing_columns(heading_row)
 
         if None in self.__date_indices:
             logger.error("Unable to find all date columns")
-            return
+            return None
         if None in self.__amount_indices:
             logger.error("Unable to find all amount columns")
-            return
+            return None
         if None in self.__comment_indices:
             logger.error("Unable to find all comment columns")
-            return
+            return None
 
-        self.__account_idx = self.__find_account_idx()
+        self.__account_idx = self.__known_account_idx if self.__known_account_idx is not None else self.__find_account_idx()
 
         if self.__account_idx == None:
             logger.error("No account found for input csv")
-            return
+            return None
 
-        self.__extract_raw_entries()
+        self.__heading_row = head_rows[self.__heading_index.in_csv]
+        return chain(head_rows[self.__heading_index.in_csv + 1:], rows)
 
     def get_raw_entries(self) -> List[RawEntry]:
         return self.__raw_entries
 
-    def __extract_raw_entries(self):
-        for row in self.__csv.get_content()[self.__heading_index.in_csv + 1:]:
+    def __extract_raw_entries(self, rows : Iterator[List[str]]) -> Iterator[RawEntry]:
+        for row in rows:
             raw_entry = RawEntry(
                 date = RawEntriesFromCsvExtractor.__get_concatenated_column_content(row, self.__date_indices),
                 amount = RawEntriesFromCsvExtractor.__get_concatenated_column_content(row, self.__amount_indices),
@@ -70,41 +129,49 @@ class RawEntriesFromCsvExtractor:
                 raw_entry.type = RawEntryType.BALANCE
             else:
                 raw_entry.type = RawEntryType.TRANSACTION
-            self.__raw_entries.append(raw_entry)
-
-
-    def __find_column_index(self, column_heading : str) -> Optional[int]:
-        for index, col in enumerate(self.__csv.get_content()[self.__heading_index.in_csv]):
-            if re.search(re.escape(column_heading), col):
-                return index
-        logger.error(f"No column index found for '{column_heading}' in {self.__csv.get_content()[self.__heading_index.in_csv]}")
-        return None
+            yield raw_entry
 
-    def __find_heading_index(self) -> Optional[HeadingIndex]:
-        for heading_index_in_config, heading_config in enumerate(self.__config.headings):
-            all_column_headings : List[str] = []
-            all_column_headings += heading_config.date
-            all_column_headings += heading_config.amount
-            all_column_headings += heading_config.comment
-            all_column_headings = [re.escape(heading) for heading in all_column_headings]
-            all_column_headings_regex = "(" + "|".join(all_column_headings) + ")"
-            for heading_index_in_csv, row in enumerate(self.__csv.get_content()):
-                row_as_string = " ".join(row)
-                match = re.findall(all_column_headings_regex, row_as_string)
-                if len(match) == len(all_column_headings):
-                    logger.debug(f"Found heading config with index {heading_index_in_config} in row {heading_index_in_csv}")
-                    return HeadingIndex(heading_index_in_csv, heading_index_in_config)
-                if heading_index_in_csv > 10: # TODO Arbitrary break
-                    break
-        return None
+    def __extract_columns(self, rows : Iterator[List[str]]) -> RawEntryColumns:
+        dates : List[Optional[str]] = []
+        amounts : List[Optional[str]] = []
+        comments : List[Optional[str]] = []
+        for row in rows:
+            dates.append(RawEntriesFromCsvExtractor.__get_joined_column_content(row, self.__date_indices))
+            amounts.append(RawEntriesFromCsvExtractor.__get_joined_column_content(row, self.__amount_indices))
+            comments.append(RawEntriesFromCsvExtractor.__get_joined_column_content(row, self.__comment_indices))
+        dates = RawEntriesFromCsvExtractor.cleanup_whitespace_of_all(dates)
+        amounts = RawEntriesFromCsvExtractor.cleanup_whitespace_of_all(amounts)
+        comments = RawEntriesFromCsvExtractor.cleanup_whitespace_of_all(comments)
+
+        columns = RawEntryColumns(account_idx = self.__account_idx)
+        for date, amount, comment in zip(dates, amounts, comments):
+            if amount == "":
+                continue
+            columns.dates.append(date)
+            columns.amounts.append(amount)
+            columns.comments.append(comment)
+            columns.types.append(RawEntryType.BALANCE if re.match("Tagessaldo", comment) else RawEntryType.TRANSACTION) # TODO Config
+        return columns
+
+    def __log_missing_columns(self, heading_row : List[str]):
+        heading_config = self.__config.headings[self.__heading_index.in_config]
+        for column_headings, indices in [(heading_config.date, self.__date_indices), (heading_config.amount, self.__amount_indices), (heading_config.comment, self.__comment_indices)]:
+            for column_heading, index in zip(column_headings, indices):
+                if index is None:
+                    logger.error(f"No column index found for '{column_heading}' in {heading_row}")
 
-    
     def __find_account_idx(self) -> Optional[int]:
-        for account_idx, account in enumerate(self.__config.internal_accounts):
+        account_idx = RawEntriesFromCsvExtractor.find_account_idx(self.__config, self.__input_base_path, self.__csv.get_input_file())
+        if account_idx is not None:
+            logger.debug(f"Matched csv file with account {self.__config.internal_accounts[account_idx].get_name()}")
+        return account_idx
+
+    @staticmethod
+    def find_account_idx(config : Config, input_base_path : os.PathLike, input_file : str) -> Optional[int]:
+        for account_idx, account in enumerate(config.internal_accounts):
             if len(account.get_input_directory()) > 0:
-                match_directory = re.search(re.escape(os.path.join(self.__input_base_path, account.get_input_directory())), self.__csv.get_input_file())
+                match_directory = re.search(re.escape(os.path.join(input_base_path, account.get_input_directory())), input_file)
                 if match_directory:
-                    logger.debug(f"Matched csv file with account {account.get_name()}")
                     return account_idx
         return None
 
@@ -120,5 +187,23 @@ class RawEntriesFromCsvExtractor:
             selected_columns = [column_data[selected_index] for selected_index in column_indices]
             return RawEntriesFromCsvExtractor.cleanup_whitespace(" ".join(selected_columns))
 
+    def __get_joined_column_content(column_data : List[str], column_indices : List[int]) -> Optional[str]:
+        if max(column_indices) < len(column_data):
+            return " ".join([column_data[selected_index] for selected_index in column_indices])
+        return None
+
     def cleanup_whitespace(input : str) -> str:
         return re.sub(r'\s+', ' ', input).strip()
+
+    @staticmethod
+    def cleanup_whitespace_of_all(inputs : List[Optional[str]]) -> List[Optional[str]]:
+        """ cleanup_whitespace for all given strings with one regex substitution over all of them, None stays None. """
+        values = [input for input in inputs if input is not None]
+        if len(values) == 0:
+            return list(inputs)
+        joined = "\0".join(values)
+        if joined.count("\0") != len(values) - 1: # a value contains the separator itself
+            cleaned_values = iter([RawEntriesFromCsvExtractor.cleanup_whitespace(value) for value in values])
+        else:
+            cleaned_values = iter([value.strip() for value in re.sub(r'\s+', ' ', joined).split("\0")])
+        return [next(cleaned_values) if input is not None else None for input in inputs]
@@ -0,0 +1,38 @@
+import random
+import pytest
+from statement.extractor.AmountParser import AmountParser, AmountFormat
+
+
+@pytest.mark.parametrize("amounts,expected_format", [
+    pytest.param(["1.234,56 S", "", "12,00 H"], AmountFormat.DEBIT_CREDIT_SUFFIX, id='debit_credit_suffix'),
+    pytest.param(["-12,50", "100.00"], AmountFormat.DECIMAL, id='decimal'),
+    pytest.param(["-1.234,56", "12.345"], AmountFormat.THOUSANDS_DOT, id='thousands_dot'),
+    pytest.param(["12,00 H", "-12,50"], None, id='mixed'),
+    pytest.param(["", "abc"], None, id='unknown'),
+])
+def test_detect_format(amounts, expected_format):
+    assert AmountParser.detect_format(amounts) == expected_format
+
+@pytest.mark.parametrize("amounts", [
+    pytest.param(["1.234,56 S", "12,00 H", "1,00 S", "..,00 X", "1.000.000,01 H", "12,0 H", "-1,00 S", "١٢,٣٤ H"], id='debit_credit_suffix'),
+    pytest.param(["-12,50", "100.00", "1.23", "-1,5", "1.234,56", "12", ",50", "-", "١٢.٣"], id='decimal'),
+    pytest.param(["-1.234,56", "1.23", "12.345", "1.2.3", "1234.567", "-1.234", "1.234,5", "1.234,567", "1..2", "."], id='thousands_dot'),
+])
+def test_parse_equals_cascade(amounts):
+    parser = AmountParser(amounts)
+    for amount in amounts:
+        assert parser.parse(amount) == AmountParser.parse_with_cascade(amount), amount
+
+def test_fast_parsers_equal_cascade_on_random_amounts():
+    random.seed(0)
+    alphabet = "0123456789.,-"
+    fast_parsers = [AmountParser.parse_debit_credit_suffix, AmountParser.parse_decimal, AmountParser.parse_thousands_dot]
+    for _ in range(20000):
+        amount = "".join(random.choice(alphabet) for _ in range(random.randint(0, 10))) + random.choice(["", "", " H", " S", " X"])
+        try:
+            expected = AmountParser.parse_with_cascade(amount)
+        except ValueError:
+            continue
+        for fast_parser in fast_parsers:
+            parsed_amount = fast_parser(amount)
+            assert parsed_amount is None or parsed_amount == expected, amount
@@ -0,0 +1,63 @@
+import os
+import pytest
+from data_types.Config import Config, HeadingConfig, Account
+from file_reader.CsvReader import CsvReader
+from statement.extractor.BankFormatProfile import BankFormatProfile, BankFormatProfileCache
+from statement.extractor.RawEntriesFromCsvExtractor import RawEntriesFromCsvExtractor
+
+@pytest.fixture
+def config():
+    return Config(internal_accounts=[Account(name="Giro", transaction_iban="DE01", input_directory="giro")],
+                  headings=[HeadingConfig(date=["Datum"], amount=["Betrag"], comment=["Text"])])
+
+def write_csv(tmp_path, name, content, encoding="utf-8"):
+    os.makedirs(tmp_path / "giro", exist_ok=True)
+    (tmp_path / "giro" / name).write_text(content, encoding=encoding)
+    return str(tmp_path / "giro" / name)
+
+def extract(config, tmp_path, input_file, profile=None):
+    csv_reader = CsvReader(input_file, dialect=profile.dialect if profile else None)
+    csv_reader.run()
+    extractor = RawEntriesFromCsvExtractor(csv_reader, config, str(tmp_path), profile)
+    extractor.run()
+    return extractor
+
+
+def test_profile_reproduces_detected_format(config, tmp_path, mocker):
+    input_file = write_csv(tmp_path, "a.csv", "Konto;Giro;DE01\nDatum;Betrag;Text\n01.01.2023;1,00;Shop\n02.01.2023;2,00;Bakery\n")
+    extractor = extract(config, tmp_path, input_file)
+    profile = extractor.get_bank_format_profile()
+    assert profile.heading_row_index == 1 and profile.amount_indices == [1]
+
+    sniff = mocker.patch("csv.Sniffer.sniff")
+    cached_extractor = extract(config, tmp_path, input_file, profile)
+    assert cached_extractor.get_raw_entries() == extractor.get_raw_entries()
+    sniff.assert_not_called()
+
+def test_profile_does_not_force_encoding_of_other_files(config, tmp_path):
+    rows = "Datum;Betrag;Text\n01.01.2023;-3,50;Bäckerei Müller\n"
+    profile = extract(config, tmp_path, write_csv(tmp_path, "a.csv", rows, encoding="cp1252")).get_bank_format_profile()
+    for name, encoding in [("b.csv", "utf-8"), ("c.csv", "cp1252")]:
+        extractor = extract(config, tmp_path, write_csv(tmp_path, name, rows, encoding=encoding), profile)
+        assert [raw_entry.comment for raw_entry in extractor.get_raw_entries()] == ["Bäckerei Müller"]
+        profile = extractor.get_bank_format_profile()
+
+def test_changed_header_invalidates_profile(config, tmp_path):
+    profile = extract(config, tmp_path, write_csv(tmp_path, "a.csv", "Datum;Betrag;Text\n01.01.2023;1,00;Shop\n")).get_bank_format_profile()
+    changed_file = write_csv(tmp_path, "b.csv", "Text,Datum,Betrag\nShop,01.01.2023,\"1,00\"\n")
+    extractor = extract(config, tmp_path, changed_file, profile)
+    assert [(raw_entry.date, raw_entry.amount, raw_entry.comment) for raw_entry in extractor.get_raw_entries()] == [("01.01.2023", "1,00", "Shop")]
+    assert extractor.get_bank_format_profile().dialect["delimiter"] == ","
+
+def test_cache_round_trip(config, tmp_path):
+    profile = extract(config, tmp_path, write_csv(tmp_path, "a.csv", "Datum;Betrag;Text\n01.01.2023;1,00;Shop\n")).get_bank_format_profile()
+    cache_file = str(tmp_path / "profiles.json")
+    cache = BankFormatProfileCache(cache_file)
+    cache.put("giro", profile)
+    cache.save()
+    assert BankFormatProfileCache(cache_file).get("giro") == profile
+
+def test_cache_ignores_unreadable_file(tmp_path):
+    cache_file = tmp_path / "profiles.json"
+    cache_file.write_text("{ not json")
+    assert BankFormatProfileCache(str(cache_file)).get("giro") is None
@@ -0,0 +1,44 @@
+import random
+import datetime
+from statement.extractor.ColumnParser import ColumnParser
+from statement.extractor.AmountParser import AmountParser
+from statement.extractor.DateParser import DateParser
+
+
+def parse_or_error(parse, value):
+    try:
+        return parse(value)
+    except ValueError:
+        return ValueError
+
+def test_parse_amounts_equals_scalar_parser():
+    random.seed(0)
+    amounts = ["".join(random.choice("0123456789.,-") for _ in range(random.randint(0, 10))) + random.choice(["", "", " H", " S"]) for _ in range(5000)]
+    amounts += ["1.234,56 S", "-1.234,56", "12.50", "١٢,٣٤ H", "12\0", ",50 H", "999999999999999.99", "12345678901234567890,00 H"]
+    values, parsed = ColumnParser.parse_amounts(amounts)
+    assert parsed.any()
+    for amount, value, is_parsed in zip(amounts, values.tolist(), parsed.tolist()):
+        if is_parsed:
+            assert value == AmountParser.parse_with_cascade(amount), amount
+        else:
+            assert parse_or_error(AmountParser.parse_with_cascade, amount) in (None, ValueError) or not amount.isascii() or len(amount) > 15, amount
+
+def test_parse_dates_equals_scalar_parser():
+    random.seed(0)
+    templates = ["dd.dd. dd.dd.dddd", "dd.dd.dddd", "dd.dd.dd", "dddd-dd-dd"]
+    dates = ["".join(random.choice("0123456789") if char == "d" else char for char in random.choice(templates)) for _ in range(5000)]
+    dates += ["29.02.2024", "29.02.2023", "31.04.2023", "0000-01-01", "9999-12-31", "31.12.00", "15.03. 16.03.2023", "1.2.2023", ""]
+    values, parsed = ColumnParser.parse_dates(dates)
+    assert parsed.any()
+    for date, value, is_parsed in zip(dates, values.tolist(), parsed.tolist()):
+        expected = parse_or_error(DateParser.parse_with_cascade, date)
+        if is_parsed:
+            assert value == expected, date
+        else:
+            assert expected in (None, ValueError), date
+
+def test_parse_empty_columns():
+    values, parsed = ColumnParser.parse_amounts([])
+    assert len(values) == 0 and len(parsed) == 0
+    values, parsed = ColumnParser.parse_dates(["", ""])
+    assert not parsed.any()
@@ -0,0 +1,19 @@
+from data_types.Tag import Tag
+from data_types.TagRegistry import TagRegistry
+from statement.extractor.CsvFileIngestion import CsvFileIngestion, ParallelCsvFileIngestion
+
+def test_parallel_ingestion_equals_sequential_ingestion(config, tags, input_files, tmp_path):
+    ingestion = CsvFileIngestion(config, tags, str(tmp_path))
+    sequential = [ingestion.ingest(input_file) for input_file in input_files]
+    parallel = list(ParallelCsvFileIngestion(config, tags, str(tmp_path), workers=2).ingest_all([(input_file, None, 0) for input_file in input_files]))
+
+    assert [ingested_file.input_file for ingested_file in parallel] == input_files
+    assert [ingested_file.interpreted_entries for ingested_file in parallel] == [ingested_file.interpreted_entries for ingested_file in sequential]
+    assert [ingested_file.bank_format_profile for ingested_file in parallel] == [ingested_file.bank_format_profile for ingested_file in sequential]
+    assert all(ingested_file.seconds >= 0 for ingested_file in parallel)
+
+def test_parallel_ingestion_interns_tags(config, tags, input_files, tmp_path):
+    ingested_file = next(ParallelCsvFileIngestion(config, tags, str(tmp_path), workers=2).ingest_all([(input_files[0], None, None)]))
+    entry = ingested_file.interpreted_entries[0]
+    assert entry.tags[0] is TagRegistry.intern(Tag("Living-Food"))
+    assert entry.has_tag(Tag("Living-Food"))
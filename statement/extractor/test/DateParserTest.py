@@ -0,0 +1,54 @@
+import random
+import datetime
+import logging
+import pytest
+from statement.extractor.DateParser import DateParser, DateFormat
+
+
+@pytest.mark.parametrize("dates,expected_format", [
+    pytest.param(["15.03. 16.03.2023", ""], DateFormat.DAY_MONTH_BOOKING_DATE, id='booking_date'),
+    pytest.param(["15.03.2023"], DateFormat.DAY_MONTH_YEAR, id='day_month_year'),
+    pytest.param(["15.03.23"], DateFormat.DAY_MONTH_SHORT_YEAR, id='short_year'),
+    pytest.param(["2023-03-15"], DateFormat.ISO, id='iso'),
+    pytest.param(["15.03.23", "2023-03-15"], None, id='mixed'),
+])
+def test_detect_format(dates, expected_format):
+    assert DateParser.detect_format(dates) == expected_format
+
+def test_parse_falls_back_to_cascade():
+    parser = DateParser(["15.03.2023"])
+    assert parser.parse("16.03.2023") == datetime.date(2023, 3, 16)
+    assert parser.parse("2023-03-17") == datetime.date(2023, 3, 17)
+    assert parser.parse("1.2.2023") is None
+
+def test_parse_raises_for_invalid_calendar_date():
+    parser = DateParser(["15.03.2023"])
+    with pytest.raises(ValueError):
+        parser.parse("31.02.2023")
+
+def test_fast_parsers_equal_cascade_on_random_dates():
+    random.seed(0)
+    fast_parsers = [DateParser.parse_day_month_booking_date, DateParser.parse_day_month_year, DateParser.parse_day_month_short_year, DateParser.parse_iso]
+    templates = ["dd.dd. dd.dd.dddd", "dd.dd.dddd", "dd.dd.dd", "dddd-dd-dd"]
+    for _ in range(20000):
+        date = "".join(random.choice("0123456789") if char == "d" else char for char in random.choice(templates))
+        if random.random() < 0.3:
+            position = random.randrange(len(date))
+            date = date[:position] + random.choice("0. -x") + date[position + 1:]
+        try:
+            expected = DateParser.parse_with_cascade(date)
+        except ValueError:
+            continue
+        for fast_parser in fast_parsers:
+            parsed_date = fast_parser(date)
+            assert parsed_date is None or parsed_date == expected, date
+
+def test_log_summary_reports_unparseable_dates_once(caplog):
+    caplog.set_level(logging.WARNING)
+    parser = DateParser([])
+    for date in ["1.2.2023", "1.2.2023", "", "15.03.2023"]:
+        parser.parse(date)
+    parser.log_summary()
+    assert parser.get_unparseable_counts() == {"1.2.2023": 2, "": 1}
+    assert caplog.text.count("Could not extract date from:") == 1
+    assert "Could not extract date from: 1.2.2023,  (3 entries, 2 distinct values)" in caplog.text
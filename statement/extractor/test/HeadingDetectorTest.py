@@ -0,0 +1,51 @@
+import re
+import random
+from typing import List, Optional
+from data_types.Config import HeadingConfig
+from statement.extractor.HeadingDetector import HeadingDetector, HeadingIndex
+
+HEADING_CONFIGS = [
+    HeadingConfig(date=["Buchungstag"], amount=["Betrag"], comment=["Verwendungszweck", "Empfänger"]),
+    HeadingConfig(date=["Datum"], amount=["Betrag"], comment=["Text"]),
+    HeadingConfig(date=["Date"], amount=["Amount", "Amount"], comment=["Description"], search_rows=3),
+]
+
+def reference_heading_index(heading_configs : List[HeadingConfig], rows : List[List[str]]) -> Optional[HeadingIndex]:
+    for heading_index_in_config, heading_config in enumerate(heading_configs):
+        all_column_headings = [re.escape(heading) for heading in heading_config.date + heading_config.amount + heading_config.comment]
+        all_column_headings_regex = "(" + "|".join(all_column_headings) + ")"
+        search_rows = heading_config.search_rows if heading_config.search_rows is not None else 12
+        for heading_index_in_csv, row in enumerate(rows[:search_rows]):
+            if len(re.findall(all_column_headings_regex, " ".join(row))) == len(all_column_headings):
+                return HeadingIndex(heading_index_in_csv, heading_index_in_config)
+    return None
+
+def reference_column_index(heading_row : List[str], column_heading : str) -> Optional[int]:
+    for index, col in enumerate(heading_row):
+        if re.search(re.escape(column_heading), col):
+            return index
+    return None
+
+
+def test_find_heading_index_equals_reference():
+    random.seed(0)
+    cells = ["Buchungstag", "Betrag", "Verwendungszweck", "Empfänger", "Datum", "Text", "Date", "Amount", "Description", "Saldo", "", "1,00"]
+    detector = HeadingDetector(HEADING_CONFIGS)
+    for _ in range(2000):
+        rows = [[random.choice(cells) for _ in range(random.randint(0, 5))] for _ in range(random.randint(0, 15))]
+        assert detector.find_heading_index(rows) == reference_heading_index(HEADING_CONFIGS, rows), rows
+
+def test_find_column_indices_equals_reference():
+    detector = HeadingDetector(HEADING_CONFIGS)
+    heading_row = ["Buchungstag", "Wertstellung", "Betrag (EUR)", "Empfänger/Auftraggeber", "Verwendungszweck"]
+    date_indices, amount_indices, comment_indices = detector.find_column_indices(heading_row, 0)
+    assert date_indices == [reference_column_index(heading_row, "Buchungstag")] == [0]
+    assert amount_indices == [2]
+    assert comment_indices == [4, 3]
+    assert detector.find_column_indices(heading_row, 1) == ([None], [2], [None])
+
+def test_search_rows_is_configurable():
+    rows = [["preamble"]] * 3 + [["Date", "Amount", "Amount", "Description"]]
+    assert HeadingDetector(HEADING_CONFIGS).find_heading_index(rows) is None
+    assert HeadingDetector(HEADING_CONFIGS).get_search_rows() == 12
+    assert HeadingDetector([HeadingConfig(date=["Date"], amount=["Amount", "Amount"], comment=["Description"], search_rows=4)]).find_heading_index(rows) == HeadingIndex(3, 0)
@@ -0,0 +1,62 @@
+import os
+from dataclasses import replace
+from data_types.Tag import Tag
+from data_types.TagConfig import TagConfig, TagDefinition
+from data_types.TagRegistry import TagRegistry
+from statement.extractor.CsvFileIngestion import CsvFileIngestion
+from statement.extractor.InterpretedEntriesCache import InterpretedEntriesCache
+
+def test_warm_entries_equal_cold_entries(config, tags, input_file, tmp_path):
+    cold = CsvFileIngestion(config, tags, str(tmp_path)).ingest(input_file)
+    cache = InterpretedEntriesCache(str(tmp_path / "cache"), config, tags)
+    key = cache.get_key(input_file)
+    assert cache.get(key) is None
+    cache.put(key, cold)
+
+    warm = InterpretedEntriesCache(str(tmp_path / "cache"), config, tags).get(key)
+    assert warm.interpreted_entries == cold.interpreted_entries
+    assert warm.bank_format_profile == cold.bank_format_profile
+    assert warm.interpreted_entries[0].tags[0] is TagRegistry.intern(Tag("Living-Food"))
+
+def test_key_changes_with_content_and_settings(config, tags, input_file, tmp_path):
+    key = InterpretedEntriesCache(str(tmp_path / "cache"), config, tags).get_key(input_file)
+    changed_tags = TagConfig(tag_definitions=[TagDefinition(tag=Tag("Living-Food"), comment_pattern="REWE|EDEKA", date_from=None, date_to=None, account_id=None)])
+    assert InterpretedEntriesCache(str(tmp_path / "cache"), config, changed_tags).get_key(input_file) != key
+
+    with open(input_file, "a", encoding="utf-8") as file:
+        file.write("03.01.2023;3,00;Bakery\n")
+    assert InterpretedEntriesCache(str(tmp_path / "cache"), config, tags).get_key(input_file) != key
+
+def test_key_changes_with_full_encoding_scan(config, tags, input_file, tmp_path):
+    key = InterpretedEntriesCache(str(tmp_path / "cache"), config, tags).get_key(input_file)
+    assert InterpretedEntriesCache(str(tmp_path / "cache"), config, tags, full_encoding_scan=True).get_key(input_file) != key
+
+def test_get_misses_entries_read_with_other_dialect(config, tags, input_file, tmp_path):
+    ingested_file = CsvFileIngestion(config, tags, str(tmp_path)).ingest(input_file)
+    profile = ingested_file.bank_format_profile
+    cache = InterpretedEntriesCache(str(tmp_path / "cache"), config, tags)
+    key = cache.get_key(input_file)
+    cache.put(key, ingested_file)
+
+    assert cache.get(key) is not None
+    assert cache.get(key, profile) is not None
+    assert cache.get(key, replace(profile, dialect={**profile.dialect, "quotechar": "'"})) is None
+    assert cache.get(key, replace(profile, dialect={**profile.dialect, "quotechar": "'"}, header_row=["Text", "Datum", "Betrag"])) is not None
+
+def test_remove_unused_keeps_used_entries(config, tags, input_file, tmp_path):
+    InterpretedEntriesCache(str(tmp_path / "cache"), config, tags).put("put", CsvFileIngestion(config, tags, str(tmp_path)).ingest(input_file))
+    InterpretedEntriesCache(str(tmp_path / "cache"), config, tags).put("loaded", CsvFileIngestion(config, tags, str(tmp_path)).ingest(input_file))
+
+    cache = InterpretedEntriesCache(str(tmp_path / "cache"), config, tags)
+    cache.put("put", CsvFileIngestion(config, tags, str(tmp_path)).ingest(input_file))
+    assert cache.get("loaded") is not None
+    cache.remove_unused()
+    assert sorted(os.listdir(tmp_path / "cache")) == ["loaded.pickle", "put.pickle"]
+
+def test_remove_unused_removes_unused_entries(config, tags, input_file, tmp_path):
+    InterpretedEntriesCache(str(tmp_path / "cache"), config, tags).put("old", CsvFileIngestion(config, tags, str(tmp_path)).ingest(input_file))
+
+    cache = InterpretedEntriesCache(str(tmp_path / "cache"), config, tags)
+    assert cache.get("other") is None
+    cache.remove_unused()
+    assert os.listdir(tmp_path / "cache") == []
@@ -4,7 +4,7 @@ from statement.extractor.InterpretedEntriesExtractor import InterpretedEntriesEx
 from data_types.Config import Config, Account
 from data_types.TagConfig import TagConfig
 from data_types.RawEntry import RawEntry, RawEntryType
-from data_types.InterpretedEntry import InterpretedEntry
+from data_types.InterpretedEntry import InterpretedEntry, CardType
 
 @pytest.fixture
 def mock_config(mocker):
@@ -156,3 +156,53 @@ class TestDateOrdering:
         result = run_extractor(raw_entries)
 
         assert len(result) == 0
+
+
+class TestColumnParsing:
+    def test_column_parsing_equals_row_parsing(self, make_raw_entry, run_extractor, mocker):
+        raw_entries = [make_raw_entry(date=date, amount=amount, comment=str(i))
+                       for i, (date, amount) in enumerate(zip(['15.03.2023', '01.06.23', '2023-03-15', '10.05. 15.05.2023', '1.2.2023'] * 60,
+                                                              ['100,00', '-1.234,56', '12.5', '1,00 S', 'abc', '-7'] * 50))]
+        mocker.patch.object(InterpretedEntriesExtractor, 'COLUMN_PARSING_MIN_ROWS', 1)
+        column_result = run_extractor(raw_entries)
+        mocker.patch.object(InterpretedEntriesExtractor, 'COLUMN_PARSING_MIN_ROWS', len(raw_entries) + 1)
+        row_result = run_extractor(raw_entries)
+
+        assert [(entry.date, entry.original_amount, entry.raw.comment) for entry in column_result] == \
+               [(entry.date, entry.original_amount, entry.raw.comment) for entry in row_result]
+
+
+class TestFusedRun:
+    def test_fused_run_equals_staged_run(self, make_raw_entry, mock_config, mock_tags, mocker, caplog):
+        credit_account = mocker.MagicMock(spec=Account)
+        credit_account.get_input_directory.return_value = 'some/VISA'
+        credit_account.get_id.return_value = 'CREDIT_IBAN'
+        mock_config.internal_accounts.append(credit_account)
+        raw_entries = [make_raw_entry(date=date, amount=amount, comment=str(i), account_idx=i % 2)
+                       for i, (date, amount) in enumerate(zip(['15.03.2023', '01.06.23', 'x', '10.05. 15.05.2023', '01.01.2020'] * 4,
+                                                              ['100,00', '-1.234,56', '12.5', 'abc'] * 5))]
+        results = []
+        warnings = []
+        for staged in [True, False]:
+            caplog.clear()
+            extractor = InterpretedEntriesExtractor(raw_entries, mock_config, mock_tags)
+            extractor.run(staged=staged)
+            warnings.append([record.getMessage() for record in caplog.records if record.getMessage().startswith("Could not extract amount from:")])
+            results.append([(entry.date, entry.amount, entry.original_amount, entry.original_currency, entry.converted_amount,
+                             entry.card_type, entry.account_id, entry.tags, entry.raw.comment) for entry in extractor.get_interpreted_entries()])
+
+        assert results[0] == results[1]
+        assert {entry[5] for entry in results[1]} == {CardType.GIRO, CardType.CREDIT}
+        assert "Could not extract amount from: abc" in warnings[1]
+        assert warnings[0] == warnings[1]
+
+    def test_streamed_chunks_equal_list_run(self, make_raw_entry, mock_config, mock_tags, mocker):
+        raw_entries = [make_raw_entry(date=f'{day:02d}.01.2023', amount=f'{day},00', comment=str(day)) for day in range(31, 0, -1)]
+        extractor = InterpretedEntriesExtractor(raw_entries, mock_config, mock_tags)
+        extractor.run()
+        mocker.patch.object(InterpretedEntriesExtractor, 'CHUNK_SIZE', 4)
+        streaming_extractor = InterpretedEntriesExtractor((raw_entry for raw_entry in raw_entries), mock_config, mock_tags)
+        streaming_extractor.run()
+
+        assert streaming_extractor.get_interpreted_entries() == extractor.get_interpreted_entries()
+        assert streaming_extractor.get_interpreted_entries()[0].date == datetime.date(2023, 1, 1)
@@ -89,3 +89,47 @@ def test_run_missing_required_column(headers, mock_csv_reader, run_extractor):
 
     result = run_extractor()
     assert len(result) == 0
+
+def test_iterate_raw_entries_equals_run(mock_csv_reader, mock_config):
+    content = [['preamble'], ['header1', 'header2', 'header3']] + [[f'date{i}', f'amount{i}' if i % 3 else '', f'comment{i}'] for i in range(20)]
+    mock_csv_reader.get_content.return_value = content
+    mock_csv_reader.iterate_rows.side_effect = lambda: (row for row in content)
+
+    extractor = RawEntriesFromCsvExtractor(mock_csv_reader, mock_config, 'some/path')
+    extractor.run()
+    streaming_extractor = RawEntriesFromCsvExtractor(mock_csv_reader, mock_config, 'some/path')
+
+    assert list(streaming_extractor.iterate_raw_entries()) == extractor.get_raw_entries()
+    assert len(extractor.get_raw_entries()) == 13
+
+def test_run_columnar_equals_run(mock_csv_reader, mock_config):
+    content = [['header1', 'header2', 'header3']] + [[f' date{i}\t', f'{i},00\n S' if i % 3 else '  ', f'comment  {i}\x00x' if i % 5 else f'Tagessaldo {i}'] for i in range(20)]
+    mock_csv_reader.get_content.return_value = content
+
+    extractor = RawEntriesFromCsvExtractor(mock_csv_reader, mock_config, 'some/path')
+    extractor.run()
+    columnar_extractor = RawEntriesFromCsvExtractor(mock_csv_reader, mock_config, 'some/path')
+    columnar_extractor.run_columnar()
+
+    columns = columnar_extractor.get_raw_entry_columns()
+    assert columns.account_idx == 0
+    assert len(columns) == 13
+    assert columns.to_raw_entries() == extractor.get_raw_entries()
+
+def test_run_columnar_without_heading(mock_csv_reader, mock_config):
+    mock_csv_reader.get_content.return_value = [['wrong_header1', 'wrong_header2'], ['data1', 'data2']]
+
+    extractor = RawEntriesFromCsvExtractor(mock_csv_reader, mock_config, 'some/path')
+    extractor.run_columnar()
+
+    assert extractor.get_raw_entry_columns() is None
+
+@pytest.mark.parametrize("inputs", [
+    pytest.param([' a  b\t', None, '\n', 'c\r\nd '], id='mixed'),
+    pytest.param(['a\x00 b', '  c '], id='separator_in_value'),
+    pytest.param([None, None], id='only_none'),
+    pytest.param([], id='empty'),
+])
+def test_cleanup_whitespace_of_all(inputs):
+    expected = [RawEntriesFromCsvExtractor.cleanup_whitespace(input) if input is not None else None for input in inputs]
+    assert RawEntriesFromCsvExtractor.cleanup_whitespace_of_all(inputs) == expected
@@ -0,0 +1,30 @@
+import os
+import pytest
+from data_types.Config import Config, HeadingConfig, Account
+from data_types.Tag import Tag
+from data_types.TagConfig import TagConfig, TagDefinition
+
+@pytest.fixture
+def tags():
+    return TagConfig(tag_definitions=[
+        TagDefinition(tag=Tag("Living-Food"), comment_pattern="REWE", date_from=None, date_to=None, account_id=None),
+    ])
+
+@pytest.fixture
+def config():
+    return Config(internal_accounts=[Account(name="Giro", transaction_iban="DE01", input_directory="giro")],
+                  headings=[HeadingConfig(date=["Datum"], amount=["Betrag"], comment=["Text"])])
+
+@pytest.fixture
+def input_files(tmp_path):
+    os.makedirs(tmp_path / "giro")
+    files = []
+    for month in range(1, 5):
+        rows = "".join(f"{day:02d}.{month:02d}.2023;-{day},50;{'REWE' if day % 2 else 'Shop'} {day}\n" for day in range(1, 20))
+        (tmp_path / "giro" / f"{month}.csv").write_text("Datum;Betrag;Text\n" + rows, encoding="utf-8")
+        files.append(str(tmp_path / "giro" / f"{month}.csv"))
+    return files
+
+@pytest.fixture
+def input_file(input_files):
+    return input_files[0]
@@ -0,0 +1,30 @@
+import datetime
+from statement.DateIntervalIndex import DateIntervalIndex
+
+INTERVALS = [
+    (0, datetime.date(2020, 1, 1), datetime.date(2020, 12, 31)),
+    (1, datetime.date(2020, 6, 1), datetime.date(2021, 5, 31)),
+    (2, datetime.date(2022, 1, 1), datetime.date(2022, 1, 1)),
+    (3, datetime.date(2023, 1, 1), datetime.date(2022, 1, 1)),
+    (4, datetime.date(2024, 1, 1), datetime.date.max),
+]
+
+
+def test_active_ids_equal_interval_check():
+    index = DateIntervalIndex(INTERVALS)
+    date = datetime.date(2019, 12, 1)
+    while date < datetime.date(2025, 1, 1):
+        expected = {interval_id for interval_id, date_from, date_to in INTERVALS if date_from <= date <= date_to}
+        assert index.get_active_ids_on(date) == expected, date
+        date += datetime.timedelta(days=1)
+
+def test_active_ids_at_boundaries():
+    index = DateIntervalIndex(INTERVALS)
+    assert index.get_active_ids_on(datetime.date(2020, 5, 31)) == {0}
+    assert index.get_active_ids_on(datetime.date(2020, 6, 1)) == {0, 1}
+    assert index.get_active_ids_on(datetime.date(2021, 1, 1)) == {1}
+    assert index.get_active_ids_on(datetime.date(2022, 1, 1)) == {2}
+    assert index.get_active_ids_on(datetime.date.max) == {4}
+
+def test_without_intervals():
+    assert DateIntervalIndex([]).get_active_ids_on(datetime.date(2020, 1, 1)) == frozenset()
@@ -0,0 +1,48 @@
+import pickle
+from datetime import date
+from statement.EntryFilter import EntryFilter
+from data_types.InterpretedEntry import InterpretedEntry, InterpretedEntryType
+from data_types.Tag import Tag, UndefinedTag
+
+def make_entries():
+    return [
+        InterpretedEntry(date=date(2020, 1, 1), type=InterpretedEntryType.TRANSACTION_EXTERNAL, tags=[Tag("Living-Food")]),
+        InterpretedEntry(date=date(2020, 1, 2), type=InterpretedEntryType.TRANSACTION_EXTERNAL, tags=[Tag("Living-Food-Restaurant"), Tag("Living-Food")]),
+        InterpretedEntry(date=date(2020, 1, 3), type=InterpretedEntryType.TRANSACTION_EXTERNAL, tags=[UndefinedTag]),
+        InterpretedEntry(date=date(2020, 1, 4), type=InterpretedEntryType.TRANSACTION_EXTERNAL, tags=[Tag("Undefined-Cash")]),
+        InterpretedEntry(date=date(2020, 1, 5), type=InterpretedEntryType.TRANSACTION_INTERNAL, tags=[]),
+        InterpretedEntry(date=date(2020, 1, 6), type=InterpretedEntryType.BALANCE, tags=[Tag("Income")]),
+    ]
+
+def reference_tag(entries, given_tag):
+    return [entry for entry in entries for tag in entry.tags if given_tag.contains(tag)]
+
+
+def test_tag_equals_reference():
+    entries = make_entries()
+    for tag in [Tag("Living"), Tag("Living-Food"), Tag("Living-Food-Restaurant"), Tag("Income"), UndefinedTag, Tag("Unknown")]:
+        assert EntryFilter.tag(entries, tag) == reference_tag(entries, tag), str(tag)
+
+def test_defined_and_undefined_transactions():
+    entries = make_entries()
+    assert EntryFilter.defined_transactions(entries) == [entries[0], entries[1], entries[3]]
+    assert EntryFilter.undefined_transactions(entries) == [entries[2], entries[4]]
+
+def test_tag_mask_follows_tag_assignment():
+    entries = make_entries()
+    assert EntryFilter.tag(entries, Tag("Income")) == [entries[5]]
+    entries[0].tags = [Tag("Income-Salary")]
+    assert EntryFilter.tag(entries, Tag("Income")) == [entries[0], entries[5]]
+    assert entries[0].has_tag(Tag("Income-Salary")) and not entries[0].has_tag(Tag("Income"))
+
+def test_tag_mask_is_not_pickled():
+    entry = make_entries()[0]
+    state = entry.__getstate__()
+    assert "tag_mask" not in state and "tag_bits" not in state
+    unpickled_entry = pickle.loads(pickle.dumps(entry))
+    assert unpickled_entry.tag_mask == entry.tag_mask and unpickled_entry.has_tag(Tag("Living-Food"))
+
+def test_tag_mask_with_other_seperator():
+    entry = InterpretedEntry(tags=[Tag("Living/Food", "/")])
+    assert EntryFilter.tag([entry], Tag("Living", "/")) == [entry]
+    assert entry.has_tag(Tag("Living/Food", "/")) and not entry.has_tag(Tag("Living", "/"))
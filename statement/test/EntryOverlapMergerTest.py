@@ -0,0 +1,36 @@
+import datetime
+from data_types.InterpretedEntry import InterpretedEntry
+from data_types.RawEntry import RawEntry, RawEntryType
+from statement.EntryOverlapMerger import EntryOverlapMerger
+
+def create_entry(day : int, amount : float, comment : str, account_id : str = "DE01", raw_type : RawEntryType = RawEntryType.TRANSACTION) -> InterpretedEntry:
+    return InterpretedEntry(date=datetime.date(2023, 1, day), amount=amount, account_id=account_id,
+                            raw=RawEntry(date="", amount="", comment=comment, account_idx=0, type=raw_type), tags=[])
+
+
+def test_duplicates_are_dropped():
+    csv_entries = [create_entry(1, -10.0, "REWE Markt"), create_entry(2, 20.0, "Gehalt"), create_entry(2, 20.0, "Gehalt")]
+    pdf_entries = [create_entry(1, -10.0, "Rewe-Markt 123"), create_entry(2, 20.0, "Gehalt"), create_entry(5, -3.0, "Bakery")]
+
+    assert EntryOverlapMerger(csv_entries).merge(pdf_entries) == [pdf_entries[2]]
+
+def test_duplicates_are_only_dropped_as_often_as_known():
+    pdf_entries = [create_entry(1, -10.0, "Coffee"), create_entry(1, -10.0, "Coffee")]
+    assert EntryOverlapMerger([create_entry(1, -10.0, "Coffee")]).merge(pdf_entries) == [pdf_entries[1]]
+
+def test_dates_may_differ_by_some_days():
+    merger = EntryOverlapMerger([create_entry(10, -10.0, "Shop")])
+    late_entry = create_entry(14, -10.0, "Shop")
+    assert merger.merge([create_entry(13, -10.0, "Shop"), late_entry]) == [late_entry]
+
+def test_account_and_amount_have_to_match():
+    merger = EntryOverlapMerger([create_entry(1, -10.0, "Shop")])
+    pdf_entries = [create_entry(1, -10.0, "Shop", account_id="DE02"), create_entry(1, -10.01, "Shop")]
+    assert merger.merge(pdf_entries) == pdf_entries
+
+def test_balances_are_not_indexed_and_kept_entries_are():
+    balance = create_entry(1, 100.0, "Tagessaldo", raw_type=RawEntryType.BALANCE)
+    merger = EntryOverlapMerger([balance])
+    pdf_entry = create_entry(1, 100.0, "Tagessaldo")
+    assert merger.merge([pdf_entry]) == [pdf_entry]
+    assert merger.merge([create_entry(1, 100.0, "Tagessaldo")]) == []
@@ -0,0 +1,24 @@
+from datetime import date
+from statement.EntryFilter import EntryFilter
+from statement.EntryTagIndex import EntryTagIndex
+from data_types.InterpretedEntry import InterpretedEntry
+from data_types.Tag import Tag, UndefinedTag
+
+ENTRIES = [
+    InterpretedEntry(date=date(2020, 1, 1), amount=-10.0, tags=[Tag("Living-Food")]),
+    InterpretedEntry(date=date(2020, 1, 2), amount=-20.0, tags=[Tag("Living-Rent")]),
+    InterpretedEntry(date=date(2020, 1, 3), amount=-30.0, tags=[Tag("Living-Food-Restaurant"), Tag("Living-Food")]),
+    InterpretedEntry(date=date(2020, 1, 4), amount=100.0, tags=[Tag("Income")]),
+    InterpretedEntry(date=date(2020, 1, 5), amount=-5.0, tags=[UndefinedTag]),
+    InterpretedEntry(date=date(2020, 1, 6), amount=-5.0, tags=[]),
+]
+
+
+def test_entries_equal_tag_filter():
+    index = EntryTagIndex(ENTRIES)
+    for tag in [Tag("Living"), Tag("Living-Food"), Tag("Living-Food-Restaurant"), Tag("Living-Rent"), Tag("Income"), UndefinedTag, Tag("Unknown")]:
+        assert index.get_entries(tag) == EntryFilter.tag(ENTRIES, tag), str(tag)
+
+def test_entries_listed_once_per_contained_tag():
+    index = EntryTagIndex(ENTRIES)
+    assert index.get_entries(Tag("Living-Food")) == [ENTRIES[0], ENTRIES[2], ENTRIES[2]]
@@ -0,0 +1,65 @@
+import datetime
+from typing import List
+from data_types.Config import Account, Config
+from data_types.InterpretedEntry import InterpretedEntry, InterpretedEntryType
+from data_types.RawEntry import RawEntry, RawEntryType
+from statement.InMemoryStatementBuilder import InMemoryStatementBuilder
+from statement.IncrementalStatementUpdater import IncrementalStatementUpdater
+
+CONFIG = Config(internal_accounts=[Account(name="A", transaction_iban="DE01", input_directory="a", owner=["Mr A"]),
+                                   Account(name="B", transaction_iban="DE02", input_directory="b", owner=["Mr B"])])
+
+def create_entry(account_id : str, day : int, amount : float, comment : str) -> InterpretedEntry:
+    return InterpretedEntry(date=datetime.date(2023, 1, 1) + datetime.timedelta(days=day), amount=amount, account_id=account_id,
+                            raw=RawEntry(date="", amount="", comment=comment, account_idx=0, type=RawEntryType.TRANSACTION), tags=[])
+
+def create_month(month : int) -> List[InterpretedEntry]:
+    day = 31 * month
+    return [create_entry("DE01", day + 1, -50.0, "to DE02"), create_entry("DE02", day + 2, 50.0, "from DE01"),
+            create_entry("DE01", day + 3, -20.0, f"Shop {month}"), create_entry("DE02", day + 1, -10.0, "Bakery")]
+
+def get_state(entries : List[InterpretedEntry]):
+    return [(entry.account_id, entry.date, entry.amount, entry.type, entries.index(entry.internal_transaction_match) if entry.internal_transaction_match else None)
+            for entry in entries]
+
+
+def test_added_entries_equal_full_build():
+    months = [create_month(month) for month in range(4)]
+    statement = InMemoryStatementBuilder(CONFIG).add_entries(months[0] + months[1] + months[3]).build()
+
+    affected_accounts = IncrementalStatementUpdater(statement, CONFIG).update([], months[2])
+
+    months = [create_month(month) for month in range(4)]
+    expected = InMemoryStatementBuilder(CONFIG).add_entries(months[0] + months[1] + months[3] + months[2]).build()
+    assert get_state(statement.get_entries()) == get_state(expected.get_entries())
+    assert affected_accounts == {"DE01", "DE02"}
+
+def test_removed_entry_releases_its_match():
+    entries = create_month(0)
+    statement = InMemoryStatementBuilder(CONFIG).add_entries(entries).build()
+    assert entries[1].type == InterpretedEntryType.TRANSACTION_INTERNAL
+
+    affected_accounts = IncrementalStatementUpdater(statement, CONFIG).update([entries[0]], [])
+
+    assert entries[0] not in statement.get_entries()
+    assert entries[1].type == InterpretedEntryType.TRANSACTION_EXTERNAL
+    assert entries[1].internal_transaction_match is None
+    assert affected_accounts == {"DE01", "DE02"}
+
+def test_entries_outside_of_window_are_untouched():
+    entries = create_month(0) + create_month(6)
+    statement = InMemoryStatementBuilder(CONFIG).add_entries(entries).build()
+    entries[0].type = InterpretedEntryType.UNKNOWN # would be matched again if it was in the window
+
+    IncrementalStatementUpdater(statement, CONFIG).update([], [create_entry("DE02", 31 * 6 + 20, 5.0, "Refund")])
+
+    assert entries[0].type == InterpretedEntryType.UNKNOWN
+    assert entries[4].internal_transaction_match is entries[5]
+
+def test_window():
+    dates = [datetime.date(2023, 1, 1), datetime.date(2023, 1, 10), datetime.date(2023, 3, 1)]
+    window = IncrementalStatementUpdater.get_window(dates, 1)
+    assert window == [(datetime.date(2022, 12, 25), datetime.date(2023, 1, 17)), (datetime.date(2023, 2, 22), datetime.date(2023, 3, 8))]
+    assert IncrementalStatementUpdater.is_in_window(datetime.date(2023, 1, 17), window)
+    assert not IncrementalStatementUpdater.is_in_window(datetime.date(2023, 1, 18), window)
+    assert not IncrementalStatementUpdater.is_in_window(datetime.date(2022, 12, 24), window)
@@ -0,0 +1,77 @@
+import datetime
+from typing import List
+from statement.IncrementalTagger import IncrementalTagger
+from statement.TagMatcher import TagMatcher
+from data_types.InterpretedEntry import InterpretedEntry
+from data_types.RawEntry import RawEntry, RawEntryType
+from data_types.Tag import Tag, UndefinedTag
+from data_types.TagConfig import TagConfig, TagDefinition, diff_tags
+
+
+def make_definition(tag : str, pattern : str, date_from=None, date_to=None, account_id=None) -> TagDefinition:
+    return TagDefinition(tag=Tag(tag), comment_pattern=pattern, date_from=date_from, date_to=date_to, account_id=account_id)
+
+def make_entries() -> List[InterpretedEntry]:
+    comments = ["Miete Wohnung", "NETFLIX", "Gehalt Bonus", "REWE Markt", "Unknown", "REWE NETFLIX"]
+    return [InterpretedEntry(date=datetime.date(2020, 1 + i, 1), account_id="DE01", tags=[],
+                             raw=RawEntry(comment=comment, type=RawEntryType.TRANSACTION))
+            for i, comment in enumerate(comments)]
+
+def tag_fully(entries : List[InterpretedEntry], tags : TagConfig):
+    tag_matcher = TagMatcher(tags)
+    for entry in entries:
+        entry.tag_definition_indices = tag_matcher.match_indices(entry.raw.comment, entry.account_id, entry.date)
+        entry.tags = tag_matcher.get_tags(entry.tag_definition_indices) or [UndefinedTag]
+
+OLD_TAGS = TagConfig(tag_definitions=[
+    make_definition("Living-Rent", "Miete"),
+    make_definition("Leisure-Streaming", "NETFLIX"),
+    make_definition("Income-Salary", "Gehalt"),
+    make_definition("Living-Food", "REWE"),
+])
+
+NEW_TAGS = TagConfig(tag_definitions=[
+    make_definition("Living-Food", "REWE"),
+    make_definition("Living-Rent", "Miete", date_from="2020-01-01", date_to="2020-01-31"),
+    make_definition("Leisure-Streaming", "NETFLIX"),
+    make_definition("Income-Salary-Bonus", "Bonus"),
+    make_definition("Other", "Unknown"),
+])
+
+
+def test_diff_tags():
+    diff = diff_tags(OLD_TAGS, NEW_TAGS)
+    assert diff.unchanged == {1: 2, 3: 0}
+    assert diff.added == [1, 3, 4]
+    assert diff.removed == [0, 2]
+
+def test_diff_tags_without_changes():
+    assert diff_tags(OLD_TAGS, OLD_TAGS).is_empty()
+
+def test_incremental_tagging_equals_full_tagging():
+    expected_entries = make_entries()
+    tag_fully(expected_entries, NEW_TAGS)
+
+    entries = make_entries()
+    tag_fully(entries, OLD_TAGS)
+    IncrementalTagger(OLD_TAGS, NEW_TAGS).run(entries)
+
+    assert [entry.tags for entry in entries] == [entry.tags for entry in expected_entries]
+    assert [entry.tag_definition_indices for entry in entries] == [entry.tag_definition_indices for entry in expected_entries]
+
+def test_incremental_tagging_updates_shared_tag_lists():
+    entries = make_entries()
+    tag_fully(entries, OLD_TAGS)
+    virtual_entry = InterpretedEntry(tags=entries[2].tags)
+
+    IncrementalTagger(OLD_TAGS, NEW_TAGS).run(entries + [virtual_entry])
+
+    assert virtual_entry.tags == [Tag("Income-Salary-Bonus")]
+
+def test_incremental_tagging_adds_undefined_tag():
+    entries = make_entries()
+    tag_fully(entries, OLD_TAGS)
+
+    IncrementalTagger(OLD_TAGS, TagConfig(tag_definitions=[])).run(entries)
+
+    assert all(entry.tags == [UndefinedTag] for entry in entries)
@@ -0,0 +1,28 @@
+import pytest
+from statement.LiteralScanner import LiteralScanner, extract_required_literal
+
+
+def test_scan_finds_overlapping_literals():
+    scanner = LiteralScanner(["he", "she", "his", "hers"])
+    assert scanner.scan("ushers") == {0, 1, 3}
+
+def test_scan_without_literals():
+    assert LiteralScanner([]).scan("anything") == set()
+
+def test_scan_without_match():
+    assert LiteralScanner(["NETFLIX"]).scan("Netflix") == set()
+
+@pytest.mark.parametrize("pattern,expected_literal", [
+    pytest.param("NETFLIX", "NETFLIX", id='plain_literal'),
+    pytest.param("Miete.*Wohnung", "Wohnung", id='longest_literal'),
+    pytest.param("^Gehalt$", "Gehalt", id='anchors'),
+    pytest.param("Amazon\\.de", "Amazon.de", id='escaped_dot'),
+    pytest.param("a(bc)+d", "bc", id='required_repeat'),
+    pytest.param("x?yz", "yz", id='optional_repeat'),
+    pytest.param("REWE|EDEKA", None, id='alternation'),
+    pytest.param("(?i)bakery", None, id='ignore_case'),
+    pytest.param("foo(?i:bar)baz", "foo", id='scoped_ignore_case'),
+    pytest.param(".*", None, id='no_literal'),
+])
+def test_extract_required_literal(pattern, expected_literal):
+    assert extract_required_literal(pattern) == expected_literal
@@ -0,0 +1,30 @@
+import datetime
+from statement.ParallelTagMatcher import ParallelTagMatcher
+from statement.TagMatcher import TagMatcher
+from data_types.Tag import Tag
+from data_types.TagConfig import TagConfig, TagDefinition
+
+TAGS = TagConfig(tag_definitions=[
+    TagDefinition(tag=Tag("Living-Rent"), comment_pattern="Miete", date_from="2020-01-01", date_to="2020-06-30", account_id=None),
+    TagDefinition(tag=Tag("Leisure-Streaming"), comment_pattern="NETFLIX", date_from=None, date_to=None, account_id=None),
+    TagDefinition(tag=Tag("Income-Salary"), comment_pattern="Gehalt", date_from=None, date_to=None, account_id="DE01"),
+    TagDefinition(tag=Tag("Living-Food"), comment_pattern="REWE|EDEKA", date_from=None, date_to=None, account_id=None),
+])
+
+
+def test_parallel_matching_equals_serial_matching():
+    comments = ["Miete NETFLIX", "Gehalt", "REWE", "EDEKA Gehalt", "Unknown"]
+    items = [(comments[i % len(comments)], "DE01" if i % 3 else "DE02", datetime.date(2020, 1 + i % 12, 1)) for i in range(100)]
+
+    parallel_tag_matcher = ParallelTagMatcher(TAGS, workers=2, chunk_size=7)
+    try:
+        parallel_result = parallel_tag_matcher.match_all(items)
+    finally:
+        parallel_tag_matcher.close()
+
+    assert parallel_result == TagMatcher(TAGS).match_all(items)
+
+def test_parallel_matching_of_small_input_in_calling_process():
+    parallel_tag_matcher = ParallelTagMatcher(TAGS, workers=2)
+    assert parallel_tag_matcher.match_all([("NETFLIX", "DE01", datetime.date(2020, 1, 1))]) == [(1,)]
+    parallel_tag_matcher.close()
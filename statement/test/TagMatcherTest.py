@@ -0,0 +1,81 @@
+import datetime
+import logging
+import re
+from typing import List
+from statement.TagMatcher import TagMatcher
+from data_types.Tag import Tag
+from data_types.TagConfig import TagConfig, TagDefinition
+
+
+def make_definition(tag : str, pattern : str, date_from=None, date_to=None, account_id=None) -> TagDefinition:
+    return TagDefinition(tag=Tag(tag), comment_pattern=pattern, date_from=date_from, date_to=date_to, account_id=account_id)
+
+def reference_match(definitions : List[TagDefinition], comment : str, account_id : str, date : datetime.date) -> List[Tag]:
+    tags = []
+    for definition in definitions:
+        if definition.date_from and definition.date_to:
+            if date < datetime.date.fromisoformat(definition.date_from) or date > datetime.date.fromisoformat(definition.date_to):
+                continue
+        if definition.account_id and account_id != definition.account_id:
+            continue
+        if re.search(definition.comment_pattern, comment):
+            tags.append(definition.tag)
+    return tags
+
+DEFINITIONS = [
+    make_definition("Living-Rent", "Miete.*Wohnung", date_from="2020-01-01", date_to="2021-12-31"),
+    make_definition("Leisure-Streaming", "NETFLIX"),
+    make_definition("Income-Salary", "Gehalt", account_id="DE01"),
+    make_definition("Living-Food", "REWE|EDEKA"),
+    make_definition("Income-Salary-Bonus", "Gehalt.*Bonus", account_id="DE02"),
+    make_definition("Living-Rent-Old", "Miete", date_from="2018-01-01"),
+    make_definition("Living-Food", "(?i)bakery"),
+]
+
+
+def test_match_without_definitions():
+    matcher = TagMatcher(TagConfig(tag_definitions=[]))
+    assert matcher.match("NETFLIX", "DE01", datetime.date(2020, 1, 1)) == []
+
+def test_match_keeps_tag_config_order():
+    matcher = TagMatcher(TagConfig(tag_definitions=DEFINITIONS))
+    assert matcher.match("Gehalt REWE", "DE01", datetime.date(2020, 1, 1)) == [Tag("Income-Salary"), Tag("Living-Food")]
+
+def test_match_respects_account_id():
+    matcher = TagMatcher(TagConfig(tag_definitions=DEFINITIONS))
+    assert matcher.match("Gehalt", "DE03", datetime.date(2020, 1, 1)) == []
+    assert matcher.match("Gehalt Bonus", "DE02", datetime.date(2020, 1, 1)) == [Tag("Income-Salary-Bonus")]
+
+def test_match_respects_date_bounds():
+    matcher = TagMatcher(TagConfig(tag_definitions=DEFINITIONS))
+    assert matcher.match("Miete Wohnung", "DE01", datetime.date(2019, 12, 31)) == [Tag("Living-Rent-Old")]
+    assert matcher.match("Miete Wohnung", "DE01", datetime.date(2020, 1, 1)) == [Tag("Living-Rent"), Tag("Living-Rent-Old")]
+    assert matcher.match("Miete Wohnung", "DE01", datetime.date(2021, 12, 31)) == [Tag("Living-Rent"), Tag("Living-Rent-Old")]
+    assert matcher.match("Miete Wohnung", "DE01", datetime.date(2022, 1, 1)) == [Tag("Living-Rent-Old")]
+
+def test_match_equals_reference():
+    matcher = TagMatcher(TagConfig(tag_definitions=DEFINITIONS))
+    comments = ["Miete Wohnung", "NETFLIX Gehalt", "Gehalt Bonus EDEKA", "Small Bakery", "unknown", ""]
+    accounts = ["DE01", "DE02", "DE03", ""]
+    dates = [datetime.date(2019, 6, 1), datetime.date(2020, 6, 1), datetime.date(2023, 6, 1)]
+    for comment in comments:
+        for account_id in accounts:
+            for date in dates:
+                assert matcher.match(comment, account_id, date) == reference_match(DEFINITIONS, comment, account_id, date)
+
+def test_match_reports_cache_hits_and_misses(caplog):
+    caplog.set_level(logging.DEBUG)
+    matcher = TagMatcher(TagConfig(tag_definitions=DEFINITIONS))
+    matcher.match("NETFLIX", "DE01", datetime.date(2023, 1, 1))
+    matcher.match("NETFLIX", "DE01", datetime.date(2023, 2, 1))
+    matcher.match("NETFLIX", "DE03", datetime.date(2023, 3, 1))
+    matcher.match("NETFLIX", "DE01", datetime.date(2020, 3, 1))
+    matcher.log_cache_statistics()
+    assert "Tag cache: 1 hits, 3 misses" in caplog.text
+
+def test_match_with_evicting_cache_equals_reference():
+    for cache_size in [0, 1, 2]:
+        matcher = TagMatcher(TagConfig(tag_definitions=DEFINITIONS), cache_size=cache_size)
+        for comment in ["Miete Wohnung", "NETFLIX Gehalt", "Miete Wohnung", "Gehalt Bonus EDEKA", "NETFLIX Gehalt"]:
+            for date in [datetime.date(2019, 6, 1), datetime.date(2020, 6, 1)]:
+                assert matcher.match(comment, "DE01", date) == reference_match(DEFINITIONS, comment, "DE01", date)
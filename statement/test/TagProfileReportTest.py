@@ -0,0 +1,57 @@
+import datetime
+import sys
+import pytest
+from statement.TagMatcher import TagMatcher
+from statement.TagProfileReport import TagProfileReport, is_prone_to_catastrophic_backtracking
+from data_types.Tag import Tag
+from data_types.TagConfig import TagConfig, TagDefinition
+
+TAGS = TagConfig(tag_definitions=[
+    TagDefinition(tag=Tag("Living-Rent"), comment_pattern="Miete", date_from="2010-01-01", date_to="2010-12-31", account_id=None),
+    TagDefinition(tag=Tag("Leisure-Streaming"), comment_pattern="NETFLIX", date_from=None, date_to=None, account_id=None),
+    TagDefinition(tag=Tag("Income-Salary"), comment_pattern="Gehalt", date_from=None, date_to=None, account_id="DE02"),
+    TagDefinition(tag=Tag("Living-Food"), comment_pattern="(REWE|EDEKA)", date_from=None, date_to=None, account_id=None),
+    TagDefinition(tag=Tag("Other"), comment_pattern="(x+)+y", date_from=None, date_to=None, account_id=None),
+])
+
+ITEMS = [("Miete NETFLIX", "DE01", datetime.date(2020, 1, 1)),
+         ("Gehalt REWE", "DE01", datetime.date(2020, 2, 1)),
+         ("NETFLIX", "DE01", datetime.date(2020, 3, 1))]
+
+
+def test_profiled_matching_equals_matching():
+    assert TagMatcher(TAGS, profile=True).match_all(ITEMS) == TagMatcher(TAGS).match_all(ITEMS)
+
+def test_profiled_statistics():
+    tag_matcher = TagMatcher(TAGS, profile=True)
+    tag_matcher.match_all(ITEMS)
+    statistics = tag_matcher.get_statistics()
+
+    assert [s.evaluations for s in statistics] == [0, 2, 0, 3, 0] # no comment contains the literal of (x+)+y
+    assert [s.hits for s in statistics] == [0, 2, 0, 1, 0]
+    assert [s.filtered_hits for s in statistics] == [1, 0, 1, 0, 0]
+
+def test_report_findings_sorted_by_cost():
+    tag_matcher = TagMatcher(TAGS, profile=True)
+    tag_matcher.match_all(ITEMS)
+
+    rows = TagProfileReport(tag_matcher.get_definitions(), tag_matcher.get_statistics()).get_rows()
+    findings = {str(row.definition.tag): row.findings for row in rows}
+
+    assert [row.statistics.regex_seconds for row in rows] == sorted([row.statistics.regex_seconds for row in rows], reverse=True)
+    assert findings["Living-Rent"] == [TagProfileReport.SHADOWED_BY_FILTER]
+    assert findings["Income-Salary"] == [TagProfileReport.SHADOWED_BY_FILTER]
+    assert findings["Leisure-Streaming"] == []
+    assert findings["Other"] == [TagProfileReport.NO_HITS, TagProfileReport.CATASTROPHIC_BACKTRACKING]
+
+@pytest.mark.parametrize("pattern,expected", [
+    pytest.param("(a+)+b", True, id='nested_plus'),
+    pytest.param("(.*x)*", True, id='nested_star'),
+    pytest.param("(?:a|(b+))*c", True, id='nested_in_branch'),
+    pytest.param("(a+)++b", True, id='nested_in_possessive', marks=pytest.mark.skipif(sys.version_info < (3, 11), reason="possessive repeats need python 3.11")),
+    pytest.param("Miete.*Wohnung", False, id='single_star'),
+    pytest.param("(ab){2,5}c+", False, id='bounded_outer_repeat'),
+    pytest.param("NETFLIX", False, id='literal'),
+])
+def test_is_prone_to_catastrophic_backtracking(pattern, expected):
+    assert is_prone_to_catastrophic_backtracking(pattern) == expected
@@ -0,0 +1,105 @@
+import json
+import os
+import pytest
+from FinancialAnalysisInput import FinancialAnalysisInput
+from statement.extractor.CsvFileIngestion import CsvFileIngestion
+
+# The statement visualization switches matplotlib to its Tk backend on import
+FinancialAnalysis = pytest.importorskip("FinancialAnalysis", reason="needs a display for the Tk backend", exc_type=ImportError).FinancialAnalysis
+
+@pytest.fixture
+def analysis_input(tmp_path):
+    (tmp_path / "config.json").write_text(json.dumps({"custom_balances": [], "headings": [{"date": ["Datum"], "amount": ["Betrag"], "comment": ["Text"]}],
+                                                      "internal_accounts": [{"name": "Giro", "transaction_iban": "DE01", "input_directory": "giro", "balance_references": [], "owner": []}]}))
+    (tmp_path / "tags.json").write_text(json.dumps({"tag_definitions": [{"tag": {"definition": "Living-Food", "seperator": "-", "splitted_definition": []},
+                                                                         "comment_pattern": "REWE", "date_from": "", "date_to": "", "account_id": ""}]}))
+    os.makedirs(tmp_path / "input" / "giro")
+    (tmp_path / "input" / "giro" / "1.csv").write_text("Datum;Betrag;Text\n01.01.2023;-1,50;REWE 1\n02.01.2023;2,00;Shop\n", encoding="utf-8")
+    (tmp_path / "input" / "giro" / "2.csv").write_text("Datum;Betrag;Text\n01.02.2023;-3,00;REWE 2\n", encoding="utf-8")
+    return FinancialAnalysisInput(str(tmp_path), str(tmp_path / "input"), [str(tmp_path / "input" / "giro" / f"{idx}.csv") for idx in [1, 2]],
+                                  str(tmp_path / "tags.json"), str(tmp_path / "config.json"))
+
+def get_entries(analysis):
+    return [(entry.date, entry.amount, entry.raw.comment if entry.raw else None) for entry in analysis._FinancialAnalysis__statement.get_entries()]
+
+
+def test_warm_run_ingests_nothing(analysis_input, mocker):
+    cold = FinancialAnalysis(analysis_input)
+    cold.read_and_interpret_input()
+    ingest = mocker.spy(CsvFileIngestion, "ingest")
+    for _ in range(2):
+        warm = FinancialAnalysis(analysis_input)
+        warm.read_and_interpret_input()
+        assert get_entries(warm) == get_entries(cold)
+    assert ingest.call_count == 0
+
+def test_failed_update_input_does_not_duplicate_entries(analysis_input, mocker):
+    analysis = FinancialAnalysis(analysis_input)
+    analysis.read_and_interpret_input()
+    input_files = list(analysis_input.input_files)
+    with open(input_files[1], "a", encoding="utf-8") as file:
+        file.write("02.02.2023;4,00;Shop 2\n")
+
+    mocker.patch.object(CsvFileIngestion, "ingest", side_effect=ValueError("unreadable"))
+    with pytest.raises(ValueError):
+        analysis.update_input(input_files)
+    mocker.stopall()
+    assert analysis.update_input(input_files)
+    assert not analysis.update_input(input_files)
+
+    expected = FinancialAnalysis(FinancialAnalysisInput(analysis_input.base_path, analysis_input.input_base_path, input_files,
+                                                        analysis_input.tags_json_file, analysis_input.config_json_file, parse_cache=False))
+    expected.read_and_interpret_input()
+    assert sorted(get_entries(analysis)) == sorted(get_entries(expected))
+    assert len(get_entries(analysis)) == 4
+
+def test_update_input_merges_pdf_entries_again(analysis_input, mocker):
+    pdf_texts = {}
+    mocker.patch("file_reader.PdfReader.PdfReader.run")
+    mocker.patch("file_reader.PdfReader.PdfReader.get_text", autospec=True, side_effect=lambda reader: pdf_texts[reader._PdfReader__file_path])
+    pdf_file = os.path.join(analysis_input.input_base_path, "giro", "a.pdf")
+    pdf_texts[pdf_file] = "Nr. 1/2023 alter Kontostand 100,00 H 01.01. 01.01. REWE 1 Lastschrift 1,50 S 20.01. 20.01. Kino Abend 10,00 S neuer Kontostand 88,50 H"
+    with open(pdf_file, "w") as file:
+        file.write("1")
+    input_files = [analysis_input.input_files[0], pdf_file]
+    analysis_input.input_files = list(input_files)
+    analysis = FinancialAnalysis(analysis_input)
+    analysis.read_and_interpret_input()
+
+    def assert_equals_full_run(input_files):
+        expected = FinancialAnalysis(FinancialAnalysisInput(analysis_input.base_path, analysis_input.input_base_path, input_files,
+                                                            analysis_input.tags_json_file, analysis_input.config_json_file, parse_cache=False))
+        expected.read_and_interpret_input()
+        assert sorted(get_entries(analysis)) == sorted(get_entries(expected))
+        return get_entries(expected)
+
+    assert len(assert_equals_full_run(input_files)) == 3 # the pdf's first entry is known from the csv
+
+    csv_file = os.path.join(analysis_input.input_base_path, "giro", "3.csv")
+    with open(csv_file, "w", encoding="utf-8") as file:
+        file.write("Datum;Betrag;Text\n20.01.2023;-10,00;Kino Abend\n")
+    assert analysis.update_input(input_files + [csv_file])
+    assert len(assert_equals_full_run(input_files + [csv_file])) == 3
+
+    pdf_texts[pdf_file] += " 21.01. 21.01. Buch 5,00 S"
+    with open(pdf_file, "w") as file:
+        file.write("12")
+    assert analysis.update_input(input_files + [csv_file])
+    assert len(assert_equals_full_run(input_files + [csv_file])) == 4
+
+    assert analysis.update_input(input_files)
+    assert len(assert_equals_full_run(input_files)) == 4
+
+def test_update_input_uses_given_file_states(analysis_input, mocker):
+    analysis = FinancialAnalysis(analysis_input)
+    analysis.read_and_interpret_input()
+    input_files = list(analysis_input.input_files)
+    with open(input_files[1], "a", encoding="utf-8") as file:
+        file.write("02.02.2023;4,00;Shop 2\n")
+    input_file_states = {input_file: (os.stat(input_file).st_size, os.stat(input_file).st_mtime_ns) for input_file in input_files}
+
+    get_file_state = mocker.patch.object(FinancialAnalysis, "_FinancialAnalysis__get_file_state")
+    assert analysis.update_input(input_files, input_file_states)
+    assert not analysis.update_input(input_files, input_file_states)
+    get_file_state.assert_not_called()
+    assert len(get_entries(analysis)) == 4
@@ -1,7 +1,7 @@
 import os
 from user_interface.logger import logger
 import re
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from FinancialAnalysisInput import FinancialAnalysisInput
 
 class InputArgumentInterpreter:
@@ -12,17 +12,36 @@ class InputArgumentInterpreter:
         self.__config_json_path : str = config_json_path
 
         self.__input_files : List[os.PathLike] = []
+        self.__input_directory : Optional[os.PathLike] = None
+        self.__input_file_states : Dict[str, Tuple[int, int]] = {}
         self.__base_path : os.PathLike = None
         self.__tags_json_file : os.PathLike = None
         self.__config_json_file : os.PathLike = None
         self.__error : bool = False
 
     def get_financial_analysis_input(self) -> Optional[FinancialAnalysisInput]:
-        return FinancialAnalysisInput(self.__base_path, self.__input_base_path, self.__input_files, self.__tags_json_file, self.__config_json_file) if not self.has_error() else None
+        if self.has_error():
+            return None
+        return FinancialAnalysisInput(self.__base_path, self.__input_base_path, self.__input_files, self.__tags_json_file, self.__config_json_file,
+                                      input_file_states={os.path.normpath(file): state for file, state in self.__input_file_states.items()})
 
     def get_input_files(self) -> List[os.PathLike]:
         return self.__input_files
     
+    def find_input_file_states(self) -> Dict[os.PathLike, Tuple[int, int]]:
+        """ Searches the input directory again, e.g. to notice added, changed or removed files while watching it. Returns size and mtime in ns per file. """
+        if self.__input_directory is None:
+            input_file_states = {}
+            for file in self.__input_files:
+                try:
+                    stat = os.stat(file)
+                except FileNotFoundError:
+                    continue
+                input_file_states[file] = (stat.st_size, stat.st_mtime_ns)
+            return input_file_states
+        self.__find_files_in_directory_recursively(self.__input_directory)
+        return {os.path.normpath(file): self.__input_file_states[file] for file in sorted(self.__input_file_states, key=os.path.normpath)}
+
     def get_tags_json_file(self) -> Optional[os.PathLike]:
         return self.__tags_json_file
 
@@ -45,10 +64,12 @@ class InputArgumentInterpreter:
         cwd_joined_input_dir_path = os.path.join(os.getcwd(), input_dir_path)
         if os.path.isdir(input_dir_path) and os.path.isabs(input_dir_path):
             self.__input_files = self.__find_files_in_directory_recursively(input_dir_path)
+            self.__input_directory = input_dir_path
             self.__input_base_path = input_dir_path
             self.__base_path = os.path.dirname(input_dir_path)
         elif os.path.isdir(cwd_joined_input_dir_path):
             self.__input_files = self.__find_files_in_directory_recursively(cwd_joined_input_dir_path)
+            self.__input_directory = cwd_joined_input_dir_path
             self.__input_base_path = cwd_joined_input_dir_path
             self.__base_path = os.path.dirname(cwd_joined_input_dir_path)
         elif os.path.isfile(input_dir_path) and os.path.isabs(input_dir_path):
@@ -68,15 +89,19 @@ class InputArgumentInterpreter:
         self.__base_path = os.path.normpath(self.__base_path)
 
     def __find_files_in_directory_recursively(self, directory : os.PathLike) -> List[os.PathLike]:
+        """ Walks the directory with scandir, so only files need a stat call. Their size and mtime are kept as input file states. """
         result = []
-        for path in os.listdir(directory):
-            absolute_path = os.path.join(directory, path)
-            if os.path.isfile(absolute_path):
-                result.append(absolute_path)
-            else:
-                result_from_subdir = self.__find_files_in_directory_recursively(absolute_path)
-                if len(result_from_subdir) > 0:
-                    result += result_from_subdir
+        self.__input_file_states = {}
+        directories = [directory]
+        while directories:
+            with os.scandir(directories.pop()) as dir_entries:
+                for dir_entry in dir_entries:
+                    if dir_entry.is_file():
+                        stat = dir_entry.stat()
+                        self.__input_file_states[dir_entry.path] = (stat.st_size, stat.st_mtime_ns)
+                        result.append(dir_entry.path)
+                    elif dir_entry.is_dir():
+                        directories.append(dir_entry.path)
         return result
 
     def __interpret_tags_json_path(self):
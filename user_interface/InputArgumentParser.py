@@ -7,6 +7,14 @@ class InputArgumentParser:
         self.__parser.add_argument("--input_dir_path", help="Path to input directory where statements are stored.", default="input")
         self.__parser.add_argument("--tags_json_path", help="Path to json file that defines patterns for tagging.", default="tags.json")
         self.__parser.add_argument("--config_json_path", help="Path to json file that defines various configs.", default="config.json")
+        self.__parser.add_argument("--tagging_workers", help="Number of worker processes for tagging. Tagging runs in the main process if not greater than 1.", type=int, default=0)
+        self.__parser.add_argument("--ingest_workers", help="Number of worker processes that read and interpret the input files. Files are ingested one after another if not greater than 1.", type=int, default=0)
+        self.__parser.add_argument("--profile_tags", help="Profile tagging per tag definition and report expensive, never matching and shadowed definitions. Disables the tag cache and tagging workers.", action="store_true")
+        self.__parser.add_argument("--tag_tuning", help="Instead of the interactive overview, watch the tags json file and re-tag the interpreted entries on every change.", action="store_true")
+        self.__parser.add_argument("--watch_input", help="Instead of the interactive overview, watch the input directory and update the interpreted entries with added, changed or removed csv and pdf files.", action="store_true")
+        self.__parser.add_argument("--full_encoding_scan", help="Detect the encoding of csv files from the whole file instead of its first 64 KiB.", action="store_true")
+        self.__parser.add_argument("--no_parse_cache", help="Interpret all input files again instead of loading the entries of unchanged files from the export directory.", action="store_true")
+        self.__parser.add_argument("--streaming_input", help="Stream csv rows through the extractors instead of holding every file in memory at each stage.", action="store_true")
 
     def get_args(self):
         return self.__parser.parse_args()
\ No newline at end of file
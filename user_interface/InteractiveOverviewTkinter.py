@@ -10,6 +10,7 @@ from user_interface.logger import logger
 from typing import Callable, Dict, List
 from data_types.Config import Config
 from statement.EntryFilter import EntryFilter
+from statement.EntryTagIndex import EntryTagIndex
 from enum import Enum, auto
 from data_types.TimeInterval import MonthInterval, TimeInterval, TimeIntervalVariants
 from data_types.InterpretedEntry import InterpretedEntry, InterpretedEntryType
@@ -94,8 +95,9 @@ class InteractiveOverviewTkinter():
                 lambda other_id=account.get_id(): EntryFilter.transactions(self.__interpreted_entries, self.__main_id, other_id)
 
     def __init_balance_menu_items_with_tags(self):
+        self.__entry_tag_index = EntryTagIndex(EntryFilter.non_virtual(self.__interpreted_entries))
         for tag in self.__all_tags:
-            self.__balance_type_to_data[str(tag)] = lambda tag=tag: EntryFilter.tag(EntryFilter.non_virtual(self.__interpreted_entries), tag)
+            self.__balance_type_to_data[str(tag)] = lambda tag=tag: self.__entry_tag_index.get_entries(tag)
         self.__balance_type_to_data.pop(str(UndefinedTag))
 
     def __init_balance_menu_items_with_general_info(self):
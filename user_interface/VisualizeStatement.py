@@ -155,7 +155,8 @@ class VisualizeStatement:
 
     @staticmethod
     def get_colors_for_tags(tag_groups : List[TagGroup], all_tags : List[Tag]):
-        resulting_colors = [VisualizeStatement.get_tag_group_color(tag_group, VisualizeStatement.get_tag_to_color_map(all_tags)) for tag_group in tag_groups]
+        tag_to_color_map = VisualizeStatement.get_tag_to_color_map(all_tags)
+        resulting_colors = [VisualizeStatement.get_tag_group_color(tag_group, tag_to_color_map) for tag_group in tag_groups]
         return resulting_colors
 
     @staticmethod
@@ -13,11 +13,24 @@ args_interpreter = InputArgumentInterpreter(args_parser.input_dir_path,
                                             args_parser.config_json_path)
 args_interpreter.run()
 
-analysis = FinancialAnalysis(args_interpreter.get_financial_analysis_input())
+analysis_input = args_interpreter.get_financial_analysis_input()
+analysis_input.tagging_workers = args_parser.tagging_workers
+analysis_input.ingest_workers = args_parser.ingest_workers
+analysis_input.profile_tags = args_parser.profile_tags
+analysis_input.streaming_input = args_parser.streaming_input
+analysis_input.full_encoding_scan = args_parser.full_encoding_scan
+analysis_input.parse_cache = not args_parser.no_parse_cache
+
+analysis = FinancialAnalysis(analysis_input)
 analysis.read_and_interpret_input()
 analysis.write_entries_to_csv()
 analysis.print_entries_statistics()
 analysis.validate_interpreted_input()
-analysis.launch_interactive_overview()
+if args_parser.tag_tuning:
+    analysis.run_tag_tuning_loop()
+elif args_parser.watch_input:
+    analysis.run_input_watch_loop(args_interpreter.find_input_file_states)
+else:
+    analysis.launch_interactive_overview()
 #analysis.print_undefined_external_transaction_csv_entries()
 #analysis.print_undefined_internal_transaction_csv_entries()